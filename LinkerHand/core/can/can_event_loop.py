@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单线程 CAN 接收事件循环
+
+所有总线注册到同一个 selector (Linux 上为 epoll)，每次唤醒把就绪总线上已到达的帧
+用 recv(timeout=0) 一次取空，整批交给该总线的 handler(frames)。一次矩阵压感查询的几十个行帧
+在一次唤醒内处理完，不再每帧唤醒一个阻塞在 recv 的线程。
+没有文件描述符的总线 (virtual、PCAN 等) 在同一循环中按 poll_interval 轮询。
+"""
+import selectors
+import socket
+import threading
+from typing import Callable, Dict, List
+
+import can
+
+
+class _Entry:
+    def __init__(self, bus, handler):
+        self.bus = bus
+        self.handler = handler
+        self.frames = 0
+        self.batches = 0
+        self.max_batch = 0
+        self.errors = 0
+
+
+class CanEventLoop:
+    def __init__(self, poll_interval: float = 0.001, max_batch: int = 512):
+        self.poll_interval = poll_interval
+        self.max_batch = max_batch
+        self.wakeups = 0
+        self._selector = selectors.DefaultSelector()
+        self._entries: Dict[int, _Entry] = {}    # id(bus) -> entry
+        self._polled: List[_Entry] = []
+        self._lock = threading.Lock()
+        # stop()/add() 通过自连接的 socket 唤醒 select
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._running = False
+        self._thread = None
+
+    def add(self, bus: can.BusABC, handler: Callable[[List[can.Message]], None]):
+        entry = _Entry(bus, handler)
+        try:
+            fd = bus.fileno()
+        except (NotImplementedError, AttributeError, OSError):
+            fd = -1
+        with self._lock:
+            self._entries[id(bus)] = entry
+            if fd >= 0:
+                self._selector.register(fd, selectors.EVENT_READ, entry)
+            else:
+                self._polled = self._polled + [entry]
+        self._wake()
+
+    def remove(self, bus: can.BusABC):
+        with self._lock:
+            entry = self._entries.pop(id(bus), None)
+            if entry is None:
+                return
+            if entry in self._polled:
+                self._polled = [e for e in self._polled if e is not entry]
+            else:
+                self._selector.unregister(bus.fileno())
+        self._wake()
+
+    def start(self) -> "CanEventLoop":
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="linker-hand-can-io", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._wake()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        self._selector.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+
+    def _run(self):
+        while self._running:
+            timeout = self.poll_interval if self._polled else None
+            events = self._selector.select(timeout)
+            self.wakeups += 1
+            for key, _ in events:
+                if key.data is None:
+                    try:
+                        self._wake_r.recv(64)
+                    except BlockingIOError:
+                        pass
+                else:
+                    self._drain(key.data)
+            for entry in self._polled:
+                self._drain(entry)
+
+    def _drain(self, entry: _Entry):
+        batch = []
+        try:
+            while len(batch) < self.max_batch:
+                msg = entry.bus.recv(timeout=0)
+                if msg is None:
+                    break
+                batch.append(msg)
+        except can.CanError as e:
+            entry.errors += 1
+            print(f"CAN receive failed: {e}", flush=True)
+        if not batch:
+            return
+        entry.frames += len(batch)
+        entry.batches += 1
+        entry.max_batch = max(entry.max_batch, len(batch))
+        try:
+            entry.handler(batch)
+        except Exception as e:
+            # 单个 handler 的异常不能停掉整个接收循环
+            print(f"CAN handler error: {e}", flush=True)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            str(getattr(e.bus, "channel_info", id(e.bus))): {
+                "frames": e.frames, "batches": e.batches, "max_batch": e.max_batch, "errors": e.errors,
+            }
+            for e in self._entries.values()
+        }
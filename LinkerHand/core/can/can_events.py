@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CAN 接收路径上的数据事件
+
+CanFrameObserver 包装驱动的 process_response: 驱动先按原逻辑解码，随后按本型号的帧表判断
+一组数据是否已完整 (例如 L10 的状态需要 0x01 与 0x04 两帧、矩阵压感需要某根手指的全部行)，
+完整时通过 EventHub 发出 state / tactile_frame / fault / temperature / speed / torque / force 事件。
+速度/扭矩为应答帧中的原始值 (G20/L21/L25 为每根手指 6 个电机)，只在有人查询或设置后应答时出现。
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+
+_FINGER_MATRICES = ("thumb_matrix", "index_matrix", "middle_matrix", "ring_matrix", "little_matrix")
+_MATRIX_INDEX_STEP = 16
+
+_SERIAL = tuple(range(0x41, 0x46))  # G20/L21/L25 按手指的位置帧
+_FORCE = (0x20, 0x21, 0x22, 0x23)    # 法向力、切向力、切向力方向、接近感应，各 5 根手指
+_FORCE_SERIAL = (0x90, 0x91, 0x92, 0x93)
+# 型号 -> {事件: 组成一组完整数据的指令字 (按拼接顺序)}
+FRAME_GROUPS: Dict[str, Dict[str, Tuple[int, ...]]] = {
+    "L6": {"state": (0x01,), "temperature": (0x33,), "fault": (0x35,), "speed": (0x05,), "torque": (0x02,),
+           "force": _FORCE},
+    "O6": {"state": (0x01,), "temperature": (0x33,), "fault": (0x35,), "speed": (0x05,), "torque": (0x02,),
+           "force": _FORCE},
+    "L7": {"state": (0x01,), "temperature": (0x33,), "fault": (0x35,), "speed": (0x05,), "torque": (0x02,),
+           "force": _FORCE},
+    "L10": {"state": (0x01, 0x04), "temperature": (0x33, 0x34), "fault": (0x35, 0x36),
+            "speed": (0x05, 0x06), "torque": (0x02, 0x03), "force": _FORCE},
+    "L20": {"state": (0x01, 0x02, 0x03, 0x04), "temperature": (0x09, 0x0B, 0x0C, 0x0D), "fault": (0x07,),
+            "speed": (0x05,), "torque": (0x06,), "force": _FORCE},
+    "G20": {"state": _SERIAL, "temperature": tuple(range(0x61, 0x66)), "fault": tuple(range(0x59, 0x5E)),
+            "speed": tuple(range(0x49, 0x4E)), "torque": tuple(range(0x51, 0x56)), "force": _FORCE_SERIAL},
+    "L21": {"state": _SERIAL, "temperature": tuple(range(0x61, 0x66)), "fault": tuple(range(0x59, 0x5E)),
+            "speed": tuple(range(0x49, 0x4E)), "torque": tuple(range(0x51, 0x56)), "force": _FORCE_SERIAL},
+    "L25": {"state": _SERIAL, "temperature": tuple(range(0x61, 0x66)), "fault": tuple(range(0x59, 0x5E)),
+            "speed": tuple(range(0x49, 0x4E)), "torque": tuple(range(0x51, 0x56)), "force": _FORCE_SERIAL},
+}
+
+
+class CanFrameObserver:
+    def __init__(self, hand, model: str, hub):
+        self.hand = hand
+        self.model = model.upper()
+        self.hub = hub
+        self._cmd_event: Dict[int, str] = {}
+        self._groups = FRAME_GROUPS.get(self.model, {})
+        for event, cmds in self._groups.items():
+            for cmd in cmds:
+                self._cmd_event[cmd] = event
+        self._parts: Dict[str, Dict[int, List[int]]] = {event: {} for event in self._groups}
+        self._last_fault: Optional[List[int]] = None
+        self._row_masks = [0] * 5
+        self._ids = (hand.can_id, hand.can_id + 8) if self.model == "L6" else (hand.can_id,)
+        self._process: Optional[Callable] = None
+
+    def attach(self) -> "CanFrameObserver":
+        if self._process is None:
+            self._process = self.hand.process_response
+            # 接收线程通过 self.process_response 调用，实例属性优先于类方法
+            self.hand.process_response = self.process_response
+        return self
+
+    def detach(self):
+        if self._process is not None:
+            self.hand.process_response = self._process
+            self._process = None
+
+    def process_response(self, msg):
+        self._process(msg)
+        if msg.arbitration_id not in self._ids or len(msg.data) < 2:
+            return
+        cmd = msg.data[0]
+        event = self._cmd_event.get(cmd)
+        if event is not None:
+            self._on_group_frame(event, cmd, list(msg.data[1:]))
+        elif 0xB1 <= cmd <= 0xB5 and self.hub.has_subscribers("tactile_frame"):
+            self._on_tactile_row(cmd - 0xB1, msg.data)
+
+    def _on_group_frame(self, event: str, cmd: int, values: List[int]):
+        parts = self._parts[event]
+        parts[cmd] = values
+        cmds = self._groups[event]
+        if len(parts) < len(cmds):
+            return
+        self._parts[event] = {}
+        if event == "state":
+            data = self._state([parts[c] for c in cmds])
+        else:
+            data = [v for c in cmds for v in parts[c]]
+        if data is None:
+            return
+        if event == "fault":
+            # 故障码只在变化时通知
+            if data == self._last_fault:
+                return
+            self._last_fault = data
+        self.hub.emit(event, data)
+
+    def _state(self, parts: List[List[int]]):
+        if self.model == "G20":
+            return self.hand.joint_state_to_cmd_state(list=parts)
+        state = [v for p in parts for v in p]
+        if self.model in ("L21", "L25"):
+            # 30 个电机数据映射为 25 个关节
+            return self.hand.state_to_cmd(state) if len(state) == 30 else None
+        return state
+
+    def _on_tactile_row(self, finger: int, data):
+        # 行帧: [指令, 行号(0,16,32...), 数据...]；短帧为压感类型/单值应答
+        matrix = getattr(self.hand, _FINGER_MATRICES[finger], None)
+        if matrix is None or len(data) != matrix.shape[1] + 2:
+            return
+        row = data[1] // _MATRIX_INDEX_STEP
+        if data[1] % _MATRIX_INDEX_STEP or row >= matrix.shape[0]:
+            return
+        if row == 0:
+            self._row_masks[finger] = 0
+        self._row_masks[finger] |= 1 << row
+        if self._row_masks[finger] == (1 << matrix.shape[0]) - 1:
+            self._row_masks[finger] = 0
+            self.hub.emit("tactile_frame", finger, matrix.copy())
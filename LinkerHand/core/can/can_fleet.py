@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多通道多手管理
+
+按 (通道, CAN ID, 型号) 声明多只手，FleetManager 统一持有:
+  - 每个通道一条总线连接，全部注册到同一个 CanEventLoop (单线程 epoll)，按仲裁 ID 把帧分发给对应手的驱动解码
+  - 一个遥测线程，按 telemetry_hz 依次向所有手发出状态查询帧 (不等待应答)
+  - 汇总的 snapshot() / move() / set_speed() 接口，以及每只手的 health() 统计
+  - publish_state(): 把某只手的解码状态发布到共享内存，供本机其他进程读取
+整个进程只有接收与遥测两个线程，与通道数、手的数量无关。驱动仍负责编码/解码，构造时传入 receive=False，
+不启动驱动自带的接收线程，所有帧只由事件循环读取并交给驱动的 process_response。
+
+命令行:
+    python can_fleet.py --hand can0:0x28:L10 --hand can0:0x27:L10 --hand can1:0x28:L6
+"""
+import argparse
+import importlib
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import can
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")))
+from core.can.can_event_loop import CanEventLoop
+from core.can.can_events import FRAME_GROUPS, CanFrameObserver
+from utils.event_hub import EventHub
+
+CAN_DRIVERS = {
+    "O6": ("core.can.linker_hand_o6_can", "LinkerHandO6Can"),
+    "L6": ("core.can.linker_hand_l6_can", "LinkerHandL6Can"),
+    "L7": ("core.can.linker_hand_l7_can", "LinkerHandL7Can"),
+    "L10": ("core.can.linker_hand_l10_can", "LinkerHandL10Can"),
+    "L20": ("core.can.linker_hand_l20_can", "LinkerHandL20Can"),
+    "G20": ("core.can.linker_hand_g20_can", "LinkerHandG20Can"),
+    "L21": ("core.can.linker_hand_l21_can", "LinkerHandL21Can"),
+    "L25": ("core.can.linker_hand_l25_can", "LinkerHandL25Can"),
+}
+
+
+@dataclass(frozen=True)
+class HandSpec:
+    channel: str
+    hand_id: int
+    model: str
+    name: str = ""
+
+    @classmethod
+    def parse(cls, text: str) -> "HandSpec":
+        '''"通道:ID:型号[:名称]"，例如 can0:0x28:L10:left'''
+        parts = text.split(":")
+        if len(parts) not in (3, 4):
+            raise ValueError(f"手声明格式应为 通道:ID:型号[:名称]，收到: {text}")
+        return cls(parts[0], int(parts[1], 0), parts[2].upper(), parts[3] if len(parts) == 4 else "")
+
+    @property
+    def key(self) -> str:
+        return self.name or f"{self.channel}:{self.hand_id:#x}"
+
+
+class _HandPort:
+    '''交给驱动的 bus: 发送走通道总线；驱动以 receive=False 构造，不启动自带的接收线程，帧由通道线程分发'''
+    def __init__(self, channel: "_Channel"):
+        self._channel = channel
+        self.channel_info = channel.name
+
+    def send(self, msg, timeout=None):
+        self._channel.send(msg)
+
+    def shutdown(self):
+        pass
+
+
+class _Channel:
+    def __init__(self, name: str, interface: str, bitrate: int, bus: Optional[can.BusABC] = None):
+        self.name = name
+        self.bus = bus if bus is not None else can.interface.Bus(channel=name, interface=interface, bitrate=bitrate)
+        self.routes: Dict[int, "FleetHand"] = {}
+        self.rx = 0
+        self.tx = 0
+        self.errors = 0
+        self._send_lock = threading.Lock()
+
+    def send(self, msg):
+        with self._send_lock:
+            try:
+                self.bus.send(msg)
+                self.tx += 1
+            except can.CanError as e:
+                self.errors += 1
+                print(f"{self.name} send failed: {e}", flush=True)
+
+    def dispatch(self, frames: List[can.Message]):
+        '''事件循环线程中调用，一批帧按仲裁 ID 分发'''
+        self.rx += len(frames)
+        routes = self.routes
+        for msg in frames:
+            hand = routes.get(msg.arbitration_id)
+            if hand is not None:
+                hand.dispatch(msg)
+
+
+class FleetHand:
+    def __init__(self, spec: HandSpec, channel: _Channel):
+        self.spec = spec
+        self.channel = channel
+        self.hand = None
+        self.rx = 0
+        self.tx = 0
+        self.last_rx: Optional[float] = None
+        self.state: Optional[List[int]] = None
+        self.state_time: Optional[float] = None
+        self.faults: Optional[List[int]] = None
+        self.temperatures: Optional[List[int]] = None
+        self._pending: List[can.Message] = []
+        self.publisher = None
+        self.hub = EventHub()
+        self.hub.subscribe("state", self._on_state)
+        self.hub.subscribe("fault", self._on_fault)
+        self.hub.subscribe("temperature", self._on_temperature)
+
+    def attach(self, hand):
+        self.hand = hand
+        CanFrameObserver(hand, self.spec.model, self.hub).attach()
+        # 驱动构造期间 (初始化查询) 到达的帧
+        pending, self._pending = self._pending, []
+        for msg in pending:
+            hand.process_response(msg)
+
+    def dispatch(self, msg):
+        self.rx += 1
+        self.last_rx = time.time()
+        if self.hand is None:
+            self._pending.append(msg)
+        else:
+            self.hand.process_response(msg)
+
+    def query(self, cmds: Iterable[int]):
+        for cmd in cmds:
+            self.channel.send(can.Message(arbitration_id=self.spec.hand_id, data=[cmd], is_extended_id=False))
+            self.tx += 1
+
+    def _on_state(self, state):
+        self.state = list(state)
+        self.state_time = time.time()
+
+    def _on_fault(self, faults):
+        self.faults = list(faults)
+
+    def _on_temperature(self, temperatures):
+        self.temperatures = list(temperatures)
+
+
+class FleetManager:
+    def __init__(self, specs: Iterable, interface: str = "socketcan", bitrate: int = 1000000,
+                 telemetry_hz: float = 50.0, slow_every: int = 25, timeout: float = 0.5,
+                 buses: Optional[Dict[str, can.BusABC]] = None):
+        '''
+        specs: HandSpec 或 "通道:ID:型号[:名称]" 字符串
+        slow_every: 每隔多少个遥测周期查询一次温度/故障；timeout: 多久没收到帧视为离线
+        buses: 可选，通道名 -> 已打开的总线 (测试/仿真用)
+        '''
+        specs = [s if isinstance(s, HandSpec) else HandSpec.parse(s) for s in specs]
+        self.telemetry_period = 1.0 / telemetry_hz
+        self.slow_every = slow_every
+        self.timeout = timeout
+        self.channels: Dict[str, _Channel] = {}
+        self.hands: Dict[str, FleetHand] = {}
+        buses = buses or {}
+        for spec in specs:
+            if spec.model not in CAN_DRIVERS:
+                raise ValueError(f"{spec.model} 不支持，可选 {tuple(CAN_DRIVERS)}")
+            if spec.key in self.hands:
+                raise ValueError(f"重复的手: {spec.key}")
+            channel = self.channels.get(spec.channel)
+            if channel is None:
+                channel = self.channels[spec.channel] = _Channel(spec.channel, interface, bitrate, buses.get(spec.channel))
+            ids = (spec.hand_id, spec.hand_id + 8) if spec.model == "L6" else (spec.hand_id,)
+            for i in ids:
+                if i in channel.routes:
+                    raise ValueError(f"{spec.channel} 上 CAN ID {i:#x} 已被 {channel.routes[i].spec.key} 使用")
+            hand = FleetHand(spec, channel)
+            for i in ids:
+                channel.routes[i] = hand
+            self.hands[spec.key] = hand
+        self.io = CanEventLoop()
+        for channel in self.channels.values():
+            self.io.add(channel.bus, channel.dispatch)
+        self.io.start()
+        for hand in self.hands.values():
+            module, name = CAN_DRIVERS[hand.spec.model]
+            driver = getattr(importlib.import_module(module), name)(
+                can_id=hand.spec.hand_id, can_channel=hand.spec.channel, baudrate=bitrate, bus=_HandPort(hand.channel),
+                receive=False)
+            hand.attach(driver)
+        self._tick = 0
+        self._running = True
+        self._telemetry = threading.Thread(target=self._telemetry_loop, name="linker-hand-fleet-telemetry", daemon=True)
+        self._telemetry.start()
+
+    # ----------------------------------------------------------
+    # 遥测
+    # ----------------------------------------------------------
+    def _telemetry_loop(self):
+        next_tick = time.perf_counter()
+        while self._running:
+            slow = self._tick % self.slow_every == 0
+            for hand in self.hands.values():
+                groups = FRAME_GROUPS[hand.spec.model]
+                hand.query(groups["state"])
+                if slow:
+                    hand.query(groups["temperature"] + groups["fault"])
+            self._tick += 1
+            next_tick += self.telemetry_period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+    # ----------------------------------------------------------
+    # 汇总接口
+    # ----------------------------------------------------------
+    def __getitem__(self, key: str):
+        '''按名称取驱动对象，可直接调用驱动的其他接口'''
+        return self.hands[key].hand
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        '''各手最近一次完整解码的状态/温度/故障 (不发送任何帧)'''
+        now = time.time()
+        return {
+            key: {
+                "state": hand.state,
+                "age": None if hand.state_time is None else now - hand.state_time,
+                "temperature": hand.temperatures,
+                "fault": hand.faults,
+            }
+            for key, hand in self.hands.items()
+        }
+
+    def move(self, poses: Dict[str, List[int]]):
+        '''poses: 名称 -> 姿态 (长度同 finger_move)'''
+        for key, pose in poses.items():
+            self.hands[key].hand.set_joint_positions([int(v) for v in pose])
+
+    def set_speed(self, speed: List[int], keys: Optional[Iterable[str]] = None):
+        for key in keys or self.hands:
+            self.hands[key].hand.set_speed(speed=speed)
+
+    def publish_state(self, key: str, name: Optional[str] = None) -> str:
+        '''把一只手的解码状态发布到共享内存 (默认段名 linker_hand_<名称>)，返回段名'''
+        from utils.state_publisher import StatePublisher
+        hand = self.hands[key]
+        if hand.publisher is not None:
+            hand.publisher.close()
+        hand.publisher = StatePublisher(hand.hub, hand.spec.model, name or f"linker_hand_{key}", hand.spec.hand_id)
+        if hand.faults is not None:
+            hand.publisher.update("fault", hand.faults)
+        return hand.publisher.name
+
+    def health(self) -> Dict[str, Dict[str, object]]:
+        now = time.time()
+        out = {}
+        for key, hand in self.hands.items():
+            age = None if hand.last_rx is None else now - hand.last_rx
+            out[key] = {
+                "channel": hand.spec.channel,
+                "id": hand.spec.hand_id,
+                "model": hand.spec.model,
+                "online": age is not None and age < self.timeout,
+                "rx": hand.rx,
+                "tx": hand.tx,
+                "last_rx_age": age,
+                "fault": bool(hand.faults and any(hand.faults)),
+            }
+        return out
+
+    def channel_stats(self) -> Dict[str, Dict[str, int]]:
+        io = self.io.stats()
+        return {name: {"hands": len(set(c.routes.values())), "rx": c.rx, "tx": c.tx, "errors": c.errors,
+                       "max_batch": io.get(str(c.bus.channel_info), {}).get("max_batch", 0)}
+                for name, c in self.channels.items()}
+
+    def close(self):
+        self._running = False
+        self._telemetry.join()
+        for hand in self.hands.values():
+            hand.hand.running = False
+            if hand.publisher is not None:
+                hand.publisher.close()
+            hand.hub.close()
+        self.io.close()
+        for channel in self.channels.values():
+            channel.bus.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多通道 LinkerHand 管理")
+    parser.add_argument("--hand", action="append", required=True, help="通道:ID:型号[:名称]，可重复")
+    parser.add_argument("--interface", default="socketcan", help="python-can interface (socketcan / virtual ...)")
+    parser.add_argument("--telemetry_hz", type=float, default=50.0)
+    parser.add_argument("--interval", type=float, default=1.0, help="打印健康状态的间隔 (秒)")
+    args = parser.parse_args()
+    fleet = FleetManager(args.hand, interface=args.interface, telemetry_hz=args.telemetry_hz)
+    try:
+        while True:
+            time.sleep(args.interval)
+            for key, h in fleet.health().items():
+                print(f"{key:>16} {h['model']:>4} online={h['online']} rx={h['rx']} tx={h['tx']} fault={h['fault']}", flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fleet.close()
+
+
+if __name__ == "__main__":
+    main()
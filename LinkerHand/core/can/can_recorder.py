@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CAN 报文录制与确定性回放
+
+录制: RecordingBus 包装驱动的 self.bus，send() 记为 TX、recv() 记为 RX，带时间戳写入日志。
+      格式由扩展名决定 (python-can Logger): .blf 为压缩二进制 (推荐)，.asc/.log/.csv 为文本，
+      可直接用 python-can 工具 (python -m can.logconvert / can.LogReader) 或 CANalyzer 读取。
+回放: CanReplay 把日志中的 RX 帧按原始节奏 (speed=1.0) 或尽可能快 (speed=None) 逐帧交给
+      驱动的 process_response，与接收线程走同一解码路径，可离线复现现场问题、测量解码吞吐。
+      ReplayBus 则把日志伪装成一条总线，驱动构造时传入 bus=ReplayBus(...) 即可在无硬件时运行完整驱动。
+
+    rec = record_hand(api.hand, "session.blf")
+    ...
+    rec.stop()
+    convert("session.blf", "session.asc")
+    CanReplay("session.blf").run(hand.process_response, speed=None)
+"""
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional
+
+import can
+
+
+def _copy(msg: can.Message, is_rx: bool, timestamp: Optional[float] = None) -> can.Message:
+    return can.Message(
+        timestamp=msg.timestamp if timestamp is None else timestamp,
+        arbitration_id=msg.arbitration_id,
+        is_extended_id=msg.is_extended_id,
+        is_remote_frame=msg.is_remote_frame,
+        is_error_frame=msg.is_error_frame,
+        dlc=msg.dlc,
+        data=bytes(msg.data),
+        is_rx=is_rx,
+        channel=msg.channel,
+    )
+
+
+class RecordingBus:
+    """
+    透明包装一条 python-can 总线，收发的每一帧都写入 writer (can.Listener，如 can.Logger)
+    除 send/recv 外的属性和方法原样转发给被包装的总线
+    """
+
+    def __init__(self, bus, writer: can.Listener):
+        self.bus = bus
+        self.writer = writer
+        self.tx = 0
+        self.rx = 0
+        self._lock = threading.Lock()  # 发送线程与接收线程同时写日志
+
+    def __getattr__(self, name):
+        return getattr(self.bus, name)
+
+    def _log(self, msg: can.Message):
+        with self._lock:
+            if self.writer is not None:
+                self.writer.on_message_received(msg)
+
+    def send(self, msg: can.Message, timeout: Optional[float] = None):
+        self.bus.send(msg, timeout)
+        self.tx += 1
+        # 驱动构造的 Message 不带时间戳，按发送完成时刻记录
+        self._log(_copy(msg, is_rx=False, timestamp=time.time()))
+
+    def recv(self, timeout: Optional[float] = None) -> Optional[can.Message]:
+        msg = self.bus.recv(timeout)
+        if msg is not None:
+            self.rx += 1
+            self._log(_copy(msg, is_rx=True, timestamp=msg.timestamp or time.time()))
+        return msg
+
+    def detach(self):
+        """停止记录并关闭日志文件，返回被包装的原始总线"""
+        with self._lock:
+            writer, self.writer = self.writer, None
+        if writer is not None:
+            writer.stop()
+        return self.bus
+
+
+class HandRecording:
+    """record_hand() 的句柄，stop() 还原驱动原来的总线"""
+
+    def __init__(self, hand, path: str):
+        self.hand = hand
+        self.path = path
+        self.bus = RecordingBus(hand.bus, can.Logger(path))
+        hand.bus = self.bus
+
+    def stop(self) -> Dict[str, int]:
+        # 驱动在发送失败重连时会直接替换 hand.bus，此时不再覆盖
+        if self.hand.bus is self.bus:
+            self.hand.bus = self.bus.bus
+        self.bus.detach()
+        return {"tx": self.bus.tx, "rx": self.bus.rx}
+
+
+def record_hand(hand, path: str) -> HandRecording:
+    """开始录制 CAN 驱动 (core/can/linker_hand_*_can.py) 的全部收发帧"""
+    return HandRecording(hand, path)
+
+
+def convert(src: str, dst: str) -> int:
+    """日志格式转换 (如 .blf -> .asc)，返回帧数"""
+    count = 0
+    writer = can.Logger(dst)
+    try:
+        for msg in can.LogReader(src):
+            writer.on_message_received(msg)
+            count += 1
+    finally:
+        writer.stop()
+    return count
+
+
+class CanReplay:
+    def __init__(self, path: str, arbitration_id: Optional[int] = None, rx_only: bool = True):
+        """
+        arbitration_id: 只回放该 ID 的帧，为空时全部回放
+        rx_only: 只回放 RX 帧 (驱动实际收到的帧)；为 False 时 TX 帧一并回放
+        """
+        self.path = path
+        self.arbitration_id = arbitration_id
+        self.rx_only = rx_only
+
+    def frames(self) -> Iterator[can.Message]:
+        for msg in can.LogReader(self.path):
+            if msg.is_error_frame or (self.rx_only and not msg.is_rx):
+                continue
+            if self.arbitration_id is not None and msg.arbitration_id != self.arbitration_id:
+                continue
+            yield msg
+
+    def paced(self, speed: Optional[float] = 1.0) -> Iterator[can.Message]:
+        """按录制时的帧间隔 / speed 逐帧产出；speed 为空或 <= 0 时不等待"""
+        t0 = wall0 = None
+        for msg in self.frames():
+            if speed and speed > 0:
+                if t0 is None:
+                    t0, wall0 = msg.timestamp, time.perf_counter()
+                delay = wall0 + (msg.timestamp - t0) / speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            yield msg
+
+    def run(self, handler: Callable[[can.Message], None], speed: Optional[float] = 1.0) -> Dict[str, float]:
+        """
+        逐帧调用 handler (通常为 hand.process_response)，返回帧数、耗时与吞吐
+        speed=None 时 elapsed/frames_per_second 即为纯解码开销
+        """
+        frames = 0
+        handler_time = 0.0
+        start = time.perf_counter()
+        for msg in self.paced(speed):
+            t = time.perf_counter()
+            handler(msg)
+            handler_time += time.perf_counter() - t
+            frames += 1
+        elapsed = time.perf_counter() - start
+        return {
+            "frames": frames,
+            "elapsed": elapsed,
+            "frames_per_second": frames / elapsed if elapsed > 0 else 0.0,
+            "handler_us_per_frame": handler_time / frames * 1e6 if frames else 0.0,
+        }
+
+
+class ReplayBus(can.BusABC):
+    """
+    把录制日志作为一条只读总线: recv() 按节奏返回日志中的 RX 帧，send() 只计数
+    回放结束后 recv() 返回 None (与超时一致)，finished 置位
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0, arbitration_id: Optional[int] = None, **kwargs):
+        self._frames = CanReplay(path, arbitration_id).paced(speed)
+        self.sent = 0
+        self.finished = threading.Event()
+        self._lock = threading.Lock()
+        self.channel_info = f"replay:{path}"
+        super().__init__(channel=path, **kwargs)
+
+    def _recv_internal(self, timeout: Optional[float]):
+        with self._lock:
+            msg = next(self._frames, None)
+        if msg is None:
+            self.finished.set()
+            if timeout:
+                time.sleep(min(timeout, 0.05))
+            return None, False
+        return msg, False
+
+    def send(self, msg: can.Message, timeout: Optional[float] = None):
+        self.sent += 1
+
+    def shutdown(self):
+        self.finished.set()
+        super().shutdown()
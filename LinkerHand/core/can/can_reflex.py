@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+接触反射: 在 CAN 接收线程中对压感/法向力帧直接求值，命中时立即发出位置/扭矩指令帧
+
+规则按手指编译成阈值数组 (压力阈值、法向力阈值、释放阈值、动作)，每帧只做一次查表和比较，
+不经过用户线程，也不等待整手矩阵读完: 矩阵压感的每一行到达即判断该行最大值。
+动作:
+  freeze:     该手指关节目标设为当前实测位置 (停住)
+  backoff:    当前实测位置再向张开方向 (255) 退 backoff
+  cap_torque: 该手指关节扭矩上限设为 torque
+命中后该手指进入锁定状态，finger_move 下发的目标会被 filter_pose() 覆盖为反射目标；
+压力/力回落到 release 比例以下时解除锁定，扭矩恢复为用户设定值。
+压感/法向力帧只在被请求时才会上报: start_poll() 启动后台线程按固定频率只发送有规则的手指的请求帧
+(不等待应答，应答仍由接收线程求值)；不启动时依赖 get_matrix_touch / 抓取控制器等别处的查询。
+目前支持位置帧与 API 关节顺序一致的 L6/O6/L7/L10。
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import can
+import numpy as np
+
+# 手指 (拇指..小指) -> API 关节下标
+FINGER_JOINTS = {
+    "L6": [[0, 1], [2], [3], [4], [5]],
+    "O6": [[0, 1], [2], [3], [4], [5]],
+    "L7": [[0, 1, 6], [2], [3], [4], [5]],
+    "L10": [[0, 1, 9], [2, 6], [3], [4, 7], [5, 8]],
+}
+# 位置 / 扭矩指令帧: (指令字, 覆盖的关节下标)；L10 先发后 4 个关节，与驱动一致
+POSITION_FRAMES = {
+    "L6": ((0x01, range(0, 6)),),
+    "O6": ((0x01, range(0, 6)),),
+    "L7": ((0x01, range(0, 7)),),
+    "L10": ((0x04, range(6, 10)), (0x01, range(0, 6))),
+}
+TORQUE_FRAMES = {
+    "L6": ((0x02, range(0, 6)),),
+    "O6": ((0x02, range(0, 6)),),
+    "L7": ((0x02, range(0, 7)),),
+    "L10": ((0x02, range(0, 5)), (0x03, range(5, 10))),
+}
+NORMAL_FORCE = 0x20
+ACTIONS = {"freeze": 1, "backoff": 2, "cap_torque": 3}
+
+
+class ReflexEngine:
+    def __init__(self, hand, model: str):
+        self.model = model.upper()
+        if self.model not in FINGER_JOINTS:
+            raise ValueError(f"{model} 暂不支持接触反射")
+        self.hand = hand
+        self.fingers = FINGER_JOINTS[self.model]
+        self.joints = sum(len(j) for j in self.fingers)
+        # 编译后的规则表，下标为手指
+        self.pressure_threshold = np.full(5, np.inf)
+        self.force_threshold = np.full(5, np.inf)
+        self.release_ratio = np.full(5, 0.5)
+        self.action = np.zeros(5, dtype=np.int8)
+        self.backoff = np.zeros(5, dtype=np.int16)
+        self.torque_cap = np.zeros(5, dtype=np.int16)
+        self.active = np.zeros(5, dtype=bool)
+        self.source = np.zeros(5, dtype=np.int8)         # 触发来源: 0 压感, 1 法向力
+        self.row_max = np.zeros((5, 16), dtype=np.uint8)  # 每指各行最近一次的最大值
+        self.torque = [255] * self.joints        # 用户设定的扭矩上限
+        self._override: Dict[int, int] = {}      # 关节 -> 反射位置目标
+        self._torque_override: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.triggers = 0
+        self.last_latency = None                 # 最近一次命中: 帧接收时间戳 -> 指令发出 (秒)
+        self._process = None
+        # L6 的应答可能来自 can_id + 8，与驱动及 CanFrameObserver 一致
+        self._ids = (hand.can_id, hand.can_id + 8) if self.model == "L6" else (hand.can_id,)
+        self._poll_thread = None
+        self._polling = threading.Event()
+
+    # ----------------------------------------------------------
+    # 规则
+    # ----------------------------------------------------------
+    def add_rule(self, finger: Optional[int] = None, pressure: Optional[float] = None, force: Optional[float] = None,
+                 action: str = "freeze", release: float = 0.5, backoff: int = 20, torque: int = 50):
+        """finger: 0-4 (拇指..小指)，None 表示五指；pressure: 矩阵压感单点阈值 0-255；force: 法向力阈值"""
+        if action not in ACTIONS:
+            raise ValueError(f"未知动作: {action}，可选 {tuple(ACTIONS)}")
+        if pressure is None and force is None:
+            raise ValueError("pressure 与 force 至少指定一个")
+        idx = list(range(5)) if finger is None else [finger]
+        with self._lock:
+            for f in idx:
+                if pressure is not None:
+                    self.pressure_threshold[f] = pressure
+                if force is not None:
+                    self.force_threshold[f] = force
+                self.release_ratio[f] = release
+                self.action[f] = ACTIONS[action]
+                self.backoff[f] = backoff
+                self.torque_cap[f] = torque
+
+    def clear(self):
+        self.stop_poll()
+        with self._lock:
+            for f in np.flatnonzero(self.active):
+                self._release(int(f))
+            self.pressure_threshold[:] = np.inf
+            self.force_threshold[:] = np.inf
+            self.action[:] = 0
+
+    # ----------------------------------------------------------
+    # 传感器轮询
+    # ----------------------------------------------------------
+    def start_poll(self, rate: float = 50.0):
+        """后台按 rate 请求有规则的手指的矩阵压感与法向力；已在运行时不重复启动"""
+        if self._poll_thread is not None and self._poll_thread.is_alive():
+            return
+        self._polling.set()
+        self._poll_thread = threading.Thread(target=self._poll, args=(rate,), name="linker-hand-reflex-poll", daemon=True)
+        self._poll_thread.start()
+
+    def stop_poll(self):
+        self._polling.clear()
+        if self._poll_thread is not None and self._poll_thread is not threading.current_thread():
+            self._poll_thread.join()
+        self._poll_thread = None
+
+    def _poll(self, rate: float):
+        code = getattr(self.hand, "touch_code", 0xC6)
+        period = 1.0 / rate
+        next_tick = time.perf_counter()
+        while self._polling.is_set():
+            requests = [[0xB1 + f, code] for f in np.flatnonzero(np.isfinite(self.pressure_threshold))]
+            if np.isfinite(self.force_threshold).any():
+                requests.append([NORMAL_FORCE])
+            for data in requests:
+                try:
+                    self.hand.bus.send(can.Message(arbitration_id=self.hand.can_id, is_extended_id=False, data=data))
+                except can.CanError as e:
+                    print(f"Reflex poll failed: {e}", flush=True)
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+    # ----------------------------------------------------------
+    # 接收线程
+    # ----------------------------------------------------------
+    def attach(self) -> "ReflexEngine":
+        if self._process is None:
+            self._process = self.hand.process_response
+            self.hand.process_response = self.process_response
+        return self
+
+    def detach(self):
+        self.stop_poll()
+        if self._process is not None:
+            self.hand.process_response = self._process
+            self._process = None
+
+    def process_response(self, msg):
+        self._process(msg)
+        data = msg.data
+        if msg.arbitration_id not in self._ids or len(data) < 2:
+            return
+        cmd = data[0]
+        if 0xB1 <= cmd <= 0xB5 and len(data) > 3:
+            # 矩阵行帧 [指令, 行号(0,16,32...), 数据...]，每行到达即判断，释放看整根手指的最大值
+            finger, row = cmd - 0xB1, (data[1] >> 4) & 0x0F
+            self.row_max[finger, row] = max(data[2:])
+            self._evaluate(finger, int(self.row_max[finger].max()), 0, msg.timestamp)
+        elif cmd == NORMAL_FORCE and len(data) >= 6:
+            values = np.frombuffer(bytes(data[1:6]), dtype=np.uint8)
+            hit = values > self.force_threshold
+            if hit.any() or self.active.any():
+                for f in range(5):
+                    self._evaluate(f, int(values[f]), 1, msg.timestamp)
+
+    def _evaluate(self, finger: int, value: int, source: int, ts: float):
+        threshold = (self.pressure_threshold, self.force_threshold)[source][finger]
+        if not self.active[finger]:
+            if value > threshold:
+                with self._lock:
+                    self.source[finger] = source
+                    self._trigger(finger)
+                self.triggers += 1
+                if ts:
+                    self.last_latency = time.time() - ts
+        elif self.source[finger] == source and value < threshold * self.release_ratio[finger]:
+            with self._lock:
+                self._release(finger)
+
+    def _trigger(self, finger: int):
+        self.active[finger] = True
+        action = self.action[finger]
+        joints = self.fingers[finger]
+        if action == ACTIONS["cap_torque"]:
+            for j in joints:
+                self._torque_override[j] = int(self.torque_cap[finger])
+            self._send(TORQUE_FRAMES[self.model], self.filter_torque(self.torque))
+            return
+        measured = self._measured()
+        for j in joints:
+            target = measured[j]
+            if action == ACTIONS["backoff"]:
+                target = min(255, target + int(self.backoff[finger]))
+            self._override[j] = target
+        self._send(POSITION_FRAMES[self.model], self.filter_pose(self._commanded()))
+
+    def _release(self, finger: int):
+        self.active[finger] = False
+        capped = False
+        for j in self.fingers[finger]:
+            self._override.pop(j, None)
+            capped = self._torque_override.pop(j, None) is not None or capped
+        if capped:
+            self._send(TORQUE_FRAMES[self.model], self.filter_torque(self.torque))
+
+    # ----------------------------------------------------------
+    # 位置 / 扭矩
+    # ----------------------------------------------------------
+    def _commanded(self) -> List[int]:
+        pose = list(getattr(self.hand, "joint_angles", []) or [])
+        return (pose + [255] * self.joints)[:self.joints]
+
+    def _measured(self) -> List[int]:
+        """最近解码的实测位置，未收到过状态帧的关节用当前指令值代替"""
+        state = list(self.hand.get_current_pub_status() or [])
+        commanded = self._commanded()
+        return [int(state[j]) if j < len(state) and 0 <= state[j] <= 255 else commanded[j] for j in range(self.joints)]
+
+    def filter_pose(self, pose: List[int]) -> List[int]:
+        if not self._override:
+            return pose
+        pose = list(pose)
+        for j, v in list(self._override.items()):
+            if j < len(pose):
+                pose[j] = v
+        return pose
+
+    def filter_torque(self, torque: List[int]) -> List[int]:
+        torque = list(torque)
+        for j, v in list(self._torque_override.items()):
+            if j < len(torque):
+                torque[j] = min(torque[j], v)
+        return torque
+
+    def note_torque(self, torque: List[int]):
+        """记录用户设定的扭矩上限；L10 给 5 个值时驱动把同一组值发到 0x02 与 0x03"""
+        torque = [int(v) for v in torque]
+        if len(torque) == 5 and self.model == "L10":
+            torque = torque * 2
+        self.torque = (torque + [255] * self.joints)[:self.joints]
+
+    def _send(self, frames: Tuple, values: List[int]):
+        for cmd, joints in frames:
+            msg = can.Message(arbitration_id=self.hand.can_id, is_extended_id=False,
+                              data=[cmd] + [int(values[j]) for j in joints])
+            try:
+                self.hand.bus.send(msg)
+            except can.CanError as e:
+                print(f"Reflex send failed: {e}", flush=True)
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "active": [bool(a) for a in self.active],
+            "override": dict(self._override),
+            "torque_override": dict(self._torque_override),
+            "triggers": self.triggers,
+            "last_latency": self.last_latency,
+        }
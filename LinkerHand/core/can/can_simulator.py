@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CAN 灵巧手固件模拟器
+
+在 Linux vcan 虚拟 CAN 接口上按各型号驱动 (core/can/linker_hand_*_can.py) 中的帧定义应答:
+  关节位置/速度/扭矩(电流) 设置与查询、温度、故障码、版本号、序列号、压感类型、矩阵压感多行帧、五指力
+帧格式与真机一致: 标准帧 ID = 手 ID，data[0] 为指令字，data[1:] 为数据；
+数据长度不足一组时视为查询，应答当前值；数据完整时视为设置，更新目标后同样应答当前值。
+关节按一阶惯性环节跟随目标角度，时间常数随速度设定变化；应答可加入延时和随机丢帧。
+
+    sudo modprobe vcan
+    sudo ip link add dev vcan0 type vcan && sudo ip link set up vcan0
+    python3 can_simulator.py --model L10 --channel vcan0 --id 0x28 --latency 0.001
+    python3 can_simulator.py --model L10 --channel vcan0 --check_api     # LinkerHandApi 冒烟检查
+
+驱动侧把 CAN 通道配置为 vcan0 即可，无需真实硬件。
+"""
+import argparse
+import heapq
+import math
+import os
+import random
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import can
+
+MATRIX_INDEX_STEP = 16  # 矩阵压感行号: 0, 16, 32 ... 176
+
+
+def _per_joint(cmd_joints: Dict[int, List[int]]) -> Dict[int, List[Tuple[int, ...]]]:
+    """{指令: [关节, ...]} -> {指令: [(关节,), ...]}"""
+    return {cmd: [(j,) for j in joints] for cmd, joints in cmd_joints.items()}
+
+
+def _l6_like(joints: int, version: List[int], matrix=(12, 6), touch_code: int = 0xC6) -> dict:
+    # L6/O6/L7: 0x01 位置, 0x02 扭矩, 0x05 速度, 0x33 温度, 0x35 故障, 0x36 电流，每帧覆盖全部关节
+    every = list(range(joints))
+    return {
+        "joints": joints,
+        "position": _per_joint({0x01: every}),
+        "torque": _per_joint({0x02: every}),
+        "speed": _per_joint({0x05: every}),
+        "temperature": _per_joint({0x33: every}),
+        "fault": _per_joint({0x35: every}),
+        "current": _per_joint({0x36: every}),
+        "force": (0x20, 0x21, 0x22, 0x23),
+        "version": {0x64: version, 0xC2: version},
+        "serial": True,
+        "matrix": matrix,
+        "touch_code": touch_code,
+        "load_joints": [0, 2, 3, 4, 5],  # 拇指弯曲、食指、中指、无名指、小指
+    }
+
+
+def _l20() -> dict:
+    # 关节下标 finger*4 + (俯仰, 侧摆, 横滚, 指尖)；速度/电流/故障按手指设置，作用于整根手指
+    fingers = [tuple(range(f * 4, f * 4 + 4)) for f in range(5)]
+    joint_type = lambda t: [(f * 4 + t,) for f in range(5)]
+    return {
+        "joints": 20,
+        "position": {0x01: joint_type(0), 0x02: joint_type(1), 0x03: joint_type(2), 0x04: joint_type(3)},
+        "torque": {0x06: fingers},
+        "speed": {0x05: fingers},
+        "temperature": {0x09: joint_type(0), 0x0B: joint_type(1), 0x0C: joint_type(2), 0x0D: joint_type(3)},
+        "fault": {0x07: fingers},
+        "current": {},
+        "force": (0x20, 0x21, 0x22, 0x23),
+        "version": {0xC1: [20, 1, 0, 0], 0xC2: [1, 0, 0, 0]},
+        "serial": False,
+        "matrix": (12, 6),
+        "touch_code": 0xC6,
+        "load_joints": [f * 4 for f in range(5)],
+        "no_reply_offset": 0x10,  # 0x11-0x17: 同 0x01-0x07 的设置，但不应答
+    }
+
+
+def _g20_like(joints_name: str, serial: bool) -> dict:
+    # 关节下标 finger*6 + (横滚, 侧摆, 指根1, 指根2, 指根3, 指尖)
+    # 并联指令 base+关节类型 (每帧 5 根手指)，串联指令 base+手指 (每帧 6 个关节)
+    def parallel(base):
+        return {base + t: [(f * 6 + t,) for f in range(5)] for t in range(6)}
+
+    def serial_(base):
+        return {base + f: [(f * 6 + t,) for t in range(6)] for f in range(5)}
+
+    fingers = [tuple(range(f * 6, f * 6 + 6)) for f in range(5)]
+    return {
+        "joints": 30,
+        "position": {**parallel(0x01), **serial_(0x41)},
+        "speed": {**parallel(0x09), **serial_(0x49), 0x81: fingers},
+        "torque": {**parallel(0x11), **serial_(0x51), 0x82: fingers},
+        "fault": {**parallel(0x19), **serial_(0x59), 0x83: fingers},
+        "temperature": {**parallel(0x21), **serial_(0x61), 0x84: fingers},
+        "current": {},
+        "force": (0x90, 0x91, 0x92, 0x93),
+        "version": {0xC1: [int(joints_name[1:]), 1, 0, 0], 0xC2: [1, 0, 0, 0]},
+        "serial": serial,
+        "matrix": (12, 6),
+        "touch_code": 0xC6,
+        "load_joints": [f * 6 + 2 for f in range(5)],
+    }
+
+
+def _l10() -> dict:
+    # L10: 位置 6+4 (0x01/0x04)，扭矩/速度/温度/故障 5+5
+    first, second = list(range(5)), list(range(5, 10))
+    return {
+        "joints": 10,
+        "position": _per_joint({0x01: list(range(6)), 0x04: list(range(6, 10))}),
+        "torque": _per_joint({0x02: first, 0x03: second}),
+        "speed": _per_joint({0x05: first, 0x06: second}),
+        "temperature": _per_joint({0x33: first, 0x34: second}),
+        "fault": _per_joint({0x35: first, 0x36: second}),
+        "current": {},
+        "force": (0x20, 0x21, 0x22, 0x23),
+        "version": {0x64: [10, 6, 1, 0, 40, 0x10], 0xC2: [10, 6, 1, 0, 40, 0x10]},
+        "serial": True,
+        "matrix": (12, 6),
+        "touch_code": 0xC6,
+        "load_joints": [0, 2, 3, 4, 5],
+    }
+
+
+# 各型号帧表; 位置/速度/扭矩/温度/故障/电流: {指令: [每个数据字节作用的关节元组, ...]}
+MODEL_PROFILES = {
+    "L6": _l6_like(6, [6, 1, 1, 0, 1, 0, 0, 1]),
+    "O6": _l6_like(6, [6, 1, 1, 0, 0x10, 0x10], matrix=(10, 4), touch_code=0xA4),
+    "L7": _l6_like(7, [7, 1, 1, 0, 0x10, 0x10]),
+    "L10": _l10(),
+    "L20": _l20(),
+    "G20": _g20_like("G20", serial=True),
+    "L21": _g20_like("L21", serial=False),
+    "L25": _g20_like("L25", serial=False),
+}
+GROUP_KINDS = ("position", "speed", "torque", "temperature", "fault", "current")
+
+
+class SimulatedCanHand:
+    """单只手的关节/传感器状态与指令应答"""
+
+    def __init__(self, model: str = "L10", hand_id: int = 0x28, tau: float = 0.08, ambient: float = 30.0):
+        self.model = model.upper()
+        self.profile = MODEL_PROFILES[self.model]
+        self.hand_id = hand_id
+        n = self.profile["joints"]
+        self.tau = tau                  # 速度 255 时的时间常数 (秒)
+        self.ambient = ambient
+        self.position = [255.0] * n     # 当前角度 (255 = 张开)
+        self.velocity = [0.0] * n
+        self.target = [255] * n
+        self.torque = [255] * n
+        self.speed = [255] * n
+        self.errors = [0] * n
+        self._t = time.perf_counter()
+        side = "R" if hand_id == 0x27 else "L"
+        # 24 个 ASCII 字符，第 5 段 "B" 表示矩阵压感 (O6 据此选择触觉指令)
+        self.serial_number = f"LH-{self.model}-{side}-2510-B-".ljust(24, "0")[:24]
+        self._commands: Dict[int, Tuple[str, List[Tuple[int, ...]]]] = {}
+        for kind in GROUP_KINDS:
+            for cmd, joints in self.profile[kind].items():
+                self._commands[cmd] = (kind, joints)
+
+    def step(self, now: Optional[float] = None):
+        """推进关节一阶动态到当前时刻"""
+        now = time.perf_counter() if now is None else now
+        dt = now - self._t
+        self._t = now
+        if dt <= 0:
+            return
+        for i, target in enumerate(self.target):
+            tau = self.tau * 255.0 / max(self.speed[i], 1)
+            prev = self.position[i]
+            self.position[i] = target + (prev - target) * math.exp(-dt / tau)
+            self.velocity[i] = (self.position[i] - prev) / dt
+
+    def _value(self, kind: str, j: int) -> float:
+        if kind == "position":
+            return round(self.position[j])
+        if kind == "speed":
+            return self.speed[j]
+        if kind == "torque":
+            return self.torque[j]
+        if kind == "temperature":
+            return self.ambient + self.torque[j] / 64
+        if kind == "fault":
+            return self.errors[j]
+        # 电流: 跟踪误差越大输出越大，不超过扭矩设定
+        return min(self.torque[j], abs(self.target[j] - self.position[j]) * 4)
+
+    def _write(self, kind: str, joints: List[Tuple[int, ...]], values: List[int]):
+        for group, v in zip(joints, values):
+            for j in group:
+                if kind == "position":
+                    self.target[j] = v
+                elif kind == "speed":
+                    self.speed[j] = v
+                elif kind == "torque":
+                    self.torque[j] = v
+                elif kind == "fault":
+                    self.errors[j] = 0  # 写故障帧 = 清除故障
+
+    def load(self, finger: int) -> float:
+        """手指 (0-4) 弯曲程度 0-1"""
+        return 1.0 - self.position[self.profile["load_joints"][finger]] / 255.0
+
+    def matrix_rows(self, finger: int) -> List[List[int]]:
+        """按弯曲程度生成矩阵压感的各行 [行号, 数据...] (越弯越大，中心点最大)"""
+        rows, cols = self.profile["matrix"]
+        load = self.load(finger)
+        out = []
+        for r in range(rows):
+            row = [r * MATRIX_INDEX_STEP]
+            for c in range(cols):
+                w = 1.0 - (abs(r - (rows - 1) / 2) / (rows / 2) + abs(c - (cols - 1) / 2) / (cols / 2)) / 2
+                row.append(int(255 * load * w))
+            out.append(row)
+        return out
+
+    def handle(self, cmd: int, payload: List[int]) -> List[List[int]]:
+        """处理一帧，返回应答帧数据列表 (每项含指令字)"""
+        self.step()
+        p = self.profile
+        if cmd in self._commands:
+            kind, joints = self._commands[cmd]
+            if len(payload) >= len(joints) and kind not in ("temperature", "current"):
+                self._write(kind, joints, [int(v) & 0xFF for v in payload])
+                self.step()
+            values = [self._value(kind, group[0]) for group in joints]
+            return [[cmd] + [int(max(0, min(255, v))) for v in values]]
+        offset = p.get("no_reply_offset")
+        if offset and cmd - offset in self._commands:
+            kind, joints = self._commands[cmd - offset]
+            if len(payload) >= len(joints):
+                self._write(kind, joints, [int(v) & 0xFF for v in payload])
+            return []
+        if cmd in p["force"]:
+            k = p["force"].index(cmd)
+            if k == 1:
+                values = [0] * 5  # 切向力方向
+            else:
+                values = [self.load(f) * 200 / (k + 1) for f in range(5)]
+            return [[cmd] + [int(v) for v in values]]
+        if cmd == 0xB0:
+            return [[cmd, 2]]  # 2 = 矩阵式压感
+        if 0xB1 <= cmd <= 0xB5:
+            finger = cmd - 0xB1
+            if payload:
+                return [[cmd] + row for row in self.matrix_rows(finger)]
+            return [[cmd, p["touch_code"], int(255 * self.load(finger))]]
+        if cmd in p["version"]:
+            return [[cmd] + list(p["version"][cmd])]
+        if cmd == 0xC0:
+            sn = list(self.serial_number.encode("ascii"))
+            if p["serial"]:
+                return [[cmd, i] + sn[i * 6:i * 6 + 6] for i in range(4)]
+            return [[cmd] + sn[:7]]  # 设备信息
+        if cmd == 0xC3:
+            return [[cmd, self.hand_id]]
+        return []  # 未支持的指令不应答
+
+
+class CanSimulator:
+    """
+    在后台线程运行模拟器
+        sim = CanSimulator("L10", channel="vcan0", hand_ids=(0x28,), latency=0.001).start()
+        hand = LinkerHandL10Can(can_id=0x28, can_channel="vcan0")
+    也可传入已打开的 bus (如 python-can 的 virtual 接口) 做进程内测试
+    """
+
+    def __init__(self, model: str = "L10", channel: str = "vcan0", hand_ids=(0x28,),
+                 latency: float = 0.0, drop_rate: float = 0.0, tau: float = 0.08,
+                 interface: str = "socketcan", bus: Optional[can.BusABC] = None):
+        self.model = model.upper()
+        self.hands = {hand_id: SimulatedCanHand(self.model, hand_id, tau=tau) for hand_id in hand_ids}
+        self.channel = channel
+        self.interface = interface
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.bus = bus
+        self._own_bus = bus is None
+        self.received = 0
+        self.sent = 0
+        self.dropped = 0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "CanSimulator":
+        if self.bus is None:
+            self.bus = can.interface.Bus(channel=self.channel, interface=self.interface)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"can-sim-{self.channel}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._own_bus and self.bus is not None:
+            self.bus.shutdown()
+            self.bus = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _run(self):
+        pending = []  # (到期时间, 序号, can.Message)
+        seq = 0
+        while self._running:
+            timeout = 0.05
+            if pending:
+                timeout = max(0.0, min(timeout, pending[0][0] - time.perf_counter()))
+            try:
+                msg = self.bus.recv(timeout=timeout)
+            except can.CanError:
+                msg = None
+            if msg is not None and not msg.is_extended_id and msg.dlc > 0:
+                hand = self.hands.get(msg.arbitration_id)
+                if hand is not None:
+                    self.received += 1
+                    data = list(msg.data)
+                    for reply in hand.handle(data[0], data[1:]):
+                        if self.drop_rate and random.random() < self.drop_rate:
+                            self.dropped += 1
+                            continue
+                        seq += 1
+                        out = can.Message(arbitration_id=msg.arbitration_id, data=reply[:8], is_extended_id=False)
+                        heapq.heappush(pending, (time.perf_counter() + self.latency, seq, out))
+            now = time.perf_counter()
+            while pending and pending[0][0] <= now:
+                try:
+                    self.bus.send(heapq.heappop(pending)[2])
+                    self.sent += 1
+                except can.CanError:
+                    self.dropped += 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CAN hand firmware simulator")
+    parser.add_argument("--model", type=str, default="L10", choices=sorted(MODEL_PROFILES), help="手型号")
+    parser.add_argument("--channel", type=str, default="vcan0", help="CAN 通道 (默认 vcan0)")
+    parser.add_argument("--interface", type=str, default="socketcan")
+    parser.add_argument("--id", type=lambda s: int(s, 0), action="append", help="手 ID，可重复 (默认 0x28)")
+    parser.add_argument("--latency", type=float, default=0.001, help="设备响应延时 (秒)")
+    parser.add_argument("--drop", type=float, default=0.0, help="应答丢帧概率 0-1")
+    parser.add_argument("--tau", type=float, default=0.08, help="关节时间常数 (秒，速度 255 时)")
+    parser.add_argument("--check_api", action="store_true",
+                        help="冒烟检查: 在该通道上构造 LinkerHandApi 并读一次状态后退出")
+    args = parser.parse_args()
+    sim = CanSimulator(args.model, channel=args.channel, hand_ids=args.id or [0x28], latency=args.latency,
+                       drop_rate=args.drop, tau=args.tau, interface=args.interface).start()
+    print(f"{args.model} simulator ids={[hex(i) for i in sim.hands]} channel: {args.channel}", flush=True)
+    if args.check_api:
+        sys.path.append(os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")))
+        from linker_hand_api import LinkerHandApi
+        hand_type = "right" if (args.id or [0x28])[0] == 0x27 else "left"
+        api = LinkerHandApi(hand_type=hand_type, hand_joint=args.model, can=args.channel)
+        # 部分型号首次查询时应答尚未到达，返回 None
+        state = None
+        for _ in range(20):
+            state = api.get_state()
+            if state:
+                break
+            time.sleep(0.05)
+        version = api.get_embedded_version()
+        sim.stop()
+        print(f"LinkerHandApi on {args.channel}: version={version} state={state}", flush=True)
+        sys.exit(0 if state else 1)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
@@ -157,7 +157,7 @@ class FrameProperty(Enum):
     HAND_UID_SET = 0xF0  # 唯一标识码设置
 
 class LinkerHandG20Can:
-    def __init__(self, can_channel='can0', baudrate=1000000, can_id=0x28, yaml=""):
+    def __init__(self, can_channel='can0', baudrate=1000000, can_id=0x28, yaml="", bus=None, receive=True):
         self.can_id = can_id
         self.can_channel = can_channel
         self.baudrate = baudrate
@@ -212,11 +212,12 @@ class LinkerHandG20Can:
             96: 6, 112: 7, 128: 8, 144: 9, 160: 10, 176: 11,
         }
         
-        self.bus = self.init_can_bus(channel=self.can_channel, baudrate=baudrate)
+        self.bus = bus if bus is not None else self.init_can_bus(channel=self.can_channel, baudrate=baudrate)
         # 启动接收线程
         self.receive_thread = threading.Thread(target=self.receive_response)
         self.receive_thread.daemon = True
-        self.receive_thread.start()
+        if receive:
+            self.receive_thread.start()
         self._check_touch_type()
 
     def _check_touch_type(self):
@@ -31,7 +31,7 @@ class FrameProperty(Enum):
     MOTOR_TEMPERATURE_2 = 0x34
 
 class LinkerHandL10Can:
-    def __init__(self,can_id, can_channel='can0', baudrate=1000000, yaml=""):
+    def __init__(self,can_id, can_channel='can0', baudrate=1000000, yaml="", bus=None, receive=True):
         self.can_id = can_id
         self.can_channel = can_channel
         self.baudrate = baudrate
@@ -78,14 +78,15 @@ class LinkerHandL10Can:
         self.can_id = can_id
         self.joint_angles = [0] * 10
         self.pressures = [200] * 5  # Default torque 200
-        self.bus = self.init_can_bus(can_channel, baudrate)
+        self.bus = bus if bus is not None else self.init_can_bus(can_channel, baudrate)
         self.normal_force, self.tangential_force, self.tangential_force_dir, self.approach_inc = [[-1] * 5 for _ in range(4)]
         self.version = None
         # Start receiving thread
         self.running = True
         self.receive_thread = threading.Thread(target=self.receive_response)
         self.receive_thread.daemon = True
-        self.receive_thread.start()
+        if receive:
+            self.receive_thread.start()
         self.version = self.get_version()
 
     def init_can_bus(self, channel, baudrate):
@@ -33,7 +33,7 @@ class FrameProperty(Enum):
 
 
 class LinkerHandL20Can:
-    def __init__(self, can_channel='can0', baudrate=1000000, can_id=0x28,yaml=""):
+    def __init__(self, can_channel='can0', baudrate=1000000, can_id=0x28,yaml="", bus=None, receive=True):
         self.can_id = can_id
         self.can_channel = can_channel
         self.baudrate = baudrate
@@ -83,7 +83,7 @@ class LinkerHandL20Can:
         #         raise EnvironmentError("Unsupported platform for CAN interface")
         # except:
         #     print("Please insert CAN device",flush=True)
-        self.bus = self.init_can_bus(channel=self.can_channel, baudrate=baudrate)
+        self.bus = bus if bus is not None else self.init_can_bus(channel=self.can_channel, baudrate=baudrate)
         # Initialize data storage
         self.x01, self.x02, self.x03, self.x04 = [[-1] * 5 for _ in range(4)]
         self.normal_force, self.tangential_force, self.tangential_force_dir, self.approach_inc = \
@@ -94,7 +94,8 @@ class LinkerHandL20Can:
         time.sleep(0.1)
         self.receive_thread = threading.Thread(target=self.receive_response)
         self.receive_thread.daemon = True
-        self.receive_thread.start()
+        if receive:
+            self.receive_thread.start()
 
     def init_can_bus(self, channel, baudrate):
         """
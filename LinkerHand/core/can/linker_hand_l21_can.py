@@ -109,7 +109,7 @@ class FrameProperty(Enum):
     FINGER_TEMPERATURE = 0x84  # Finger joint temperatures
 
 class LinkerHandL21Can:
-    def __init__(self, can_channel='can0', baudrate=1000000, can_id=0x28,yaml=""):
+    def __init__(self, can_channel='can0', baudrate=1000000, can_id=0x28,yaml="", bus=None, receive=True):
         self.can_id = can_id
         self.can_channel = can_channel
         self.baudrate = baudrate
@@ -170,12 +170,13 @@ class LinkerHandL21Can:
         #         raise EnvironmentError("Unsupported platform for CAN interface")
         # except:
         #     print("Please insert CAN device")
-        self.bus = self.init_can_bus(channel=self.can_channel, baudrate=baudrate)
+        self.bus = bus if bus is not None else self.init_can_bus(channel=self.can_channel, baudrate=baudrate)
 
         # Start receive thread
         self.receive_thread = threading.Thread(target=self.receive_response)
         self.receive_thread.daemon = True
-        self.receive_thread.start()
+        if receive:
+            self.receive_thread.start()
 
     def init_can_bus(self, channel, baudrate):
         """
@@ -112,7 +112,7 @@ class FrameProperty(Enum):
     WHOLE_FRAME = 0xF0  # Whole frame transmission | Returns one byte frame property + the entire structure for 485 and network transmission only
 
 class LinkerHandL25Can:
-    def __init__(self, can_channel='can0', baudrate=1000000, can_id=0x28,yaml=""):
+    def __init__(self, can_channel='can0', baudrate=1000000, can_id=0x28,yaml="", bus=None, receive=True):
         self.can_id = can_id
         self.can_channel = can_channel
         self.baudrate = baudrate
@@ -172,11 +172,12 @@ class LinkerHandL25Can:
         #         raise EnvironmentError("Unsupported platform for CAN interface")
         # except:
         #     print("Please insert CAN device")
-        self.bus = self.init_can_bus(channel=self.can_channel, baudrate=baudrate)
+        self.bus = bus if bus is not None else self.init_can_bus(channel=self.can_channel, baudrate=baudrate)
         # 启动接收线程
         self.receive_thread = threading.Thread(target=self.receive_response)
         self.receive_thread.daemon = True
-        self.receive_thread.start()
+        if receive:
+            self.receive_thread.start()
 
     def init_can_bus(self, channel, baudrate):
         """
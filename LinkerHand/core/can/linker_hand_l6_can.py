@@ -8,7 +8,7 @@ from can.exceptions import CanError
 
 
 class LinkerHandL6Can:
-    def __init__(self, can_id, can_channel='can0', baudrate=1000000,yaml=""):
+    def __init__(self, can_id, can_channel='can0', baudrate=1000000,yaml="", bus=None, receive=True):
         self.can_id = can_id
         self.can_channel = can_channel
         self.baudrate = baudrate
@@ -53,7 +53,7 @@ class LinkerHandL6Can:
         
         self.joint_angles = [0] * 6
         self.pressures = [200] * 6  # Default torque 200
-        self.bus = self.init_can_bus(can_channel, baudrate)
+        self.bus = bus if bus is not None else self.init_can_bus(can_channel, baudrate)
         self.normal_force, self.tangential_force, self.tangential_force_dir, self.approach_inc = [[-1] * 6 for _ in range(4)]
         self.is_lock = False
         self.version = None
@@ -61,7 +61,8 @@ class LinkerHandL6Can:
         self.running = True
         self.receive_thread = threading.Thread(target=self.receive_response)
         self.receive_thread.daemon = True
-        self.receive_thread.start()
+        if receive:
+            self.receive_thread.start()
 
     def init_can_bus(self, channel, baudrate):
         """
@@ -8,7 +8,7 @@ from can.exceptions import CanError
 
 
 class LinkerHandL7Can:
-    def __init__(self, can_id, can_channel='can0', baudrate=1000000,yaml=""):
+    def __init__(self, can_id, can_channel='can0', baudrate=1000000,yaml="", bus=None, receive=True):
         self.can_id = can_id
         self.can_channel = can_channel
         self.baudrate = baudrate
@@ -49,7 +49,7 @@ class LinkerHandL7Can:
         self.x35 = [0] * 7, [0] * 7
         self.joint_angles = [0] * 10
         self.pressures = [200] * 7  # Default torque 200
-        self.bus = self.init_can_bus(can_channel, baudrate)
+        self.bus = bus if bus is not None else self.init_can_bus(can_channel, baudrate)
         self.normal_force, self.tangential_force, self.tangential_force_dir, self.approach_inc = [[-1] * 7 for _ in range(4)]
         self.is_lock = False
         self.version = None
@@ -57,7 +57,8 @@ class LinkerHandL7Can:
         self.running = True
         self.receive_thread = threading.Thread(target=self.receive_response)
         self.receive_thread.daemon = True
-        self.receive_thread.start()
+        if receive:
+            self.receive_thread.start()
 
     def init_can_bus(self, channel, baudrate):
         """
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LinkerHand 网络服务 (HTTP + WebSocket，uvicorn)
+
+HTTP (JSON):
+    GET  /info              型号、左右手、SDK 版本
+    GET  /state             最近一次的关节状态 (服务端缓存，不额外查询)
+    GET  /stats             命令槽与各 WebSocket 客户端的统计
+    POST /pose   {"pose": [...]}       写入最新值优先的命令槽，立即返回 202
+    POST /speed  {"speed": [...]}      POST /torque {"torque": [...]}
+WebSocket /stream?rate=50&tactile=1:
+    服务端按 rate (不超过服务端 rate) 推送二进制状态/压感消息 (格式见 utils/hand_wire.py)
+    客户端可发送二进制姿态消息或 JSON 文本 {"pose": [...]}，同样进入命令槽
+每个客户端只保留每类消息的最新一条: 慢客户端丢弃自己的旧帧 (计入 dropped)，不影响其他客户端和采样。
+
+命令行:
+    python hand_server.py --hand_joint L10 --hand_type left --can can0 --port 8765
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+from utils.command_slot import LatestPoseSlot
+from utils.hand_wire import KIND_POSE, KIND_STATE, KIND_TACTILE, decode, encode_state, encode_tactile
+
+
+class _Client:
+    def __init__(self, rate: float, tactile: bool):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.tactile = tactile
+        self.pending: Dict[int, bytes] = {}
+        self.event = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        self.received = 0
+
+    def offer(self, kind: int, message: bytes):
+        if kind in self.pending:
+            self.dropped += 1
+        self.pending[kind] = message
+        self.event.set()
+
+
+class HandServer:
+    def __init__(self, api, host: str = "127.0.0.1", port: int = 8765, rate: float = 50.0,
+                 tactile_rate: float = 0.0, poll: bool = True):
+        '''
+        api: LinkerHandApi (或同接口对象)；rate: 状态采样/推送频率；tactile_rate: 矩阵压感采样频率 (0 不采样)
+        poll=False 时不主动查询，只推送其他地方 (如抓取控制器) 触发解码的数据
+        '''
+        self.api = api
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.tactile_rate = tactile_rate
+        self.poll = poll
+        self.slot = LatestPoseSlot(api.finger_move)
+        self._state: Optional[List[float]] = None
+        self._state_seq = 0
+        self._tactile = None
+        self._tactile_seq = 0
+        self._clients: List[_Client] = []
+        self._running = False
+        self._threads: List[threading.Thread] = []
+        self._server = None
+        self._info = {"hand_joint": api.hand_joint, "hand_type": api.hand_type, "sdk_version": getattr(api, "version", None)}
+        if hasattr(api, "on_state"):
+            api.on_state(self._on_state)
+            api.on_tactile_frame(self._on_tactile_frame)
+
+    # ----------------------------------------------------------
+    # 采样 (普通线程)
+    # ----------------------------------------------------------
+    def _on_state(self, state):
+        self._state = list(state)
+        self._state_seq += 1
+
+    def _on_tactile_frame(self, finger, matrix):
+        tactile = list(self._tactile) if self._tactile is not None else [np.zeros_like(matrix)] * 5
+        tactile[finger] = matrix
+        self._tactile = tactile
+        self._tactile_seq += 1
+
+    def _sample_loop(self):
+        period = 1.0 / self.rate
+        tactile_every = max(1, int(round(self.rate / self.tactile_rate))) if self.tactile_rate > 0 else 0
+        tick, next_tick = 0, time.perf_counter()
+        while self._running:
+            try:
+                if self.poll:
+                    state = self.api.get_state()
+                    if state:
+                        self._on_state(state)
+                if tactile_every and tick % tactile_every == 0:
+                    self._tactile = list(self.api.get_matrix_touch_v2())
+                    self._tactile_seq += 1
+            except Exception as e:
+                print(f"Hand server sampling error: {e}", flush=True)
+            tick += 1
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+    # ----------------------------------------------------------
+    # 推送 (事件循环)
+    # ----------------------------------------------------------
+    async def _broadcast_loop(self):
+        period = 1.0 / self.rate
+        state_seq = tactile_seq = 0
+        while self._running:
+            await asyncio.sleep(period)
+            if self._state is not None and self._state_seq != state_seq:
+                state_seq = self._state_seq
+                message = encode_state(self._state, state_seq)
+                for client in self._clients:
+                    client.offer(KIND_STATE, message)
+            if self._tactile is not None and self._tactile_seq != tactile_seq:
+                tactile_seq = self._tactile_seq
+                message = encode_tactile(self._tactile, tactile_seq)
+                for client in self._clients:
+                    if client.tactile:
+                        client.offer(KIND_TACTILE, message)
+
+    async def _client_sender(self, client: _Client, send):
+        while True:
+            await client.event.wait()
+            client.event.clear()
+            pending, client.pending = client.pending, {}
+            try:
+                for message in pending.values():
+                    await send({"type": "websocket.send", "bytes": message})
+                    client.sent += 1
+            except Exception:
+                # 连接已断开，由接收端清理
+                return
+            if client.interval:
+                await asyncio.sleep(client.interval)
+
+    # ----------------------------------------------------------
+    # ASGI
+    # ----------------------------------------------------------
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "websocket":
+            await self._websocket(scope, receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        task = None
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                task = asyncio.ensure_future(self._broadcast_loop())
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if task is not None:
+                    task.cancel()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _websocket(self, scope, receive, send):
+        if scope["path"] != "/stream":
+            await send({"type": "websocket.close", "code": 4404})
+            return
+        query = parse_qs(scope.get("query_string", b"").decode())
+        rate = min(float(query.get("rate", [self.rate])[0]), self.rate)
+        client = _Client(rate, query.get("tactile", ["1"])[0] != "0")
+        message = await receive()
+        if message["type"] != "websocket.connect":
+            return
+        await send({"type": "websocket.accept"})
+        self._clients = self._clients + [client]
+        sender = asyncio.ensure_future(self._client_sender(client, send))
+        try:
+            while True:
+                message = await receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                pose = self._parse_pose(message.get("bytes"), message.get("text"))
+                if pose is not None:
+                    client.received += 1
+                    self.slot.put(pose)
+        finally:
+            self._clients = [c for c in self._clients if c is not client]
+            sender.cancel()
+
+    @staticmethod
+    def _parse_pose(data: Optional[bytes], text: Optional[str]) -> Optional[List[int]]:
+        try:
+            if data is not None:
+                message = decode(data)
+                return message.values if message.kind == KIND_POSE else None
+            if text is not None:
+                return [int(v) for v in json.loads(text)["pose"]]
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Hand server bad pose message: {e}", flush=True)
+        return None
+
+    async def _http(self, scope, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        method, path = scope["method"], scope["path"]
+        try:
+            if method == "GET" and path == "/info":
+                status, result = 200, self._info
+            elif method == "GET" and path == "/state":
+                status, result = 200, {"state": self._state, "seq": self._state_seq}
+            elif method == "GET" and path == "/stats":
+                status, result = 200, self.stats()
+            elif method == "POST" and path == "/pose":
+                self.slot.put([int(v) for v in json.loads(body)["pose"]])
+                status, result = 202, {"queued": True}
+            elif method == "POST" and path in ("/speed", "/torque"):
+                key = path[1:]
+                values = [int(v) for v in json.loads(body)[key]]
+                # 速度/扭矩不在热路径上，放到线程中执行避免阻塞事件循环
+                await asyncio.get_running_loop().run_in_executor(None, getattr(self.api, f"set_{key}"), values)
+                status, result = 200, {key: values}
+            else:
+                status, result = 404, {"error": f"{method} {path} not found"}
+        except (ValueError, KeyError, TypeError) as e:
+            status, result = 400, {"error": str(e)}
+        payload = json.dumps(result).encode()
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]})
+        await send({"type": "http.response.body", "body": payload})
+
+    # ----------------------------------------------------------
+    # 启停
+    # ----------------------------------------------------------
+    def stats(self) -> Dict[str, object]:
+        return {
+            "commands": self.slot.stats(),
+            "clients": [{"sent": c.sent, "dropped": c.dropped, "received": c.received} for c in self._clients],
+        }
+
+    def start(self) -> "HandServer":
+        import uvicorn
+        self._running = True
+        if self.poll or self.tactile_rate > 0:
+            sampler = threading.Thread(target=self._sample_loop, name="linker-hand-server-sample", daemon=True)
+            sampler.start()
+            self._threads.append(sampler)
+        self._server = uvicorn.Server(uvicorn.Config(self, host=self.host, port=self.port, log_level="warning"))
+        serve = threading.Thread(target=self._server.run, name="linker-hand-server", daemon=True)
+        serve.start()
+        self._threads.append(serve)
+        while not self._server.started and serve.is_alive():
+            time.sleep(0.01)
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._server is not None:
+            self._server.should_exit = True
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.slot.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LinkerHand HTTP/WebSocket 服务")
+    parser.add_argument("--hand_joint", default="L10")
+    parser.add_argument("--hand_type", default="left")
+    parser.add_argument("--can", default="can0")
+    parser.add_argument("--modbus", default="None")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=50.0)
+    parser.add_argument("--tactile_rate", type=float, default=0.0)
+    args = parser.parse_args()
+    from linker_hand_api import LinkerHandApi
+    api = LinkerHandApi(hand_type=args.hand_type, hand_joint=args.hand_joint, can=args.can, modbus=args.modbus)
+    server = HandServer(api, host=args.host, port=args.port, rate=args.rate, tactile_rate=args.tactile_rate).start()
+    print(f"LinkerHand server on http://{args.host}:{args.port} (ws://{args.host}:{args.port}/stream)", flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        api.close_can()
+
+
+if __name__ == "__main__":
+    main()
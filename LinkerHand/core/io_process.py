@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+独立 I/O 进程
+
+子进程持有总线、驱动和解码，父进程中的 LinkerHandProcess 只是一个薄代理:
+  - 状态/矩阵压感: 子进程在解码路径上 (on_state / on_tactile_frame) 写入共享内存 SeqlockBlock，
+    父进程读取时不经过任何 IPC，也不与子进程争 GIL
+  - finger_move / set_speed / set_torque: 写入共享内存 ShmRing，信号量唤醒子进程的命令线程立即下发
+  - 其余接口: 通过 Pipe 转发给子进程中的 LinkerHandApi 执行并返回结果 (慢路径)
+子进程另有遥测线程按 telemetry_hz 调用 get_state() 触发状态查询；tactile_hz > 0 时按该频率读取矩阵压感。
+父进程里的 MediaPipe / NumPy / Qt 再忙，也不影响帧收发的时序。
+"""
+import multiprocessing as mp
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+from utils.shm_block import SeqlockBlock, ShmRing
+
+MAX_JOINTS = 32
+STATE_LAYOUT = [
+    ("state", "int32", (MAX_JOINTS,)),
+    ("state_len", "int32", (1,)),
+    ("state_time", "float64", (1,)),
+    ("tactile", "int16", (5, 12, 6)),
+    ("tactile_time", "float64", (5,)),
+]
+CMD_POSE, CMD_SPEED, CMD_TORQUE = 1, 2, 3
+_COMMANDS = {CMD_POSE: "finger_move", CMD_SPEED: "set_speed", CMD_TORQUE: "set_torque"}
+
+
+def _child_main(api_factory, api_kwargs, block_name, ring_name, wake, conn, telemetry_hz, tactile_hz):
+    if api_factory is None:
+        from linker_hand_api import LinkerHandApi as api_factory
+    block = SeqlockBlock(STATE_LAYOUT, name=block_name, create=False, untrack=False)
+    ring = ShmRing(name=ring_name, create=False, untrack=False)
+    api = api_factory(**api_kwargs)
+    running = True
+
+    # 回调可能来自接收线程、遥测线程或 RPC 线程，SeqlockBlock 只允许一个写者，写入需串行
+    write_lock = threading.Lock()
+
+    def on_state(state):
+        n = min(len(state), MAX_JOINTS)
+        with write_lock:
+            block.write(state=np.asarray(state[:n], dtype=np.int32), state_len=n, state_time=time.time())
+
+    def on_tactile(finger, matrix):
+        rows, cols = matrix.shape
+        with write_lock:
+            tactile = block.fields["tactile"].copy()
+            tactile[finger, :rows, :cols] = matrix
+            times = block.fields["tactile_time"].copy()
+            times[finger] = time.time()
+            block.write(tactile=tactile, tactile_time=times)
+
+    api.on_state(on_state)
+    api.on_tactile_frame(on_tactile)
+
+    def commands():
+        while running:
+            wake.acquire(timeout=0.5)
+            while True:
+                item = ring.pop()
+                if item is None:
+                    break
+                kind, values = item
+                try:
+                    getattr(api, _COMMANDS[kind])(values)
+                except Exception as e:
+                    print(f"I/O process command error: {e}", flush=True)
+
+    def telemetry():
+        period = 1.0 / telemetry_hz
+        tactile_every = max(1, int(round(telemetry_hz / tactile_hz))) if tactile_hz > 0 else 0
+        tick, next_tick = 0, time.perf_counter()
+        while running:
+            try:
+                api.get_state()
+                if tactile_every and tick % tactile_every == 0:
+                    api.get_matrix_touch_v2()
+            except Exception as e:
+                print(f"I/O process telemetry error: {e}", flush=True)
+            tick += 1
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+    threads = [threading.Thread(target=commands, daemon=True), threading.Thread(target=telemetry, daemon=True)]
+    for t in threads:
+        t.start()
+    conn.send(("ready", None))
+    try:
+        while True:
+            request = conn.recv()
+            if request is None:
+                break
+            name, args, kwargs = request
+            try:
+                conn.send((True, getattr(api, name)(*args, **kwargs)))
+            except Exception as e:
+                conn.send((False, e))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    running = False
+    try:
+        api.close_can()
+    except Exception:
+        pass
+    block.close()
+    ring.close()
+
+
+class LinkerHandProcess:
+    def __init__(self, hand_type="left", hand_joint="L10", modbus="None", can="can0",
+                 telemetry_hz: float = 100.0, tactile_hz: float = 0.0, start_timeout: float = 30.0,
+                 api_factory=None, **api_kwargs):
+        '''
+        参数同 LinkerHandApi；telemetry_hz: 子进程状态查询频率；tactile_hz: 矩阵压感读取频率 (0 不读)
+        api_factory: 可选，子进程中构造 API 的可调用对象 (需可被 pickle)，默认 LinkerHandApi
+        '''
+        self.hand_type = hand_type
+        self.hand_joint = hand_joint
+        self.modbus = modbus
+        self.can = can
+        self._block = SeqlockBlock(STATE_LAYOUT)
+        self._ring = ShmRing(slots=64, width=MAX_JOINTS)
+        ctx = mp.get_context("spawn")
+        self._wake = ctx.Semaphore(0)
+        self._conn, child_conn = ctx.Pipe()
+        self._rpc_lock = threading.Lock()
+        self._push_lock = threading.Lock()  # ShmRing 只允许单生产者，多线程调用 finger_move 等需串行化
+        kwargs = dict(api_kwargs, hand_type=hand_type, hand_joint=hand_joint, modbus=modbus, can=can)
+        self._process = ctx.Process(target=_child_main, name=f"linker-hand-io-{hand_type}", daemon=True,
+                                    args=(api_factory, kwargs, self._block.name, self._ring.name, self._wake, child_conn,
+                                          telemetry_hz, tactile_hz))
+        self._process.start()
+        deadline = time.monotonic() + start_timeout
+        while not self._conn.poll(0.1):
+            if not self._process.is_alive():
+                self.close()
+                raise RuntimeError(f"I/O 子进程启动失败 (exitcode={self._process.exitcode})")
+            if time.monotonic() > deadline:
+                self.close()
+                raise TimeoutError("I/O 子进程启动超时")
+        self._conn.recv()
+
+    # ----------------------------------------------------------
+    # 快路径: 共享内存
+    # ----------------------------------------------------------
+    def _push(self, kind: int, values):
+        values = [int(v) for v in values]
+        with self._push_lock:
+            # 目标位置只有最新值有意义: 环满时覆盖最新一条 CMD_POSE，而不是丢弃本条
+            pushed = self._ring.push(kind, values, overwrite=kind == CMD_POSE)
+        if pushed:
+            self._wake.release()
+
+    def finger_move(self, pose=[]):
+        if len(pose) == 0:
+            return
+        self._push(CMD_POSE, pose)
+
+    def set_speed(self, speed=[100] * 5):
+        self._push(CMD_SPEED, speed)
+
+    def set_torque(self, torque=[180] * 5):
+        self._push(CMD_TORQUE, torque)
+
+    def get_state(self):
+        _, data = self._block.read(("state", "state_len"))
+        return data["state"][:int(data["state_len"][0])].tolist()
+
+    get_state_for_pub = get_state
+
+    def get_state_age(self) -> Optional[float]:
+        '''距离最近一次完整状态解码的秒数'''
+        _, data = self._block.read(("state_time",))
+        t = float(data["state_time"][0])
+        return None if t == 0 else time.time() - t
+
+    def get_matrix_touch(self):
+        _, data = self._block.read(("tactile",))
+        rows, cols = (10, 4) if self.hand_joint.upper() == "O6" else (12, 6)
+        return tuple(data["tactile"][f, :rows, :cols] for f in range(5))
+
+    get_matrix_touch_v2 = get_matrix_touch
+
+    # ----------------------------------------------------------
+    # 慢路径: 转发给子进程
+    # ----------------------------------------------------------
+    def call(self, name: str, *args, **kwargs):
+        with self._rpc_lock:
+            self._conn.send((name, args, kwargs))
+            ok, result = self._conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+    def close(self):
+        try:
+            self._conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._block.close()
+        self._ring.close()
+
+    def close_can(self):
+        self.close()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RS485 asyncio 后端
+
+AsyncModbusBus: 基于 pymodbus AsyncModbusSerialClient，一个串口一个实例
+  - 所有事务在事件循环内串行执行，按 FrameGap 保证帧间隔，等待时不阻塞事件循环
+  - 写操作可 await；同一 (从站, 功能码, 地址, 长度) 尚未发出的写请求只保留最新值 (latest-wins)
+  - poll() 协程周期读取状态寄存器块，交给回调刷新快照
+
+SyncModbusClient: 同步门面，接口与 ModbusSerialClient 相同 (connect/close/read_input_registers/
+write_registers/write_register)，可直接作为 RS485 驱动的 client 使用，LinkerHandApi 无需改动调用方式。
+所有门面共享一个后台事件循环线程，而不是每只手一个线程。
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pymodbus.client import AsyncModbusSerialClient
+from pymodbus.framer import ModbusRtuFramer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from frame_gap import FrameGap, is_bus_error, read_frame_bytes, write_frame_bytes, WRITE_SINGLE_FRAME_BYTES
+
+
+class AsyncModbusBus:
+    def __init__(self, port: str, baudrate: int = 115200, timeout: float = 0.05,
+                 fixed_gap: float = 0.005, adaptive_gap: bool = False):
+        self.port = port
+        self.gap = FrameGap(baudrate=baudrate, fixed_gap=fixed_gap, adaptive=adaptive_gap)
+        self.client = AsyncModbusSerialClient(
+            port=port,
+            framer=ModbusRtuFramer,
+            baudrate=baudrate,
+            bytesize=8,
+            parity="N",
+            stopbits=1,
+            timeout=timeout,
+            retries=3,
+            handle_local_echo=False
+        )
+        # 以下对象需在事件循环内创建，见 connect()
+        self._lock: Optional[asyncio.Lock] = None
+        self._write_event: Optional[asyncio.Event] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        # (slave, fc, address, count) -> [values, future]
+        self._pending: Dict[Tuple[int, int, int, int], list] = {}
+
+    async def connect(self) -> bool:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+            self._write_event = asyncio.Event()
+        connected = await self.client.connect()
+        if connected and self._writer_task is None:
+            self._writer_task = asyncio.get_running_loop().create_task(self._writer())
+        return connected
+
+    async def close(self):
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            self._writer_task = None
+        for values, fut in self._pending.values():
+            if not fut.done():
+                fut.set_exception(ConnectionError(f"{self.port} closed"))
+        self._pending.clear()
+        self.client.close()
+
+    async def _transact(self, request, tx_bytes: int, rx_bytes: int):
+        """独占总线: 等待帧间隔 → 执行 request() → 记录结果"""
+        async with self._lock:
+            delay = self.gap.remaining()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            start = time.perf_counter()
+            try:
+                rsp = await request()
+            except Exception:
+                self.gap.record(False, start)
+                raise
+            self.gap.record(not is_bus_error(rsp), start, tx_bytes, rx_bytes)
+            return rsp
+
+    # ----------------------------------------------------------
+    # 读
+    # ----------------------------------------------------------
+    async def read_input_registers(self, address: int, count: int = 1, slave: int = 0):
+        return await self._transact(
+            lambda: self.client.read_input_registers(address, count, slave=slave),
+            *read_frame_bytes(count))
+
+    # ----------------------------------------------------------
+    # 写 (合并, latest-wins)
+    # ----------------------------------------------------------
+    async def write_registers(self, address: int, values: List[int], slave: int = 0):
+        return await self._submit_write(slave, 16, address, [int(v) for v in values])
+
+    async def write_register(self, address: int, value: int, slave: int = 0):
+        return await self._submit_write(slave, 6, address, [int(value)])
+
+    async def _submit_write(self, slave: int, fc: int, address: int, values: List[int]):
+        key = (slave, fc, address, len(values))
+        item = self._pending.get(key)
+        if item is not None:
+            # 上一次同目标写请求还没发出: 直接覆盖为最新值，两个调用方等待同一结果
+            item[0] = values
+            fut = item[1]
+        else:
+            fut = asyncio.get_running_loop().create_future()
+            self._pending[key] = [values, fut]
+            self._write_event.set()
+        return await asyncio.shield(fut)
+
+    async def _writer(self):
+        while True:
+            await self._write_event.wait()
+            self._write_event.clear()
+            while self._pending:
+                key = next(iter(self._pending))
+                values, fut = self._pending.pop(key)
+                slave, fc, address, count = key
+                try:
+                    if fc == 6:
+                        rsp = await self._transact(
+                            lambda: self.client.write_register(address, values[0], slave=slave),
+                            *WRITE_SINGLE_FRAME_BYTES)
+                    else:
+                        rsp = await self._transact(
+                            lambda: self.client.write_registers(address, values, slave=slave),
+                            *write_frame_bytes(count))
+                except asyncio.CancelledError:
+                    if not fut.done():
+                        fut.cancel()
+                    raise
+                except Exception as e:
+                    if not fut.done():
+                        fut.set_exception(e)
+                    continue
+                if not fut.done():
+                    fut.set_result(rsp)
+
+    # ----------------------------------------------------------
+    # 轮询
+    # ----------------------------------------------------------
+    async def poll(self, slave: int, address: int, count: int,
+                   on_registers: Callable[[List[int]], None], interval: float = 0.01):
+        """周期读取 [address, address+count) 并回调 on_registers(registers)，直到任务被取消"""
+        while True:
+            try:
+                rsp = await self.read_input_registers(address, count, slave)
+                if rsp.isError():
+                    logging.debug(f"poll {self.port} slave={slave} failed: {rsp}")
+                else:
+                    on_registers(rsp.registers)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.debug(f"poll {self.port} slave={slave} failed: {e}")
+            await asyncio.sleep(interval)
+
+
+class EventLoopThread:
+    """后台运行一个事件循环，供同步代码提交协程"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="rs485-asyncio", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: Optional[float] = None):
+        return self.submit(coro).result(timeout)
+
+
+_loop_thread: Optional[EventLoopThread] = None
+_loop_thread_lock = threading.Lock()
+
+
+def get_event_loop_thread() -> EventLoopThread:
+    global _loop_thread
+    with _loop_thread_lock:
+        if _loop_thread is None:
+            _loop_thread = EventLoopThread()
+        return _loop_thread
+
+
+class SyncModbusClient:
+    """AsyncModbusBus 的同步门面，接口与 ModbusSerialClient 一致"""
+
+    def __init__(self, bus: AsyncModbusBus, loop_thread: Optional[EventLoopThread] = None, timeout: float = 1.0):
+        self.bus = bus
+        self.timeout = timeout
+        self._loop = loop_thread or get_event_loop_thread()
+
+    def _run(self, coro):
+        if threading.current_thread() is self._loop._thread:
+            # 在循环线程上同步等待同一个循环只会超时
+            coro.close()
+            raise RuntimeError("不能在 RS485 事件循环线程中同步调用，请把命令放到其他线程执行")
+        return self._loop.run(coro, self.timeout)
+
+    def connect(self) -> bool:
+        return self._run(self.bus.connect())
+
+    def close(self):
+        self._run(self.bus.close())
+
+    def read_input_registers(self, address: int, count: int = 1, slave: int = 0):
+        return self._run(self.bus.read_input_registers(address, count, slave))
+
+    def write_registers(self, address: int, values: List[int], slave: int = 0):
+        return self._run(self.bus.write_registers(address, values, slave))
+
+    def write_register(self, address: int, value: int, slave: int = 0):
+        return self._run(self.bus.write_register(address, value, slave))
+
+    def start_poll(self, slave: int, address: int, count: int,
+                   on_registers: Callable[[List[int]], None], interval: float = 0.01):
+        """在后台事件循环中启动轮询，返回 concurrent.futures.Future，cancel() 即停止"""
+        return self._loop.submit(self.bus.poll(slave, address, count, on_registers, interval))
+
+    def get_bus_stats(self) -> Dict[str, float]:
+        return self.bus.gap.stats()
+
+
+def open_sync_client(port: str, baudrate: int = 115200, **kwargs) -> SyncModbusClient:
+    """创建 asyncio 后端并返回同步门面 (尚未连接，驱动构造时会调用 connect())"""
+    return SyncModbusClient(AsyncModbusBus(port, baudrate=baudrate, **kwargs))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modbus RTU 帧间隔控制
+
+固定模式: 与原驱动一致，两帧之间至少间隔 fixed_gap 秒。
+自适应模式: 实测每次事务的设备响应时间 (turnaround) 与错误率 (error_rate)，
+  基础间隔 = max(3.5 字符静默时间, TURNAROUND_GAIN * turnaround)，响应慢的设备自动多留恢复时间
+  出现 CRC 错误/超时等异常时退避倍数加倍，连续成功后逐步减半
+  实际间隔 = 基础间隔 * 退避倍数 * (1 + error_rate)，不超过 max_gap；错误率较高时即使退避已衰减也保持较大间隔
+  max_gap 默认为固定间隔的 MAX_GAP_FACTOR 倍，慢设备或线路异常时自适应间隔可以大于固定模式
+turnaround 由主机侧往返时间扣除线路传输时间得到，其中仍包含串口驱动、pymodbus 与线程调度的开销，
+  因此会高估设备本身的响应时间 (偏保守，间隔偏大)；TURNAROUND_GAIN 取 0.5 部分抵消这一偏差。
+"""
+import time
+from typing import Dict
+from pymodbus.pdu import ExceptionResponse
+
+
+def silent_interval(baudrate: int) -> float:
+    """Modbus RTU 3.5 字符静默时间 (波特率 > 19200 时规范规定固定为 1.75 ms)"""
+    if baudrate > 19200:
+        return 0.00175
+    return 3.5 * 11 / baudrate
+
+
+def frame_time(baudrate: int, nbytes: int) -> float:
+    """nbytes 字节在线路上的传输时间 (8N1，每字节 10 bit)"""
+    return nbytes * 10.0 / baudrate
+
+
+class FrameGap:
+    SUCCESS_TO_DECAY = 20   # 连续成功多少次后退避减半
+    EMA_ALPHA = 0.1         # 响应时间/错误率的滑动平均系数
+    TURNAROUND_GAIN = 0.5   # 基础间隔至少为设备响应时间的这一比例
+    MAX_GAP_FACTOR = 4.0    # 未指定 max_gap 时，上限为固定间隔的倍数
+
+    def __init__(self, baudrate: int = 115200, fixed_gap: float = 0.030, adaptive: bool = False, max_gap: float = None):
+        self.baudrate = baudrate
+        self.fixed_gap = fixed_gap
+        self.adaptive = adaptive
+        self.min_gap = silent_interval(baudrate)
+        self.max_gap = max_gap if max_gap is not None else self.MAX_GAP_FACTOR * max(fixed_gap, self.min_gap)
+        self._backoff = 1.0          # 当前退避倍数
+        self._success_streak = 0
+        self._last_ts = 0.0          # 上一帧结束时间
+        self.turnaround = 0.0        # 响应时间滑动平均 (去掉线路传输时间，含主机侧开销)
+        self.error_rate = 0.0        # 错误率滑动平均
+        self.transactions = 0
+        self.errors = 0
+
+    @property
+    def effective_gap(self) -> float:
+        """当前实际使用的帧间隔"""
+        if not self.adaptive:
+            return self.fixed_gap
+        base = max(self.min_gap, self.TURNAROUND_GAIN * self.turnaround)
+        return min(self.max_gap, base * self._backoff * (1.0 + self.error_rate))
+
+    def remaining(self) -> float:
+        """距离可以发送下一帧还需等待的时间 (秒)"""
+        return max(0.0, self.effective_gap - (time.perf_counter() - self._last_ts))
+
+    def wait(self):
+        """阻塞直到距离上一帧结束 >= effective_gap"""
+        delay = self.remaining()
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self, ok: bool, start: float, tx_bytes: int = 0, rx_bytes: int = 0):
+        """
+        一次事务结束后调用
+        ok: 是否成功; start: 发送开始时间 (perf_counter); tx_bytes/rx_bytes: 请求/响应帧长度
+        """
+        now = time.perf_counter()
+        self._last_ts = now
+        self.transactions += 1
+        a = self.EMA_ALPHA
+        self.error_rate = (1 - a) * self.error_rate + a * (0.0 if ok else 1.0)
+        if ok:
+            wire = frame_time(self.baudrate, tx_bytes + rx_bytes)
+            sample = max(0.0, (now - start) - wire)
+            self.turnaround = sample if self.transactions == 1 else (1 - a) * self.turnaround + a * sample
+            self._success_streak += 1
+            if self._success_streak >= self.SUCCESS_TO_DECAY:
+                self._success_streak = 0
+                self._backoff = max(1.0, self._backoff / 2)
+        else:
+            self.errors += 1
+            self._success_streak = 0
+            # 错误后立即加倍退避，上限为 max_gap
+            self._backoff = min(self._backoff * 2, self.max_gap / self.min_gap)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "adaptive": self.adaptive,
+            "effective_gap": self.effective_gap,
+            "min_gap": self.min_gap,
+            "turnaround": self.turnaround,
+            "error_rate": self.error_rate,
+            "transactions": self.transactions,
+            "errors": self.errors,
+        }
+
+    def run(self, request, tx_bytes: int = 0, rx_bytes: int = 0):
+        """等待帧间隔 → 执行 request() → 记录本次事务结果，返回 pymodbus 响应"""
+        self.wait()
+        start = time.perf_counter()
+        try:
+            rsp = request()
+        except Exception:
+            self.record(False, start)
+            raise
+        self.record(not is_bus_error(rsp), start, tx_bytes, rx_bytes)
+        return rsp
+
+
+def is_bus_error(rsp) -> bool:
+    """超时/CRC 等线路错误返回 True；从站返回的 Modbus 异常码说明线路正常，不计入退避"""
+    return rsp.isError() and not isinstance(rsp, ExceptionResponse)
+
+
+# 各功能码的 RTU 帧长度 (请求字节数, 响应字节数)，用于从往返时间中扣除线路传输时间
+def read_frame_bytes(count: int):
+    return 8, 5 + 2 * count
+
+
+def write_frame_bytes(count: int):
+    return 9 + 2 * count, 8  # FC16
+
+
+WRITE_SINGLE_FRAME_BYTES = (8, 8)  # FC06
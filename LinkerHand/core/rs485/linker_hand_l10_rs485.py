@@ -1,19 +1,45 @@
 #!/usr/bin/env python3
-import os
+import os, sys
 import time
 import struct
 from typing import Dict, List
 import numpy as np
 from pymodbus.client import ModbusSerialClient
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from status_snapshot import StatusSnapshot
+from frame_gap import FrameGap, read_frame_bytes, write_frame_bytes, WRITE_SINGLE_FRAME_BYTES
+from matrix_touch import MatrixTouchReader
+from register_shadow import HoldingRegisterShadow
 _INTERVAL = 0.005  # 8 ms
 class LinkerHandL10RS485:
     KEYS = ["thumb_cmc_pitch", "thumb_cmc_roll", "index_mcp_pitch", "middle_mcp_pitch",
             "ring_mcp_pitch", "pinky_mcp_pitch", "index_mcp_roll", "ring_mcp_roll",
             "pinky_mcp_roll", "thumb_cmc_yaw"]
 
-    def __init__(self, hand_id=0x27, modbus_port="/dev/ttyUSB0", baudrate=115200):
+    FRAME_GAP = _INTERVAL  # 固定帧间隔
+    STATUS_MAX_AGE = 0.02  # 状态快照有效期
+    # 输入寄存器 0-59: 角度/转矩/速度/(30-39 保留)/温度/错误码，read_all_status() 一次读出后按此切分
+    STATUS_LAYOUT = {
+        "angles":       (0, 10),
+        "torques":      (10, 10),
+        "speeds":       (20, 10),
+        "temperatures": (40, 10),
+        "errors":       (50, 10),
+    }
+    STATUS_REG_COUNT = 60
+
+    def __init__(self, hand_id=0x27, modbus_port="/dev/ttyUSB0", baudrate=115200, adaptive_gap=False, client=None):
+        # adaptive_gap: True 时按波特率和实测错误率自适应帧间隔，否则固定 _INTERVAL
+        # client: 外部 Modbus 客户端 (如 asyncio 后端的同步门面)，由其负责帧间隔；为空时自行打开串口
         self.slave = hand_id
-        self.cli = ModbusSerialClient(
+        self._gap = FrameGap(baudrate=baudrate, fixed_gap=self.FRAME_GAP if client is None else 0.0,
+                             adaptive=adaptive_gap and client is None)
+        self._status = StatusSnapshot(self.STATUS_MAX_AGE)
+        self._status_poll = None
+        self._shadow = HoldingRegisterShadow()  # 保持寄存器影子，只写变化的值
+        # 压感: 选指寄存器 70，数据寄存器 72 起
+        self._touch = MatrixTouchReader(70, 72, self._write_register, self._read_input_registers)
+        self.cli = client or ModbusSerialClient(
             port=modbus_port,
             baudrate=baudrate,
             bytesize=8,
@@ -32,50 +58,93 @@ class LinkerHandL10RS485:
     # --------------------------------------------------
     # 批量读取接口
     # --------------------------------------------------
-    def read_angles(self) -> List[int]:
-        time.sleep(_INTERVAL)
-        rsp = self.cli.read_input_registers(address=0, count=10, slave=self.slave)
+    def _read_input_registers(self, address: int, count: int) -> List[int]:
+        rsp = self._gap.run(
+            lambda: self.cli.read_input_registers(address=address, count=count, slave=self.slave),
+            *read_frame_bytes(count))
         if rsp.isError():
-            raise RuntimeError(f"read_angles failed: {rsp}")
+            raise RuntimeError(f"read_input_registers(address={address}, count={count}) failed: {rsp}")
         return rsp.registers
 
-    def read_torques(self) -> List[int]:
-        time.sleep(_INTERVAL)
-        rsp = self.cli.read_input_registers(address=10, count=10, slave=self.slave)
+    def _write_register(self, address: int, value: int):
+        rsp = self._gap.run(
+            lambda: self.cli.write_register(address=address, value=value, slave=self.slave),
+            *WRITE_SINGLE_FRAME_BYTES)
         if rsp.isError():
-            raise RuntimeError(f"read_torques failed: {rsp}")
-        return rsp.registers
+            raise RuntimeError(f"write_register(address={address}, value={value}) failed: {rsp}")
 
-    def read_speeds(self) -> List[int]:
-        time.sleep(_INTERVAL)
-        rsp = self.cli.read_input_registers(address=20, count=10, slave=self.slave)
+    def _write_registers(self, address: int, values: List[int]):
+        rsp = self._gap.run(
+            lambda: self.cli.write_registers(address=address, values=values, slave=self.slave),
+            *write_frame_bytes(len(values)))
         if rsp.isError():
-            raise RuntimeError(f"read_speeds failed: {rsp}")
-        return rsp.registers
+            raise RuntimeError(f"write_registers(address={address}) failed: {rsp}")
+
+    def _write_changed(self, address: int, values: List[int]):
+        """只写入与上次写入值不同的寄存器段，完全相同则跳过"""
+        self._shadow.write(address, values, self._write_registers, self._write_register)
+
+    def get_bus_stats(self) -> Dict[str, float]:
+        """当前有效帧间隔、设备响应时间、错误率等统计"""
+        if hasattr(self.cli, "get_bus_stats"):
+            return self.cli.get_bus_stats()
+        return self._gap.stats()
+
+    def start_status_poll(self, interval: float = 0.01):
+        """
+        后台周期读取整块状态寄存器刷新快照 (需要 client 支持 start_poll，如 asyncio 后端)
+        返回 Future，cancel() 即停止
+        """
+        self._status.max_age = max(self._status.max_age, interval + 0.05)
+        self.stop_status_poll()
+        self._status_poll = self.cli.start_poll(self.slave, 0, self.STATUS_REG_COUNT,
+                                                lambda regs: self._status.decode(regs, self.STATUS_LAYOUT), interval)
+        return self._status_poll
+
+    def stop_status_poll(self):
+        """停止 start_status_poll 启动的后台轮询 (close() 时自动调用)"""
+        poll, self._status_poll = getattr(self, "_status_poll", None), None
+        if poll is not None:
+            poll.cancel()
+
+    def read_all_status(self) -> Dict[str, List[int]]:
+        """一次功能码 04 事务读取输入寄存器 0-59，解码后写入状态快照"""
+        regs = self._read_input_registers(0, self.STATUS_REG_COUNT)
+        return self._status.decode(regs, self.STATUS_LAYOUT)
+
+    def _read_group(self, key: str) -> List[int]:
+        """单独读取一个分组，并刷新快照中的该分组"""
+        start, count = self.STATUS_LAYOUT[key]
+        values = self._read_input_registers(start, count)
+        self._status.update(**{key: values})
+        return values
+
+    def _status_group(self, key: str) -> List[int]:
+        """快照有效时直接返回，否则只读该分组"""
+        cached = self._status.get(key)
+        return cached if cached is not None else self._read_group(key)
+
+    def read_angles(self) -> List[int]:
+        return self._read_group("angles")
+
+    def read_torques(self) -> List[int]:
+        return self._read_group("torques")
+
+    def read_speeds(self) -> List[int]:
+        return self._read_group("speeds")
 
     def read_temperatures(self) -> List[int]:
-        time.sleep(_INTERVAL)
-        rsp = self.cli.read_input_registers(address=40, count=10, slave=self.slave)
-        if rsp.isError():
-            raise RuntimeError(f"read_temperatures failed: {rsp}")
-        return rsp.registers
+        return self._read_group("temperatures")
 
     def read_error_codes(self) -> List[int]:
-        time.sleep(_INTERVAL)
-        rsp = self.cli.read_input_registers(address=50, count=10, slave=self.slave)
-        if rsp.isError():
-            raise RuntimeError(f"read_error_codes failed: {rsp}")
-        return rsp.registers
+        return self._read_group("errors")
 
     def read_versions(self) -> dict:
-        time.sleep(_INTERVAL)
-        rsp = self.cli.read_input_registers(address=158, count=6, slave=self.slave)
-        if rsp.isError():
-            raise RuntimeError(f"read_versions failed: {rsp}")
+        registers = self._read_input_registers(158, 6)
         keys = ["hand_freedom", "hand_version", "hand_number",
                 "hand_direction", "software_version", "hardware_version"]
-        #return dict(zip(keys, rsp.registers))
-        return rsp.registers
+        #return dict(zip(keys, registers))
+        return registers
 
     # --------------------------------------------------
     # 5 个压力传感器
@@ -95,80 +164,12 @@ class LinkerHandL10RS485:
     def read_pressure_pinky(self) -> np.ndarray:
         return np.array(self._pressure(5), dtype=np.uint8)
 
-    # def _pressure(self, finger: int) -> List[int]:
-    #     time.sleep(_INTERVAL)
-    #     # 先选择手指
-    #     wrsp = self.cli.write_register(address=60, value=finger, slave=self.slave)
-    #     if wrsp.isError():
-    #         raise RuntimeError(f"write finger select {finger} failed: {wrsp}")
-        
-    #     time.sleep(_INTERVAL)
-    #     # 读取压力传感器数据 (96个寄存器)
-    #     rrsp = self.cli.read_input_registers(address=62, count=96, slave=self.slave)
-    #     if rrsp.isError():
-    #         raise RuntimeError(f"read pressure finger={finger} failed: {rrsp}")
-    #     return np.array(rrsp.registers, dtype=np.uint8)
     def _pressure(self, finger: int) -> np.ndarray:
         """
         6x12 (72点) 矩阵尺寸。
-        Modbus 地址 60/62。
+        Modbus 地址 70/72。
         """
-        rows = 12  # 12 行
-        cols = 6   # 6 列
-        finger_size = rows * cols  # 72 个数据点
-        
-        # modbus 地址和计数
-        write_address = 70  # 写入手指选择
-        read_address = 72   # 读取压力数据
-        read_count = 96     # 读取 96 个寄存器
-        skip_count = 10     # 跳过前 10 个校验点
-        
-        # 0. 参数校验和手指写入值确定
-        if finger < 1 or finger > 5:
-            raise ValueError(f"无效的手指编号: {finger}。手指编号应在 1 到 5 之间。")
-            
-        finger_write_value = finger 
-        
-        # 1. 写入手指选择寄存器 (地址 60)
-        time.sleep(0.008)
-        wrsp = self.cli.write_register(address=write_address, value=finger_write_value, slave=self.slave)
-        if wrsp.isError():
-            raise RuntimeError(f"写入手指选择 {finger} 到地址 {write_address} 失败: {wrsp}")
-
-        # 写入后等待片刻
-        time.sleep(0.008) 
-        
-        # 2. 读取地址 62 的数据
-        rrsp = self.cli.read_input_registers(address=read_address, count=read_count, slave=self.slave)
-        
-        if rrsp.isError():
-            raise RuntimeError(f"读取地址 {read_address} 压力数据失败: {rrsp}")
-            
-        registers_16bit: List[int] = rrsp.registers 
-        
-        # 3. 核心数据处理
-        # a. 提取低 8 位数据 (得到 96 个 8 位数据点)
-        final_data_96 = [reg_value & 255 for reg_value in registers_16bit]
-        
-        # b. 跳过前 10 个校验/头部数据点 (得到 86 个有效数据点)
-        effective_data = np.array(final_data_96[skip_count:], dtype=np.uint8)
-        # c. 截取当前手指的矩阵数据 (从 86 个有效点中截取 72 个点)
-        start_idx = 0 
-        end_idx = finger_size  # 72
-        
-        finger_data_flat = effective_data[start_idx:end_idx]
-        
-        # d. 验证数据长度
-        if finger_data_flat.size != finger_size:
-            raise ValueError(
-                f"数据提取失败。期望 {finger_size} 点 ({rows}x{cols})，"
-                f"但仅截取到 {finger_data_flat.size} 点。请检查协议，确认地址 62 是否一次性返回了所有手指数据。"
-            )
-            
-        # e. 重塑为二维矩阵 (12 行 6 列)
-        finger_matrix = finger_data_flat.reshape((rows, cols))
-                
-        return finger_matrix
+        return self._touch.read_finger(finger).copy()
 
     
     
@@ -181,38 +182,31 @@ class LinkerHandL10RS485:
         if not self.is_valid_10xuint8(vals):
             raise ValueError("需要 10 个 0-255 整数")
         
-        time.sleep(_INTERVAL)
-        rsp = self.cli.write_registers(address=0, values=vals, slave=self.slave)
-        if rsp.isError():
-            raise RuntimeError(f"write_angles failed: {rsp}")
+        self._write_changed(0, vals)
 
     def write_speeds(self, vals: List[int]):
         vals = [int(x) for x in vals]
         if not self.is_valid_10xuint8(vals):
             raise ValueError("需要 10 个 0-255 整数")
             
-        time.sleep(_INTERVAL)
-        rsp = self.cli.write_registers(address=20, values=vals, slave=self.slave)
-        if rsp.isError():
-            raise RuntimeError(f"write_speeds failed: {rsp}")
+        self._write_changed(20, vals)
 
     def write_torques(self, vals: List[int]):
         vals = [int(x) for x in vals]
         if not self.is_valid_10xuint8(vals):
             raise ValueError("需要 10 个 0-255 整数")
             
-        time.sleep(_INTERVAL)
-        rsp = self.cli.write_registers(address=10, values=vals, slave=self.slave)
-        if rsp.isError():
-            raise RuntimeError(f"write_torques failed: {rsp}")
+        self._write_changed(10, vals)
 
     # --------------------------------------------------
     # 上下文管理
     # --------------------------------------------------
     def close(self):
+        self.stop_status_poll()
         if self.connected:
             self.cli.close()
             self.connected = False
+            self._shadow.invalidate()
 
     def __enter__(self):
         return self
@@ -253,7 +247,7 @@ class LinkerHandL10RS485:
         print("当前L10不支持获取电流", flush=True)
 
     def get_state(self) -> List[int]:
-        return self.read_angles()
+        return self._status_group("angles")
 
     def get_state_for_pub(self) -> List[int]:
         return self.get_state()
@@ -262,7 +256,7 @@ class LinkerHandL10RS485:
         return self.get_state()
 
     def get_speed(self) -> List[int]:
-        return self.read_speeds()
+        return self._status_group("speeds")
 
     def get_joint_speed(self) -> List[int]:
         return self.get_speed()
@@ -297,20 +291,24 @@ class LinkerHandL10RS485:
     def get_little_matrix_touch(self,sleep_time=0):
         return self._pressure(5)
 
-    def get_matrix_touch(self) -> List[List[int]]:
-        return self.get_thumb_matrix_touch(),self.get_index_matrix_touch(), self.get_middle_matrix_touch(), self.get_ring_matrix_touch(), self.get_little_matrix_touch()
+    def read_matrix_touch(self, out: np.ndarray = None) -> np.ndarray:
+        """整手压感 (5, 12, 6) uint8，直接写入 out 或内部预分配缓冲区 (不拷贝，下次读取会覆盖)"""
+        return self._touch.read_all(out)
+
+    def get_matrix_touch(self) -> np.ndarray:
+        return self.read_matrix_touch().copy()
 
     def get_matrix_touch_v2(self) -> List[List[int]]:
         return self.get_matrix_touch()
 
     def get_torque(self) -> List[int]:
-        return self.read_torques()
+        return self._status_group("torques")
 
     def get_temperature(self) -> List[int]:
-        return self.read_temperatures()
+        return self._status_group("temperatures")
 
     def get_fault(self) -> List[int]:
-        return self.read_error_codes()
+        return self._status_group("errors")
     
     def get_serial_number(self):
         return [0] * 6
@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
-import os
+import os, sys
 import time
 from pymodbus.client import ModbusSerialClient
 from typing import List, Dict
 import numpy as np
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from status_snapshot import StatusSnapshot
+from frame_gap import FrameGap, read_frame_bytes, write_frame_bytes, WRITE_SINGLE_FRAME_BYTES
+from matrix_touch import MatrixTouchReader
+from register_shadow import HoldingRegisterShadow
 
 _INTERVAL = 0.006  # 8 ms
 
@@ -16,16 +21,37 @@ class LinkerHandL6RS485:
     
     # 手指名称
     FINGER_NAMES = ["thumb", "index", "middle", "ring", "little"]
+
+    FRAME_GAP = _INTERVAL  # 固定帧间隔
+    STATUS_MAX_AGE = 0.02  # 状态快照有效期
+    # 输入寄存器 0-29 连续排列，read_all_status() 一次读出后按此切分
+    STATUS_LAYOUT = {
+        "angles":       (0, 6),
+        "torques":      (6, 6),
+        "speeds":       (12, 6),
+        "temperatures": (18, 6),
+        "errors":       (24, 6),
+    }
+    STATUS_REG_COUNT = 30
     
-    def __init__(self, hand_id=0x27, modbus_port="/dev/ttyUSB0", baudrate=115200):
+    def __init__(self, hand_id=0x27, modbus_port="/dev/ttyUSB0", baudrate=115200, adaptive_gap=False, client=None):
         """
         初始化L6机械手
         hand_id: 右手0x27(39), 左手0x28(40)
         modbus_port: 串口设备路径
         baudrate: 波特率，固定115200
+        adaptive_gap: True 时按波特率和实测错误率自适应帧间隔，否则固定 _INTERVAL
+        client: 外部 Modbus 客户端 (如 asyncio 后端的同步门面)，由其负责帧间隔；为空时自行打开串口
         """
         self.slave = hand_id
-        self.cli = ModbusSerialClient(
+        self._gap = FrameGap(baudrate=baudrate, fixed_gap=self.FRAME_GAP if client is None else 0.0,
+                             adaptive=adaptive_gap and client is None)
+        self._status = StatusSnapshot(self.STATUS_MAX_AGE)
+        self._status_poll = None
+        self._shadow = HoldingRegisterShadow()  # 保持寄存器影子，只写变化的值
+        # 压感: 选指寄存器 60，数据寄存器 62 起
+        self._touch = MatrixTouchReader(60, 62, self._write_register, self._read_input_registers)
+        self.cli = client or ModbusSerialClient(
             port=modbus_port, 
             baudrate=baudrate,
             bytesize=8, 
@@ -40,122 +66,107 @@ class LinkerHandL6RS485:
 
     def _read_input_registers(self, address: int, count: int) -> List[int]:
         """读取输入寄存器"""
-        time.sleep(_INTERVAL)
-        result = self.cli.read_input_registers(address=address, count=count, slave=self.slave)
+        result = self._gap.run(
+            lambda: self.cli.read_input_registers(address=address, count=count, slave=self.slave),
+            *read_frame_bytes(count))
         if result.isError():
             raise RuntimeError(f"读取输入寄存器失败: address={address}, count={count}")
         return result.registers
 
     def _write_register(self, address: int, value: int):
         """写入单个寄存器"""
-        time.sleep(_INTERVAL)
-        result = self.cli.write_register(address=address, value=value, slave=self.slave)
+        result = self._gap.run(
+            lambda: self.cli.write_register(address=address, value=value, slave=self.slave),
+            *WRITE_SINGLE_FRAME_BYTES)
         if result.isError():
             raise RuntimeError(f"写入寄存器失败: address={address}, value={value}")
 
     def _write_registers(self, address: int, values: List[int]):
         """写入多个寄存器"""
-        time.sleep(_INTERVAL)
-        result = self.cli.write_registers(address=address, values=values, slave=self.slave)
+        result = self._gap.run(
+            lambda: self.cli.write_registers(address=address, values=values, slave=self.slave),
+            *write_frame_bytes(len(values)))
         if result.isError():
             raise RuntimeError(f"写入多个寄存器失败: address={address}, values={values}")
 
+    def _write_changed(self, address: int, values: List[int]):
+        """只写入与上次写入值不同的寄存器段，完全相同则跳过"""
+        self._shadow.write(address, values, self._write_registers, self._write_register)
+
+    def get_bus_stats(self) -> Dict[str, float]:
+        """当前有效帧间隔、设备响应时间、错误率等统计"""
+        if hasattr(self.cli, "get_bus_stats"):
+            return self.cli.get_bus_stats()
+        return self._gap.stats()
+
+    def start_status_poll(self, interval: float = 0.01):
+        """
+        后台周期读取整块状态寄存器刷新快照 (需要 client 支持 start_poll，如 asyncio 后端)
+        返回 Future，cancel() 即停止
+        """
+        self._status.max_age = max(self._status.max_age, interval + 0.05)
+        self.stop_status_poll()
+        self._status_poll = self.cli.start_poll(self.slave, 0, self.STATUS_REG_COUNT,
+                                                lambda regs: self._status.decode(regs, self.STATUS_LAYOUT), interval)
+        return self._status_poll
+
+    def stop_status_poll(self):
+        """停止 start_status_poll 启动的后台轮询 (close() 时自动调用)"""
+        poll, self._status_poll = getattr(self, "_status_poll", None), None
+        if poll is not None:
+            poll.cancel()
+
     # --------------------------------------------------
     # 基础读取接口
     # --------------------------------------------------
     
+    def read_all_status(self) -> Dict[str, List[int]]:
+        """一次功能码 04 事务读取整块状态寄存器，解码后写入状态快照"""
+        regs = self._read_input_registers(0, self.STATUS_REG_COUNT)
+        return self._status.decode(regs, self.STATUS_LAYOUT)
+
+    def _read_group(self, key: str) -> List[int]:
+        """单独读取一个分组，并刷新快照中的该分组"""
+        start, count = self.STATUS_LAYOUT[key]
+        values = self._read_input_registers(start, count)
+        self._status.update(**{key: values})
+        return values
+
+    def _status_group(self, key: str) -> List[int]:
+        """快照有效时直接返回，否则只读该分组"""
+        cached = self._status.get(key)
+        return cached if cached is not None else self._read_group(key)
+
     def read_angles(self) -> List[int]:
         """读取6个关节角度 (输入寄存器 0-5)"""
-        return self._read_input_registers(0, 6)
+        return self._read_group("angles")
 
     def read_torques(self) -> List[int]:
         """读取6个关节转矩 (输入寄存器 6-11)"""
-        return self._read_input_registers(6, 6)
+        return self._read_group("torques")
 
     def read_speeds(self) -> List[int]:
         """读取6个关节速度 (输入寄存器 12-17)"""
-        return self._read_input_registers(12, 6)
+        return self._read_group("speeds")
 
     def read_temperatures(self) -> List[int]:
         """读取6个关节温度 (输入寄存器 18-23)"""
-        return self._read_input_registers(18, 6)
+        return self._read_group("temperatures")
 
     def read_error_codes(self) -> List[int]:
         """读取6个关节错误码 (输入寄存器 24-29)"""
-        return self._read_input_registers(24, 6)
+        return self._read_group("errors")
 
     # --------------------------------------------------
     # 压力传感器接口
     # --------------------------------------------------
     
-    # def _pressure(self, finger: int) -> List[int]:
-    #     """内部：选手指 → 读压力数据"""
-    #     # 选择手指 (保持寄存器 36)
-    #     self._write_register(36, finger)
-    #     time.sleep(_INTERVAL)
-    #     # 读取压力数据 (输入寄存器 52-122)
-    #     return np.array(self._read_input_registers(52, 71))
     def _pressure(self, finger: int) -> np.ndarray:
         """
         6x12 (72点) 矩阵尺寸。
         Modbus 地址 60/62。
         """
-        rows = 12  # 12 行
-        cols = 6   # 6 列
-        finger_size = rows * cols  # 72 个数据点
-        
-        # modbus 地址和计数
-        write_address = 60  # 写入手指选择
-        read_address = 62   # 读取压力数据
-        read_count = 96     # 读取 96 个寄存器
-        skip_count = 10     # 跳过前 10 个校验点
-        
-        # 0. 参数校验和手指写入值确定
-        if finger < 1 or finger > 5:
-            raise ValueError(f"无效的手指编号: {finger}。手指编号应在 1 到 5 之间。")
-            
-        finger_write_value = finger 
-        
-        # 1. 写入手指选择寄存器 (地址 60)
-        time.sleep(0.008)
-        wrsp = self.cli.write_register(address=write_address, value=finger_write_value, slave=self.slave)
-        if wrsp.isError():
-            raise RuntimeError(f"写入手指选择 {finger} 到地址 {write_address} 失败: {wrsp}")
-
-        # 写入后等待片刻
-        time.sleep(0.008) 
-        
-        # 2. 读取地址 62 的数据
-        rrsp = self.cli.read_input_registers(address=read_address, count=read_count, slave=self.slave)
-        
-        if rrsp.isError():
-            raise RuntimeError(f"读取地址 {read_address} 压力数据失败: {rrsp}")
-            
-        registers_16bit: List[int] = rrsp.registers 
-        
-        # 3. 核心数据处理
-        # a. 提取低 8 位数据 (得到 96 个 8 位数据点)
-        final_data_96 = [reg_value & 255 for reg_value in registers_16bit]
-        
-        # b. 跳过前 10 个校验/头部数据点 (得到 86 个有效数据点)
-        effective_data = np.array(final_data_96[skip_count:], dtype=np.uint8)
-        # c. 截取当前手指的矩阵数据 (从 86 个有效点中截取 72 个点)
-        start_idx = 0 
-        end_idx = finger_size  # 72
-        
-        finger_data_flat = effective_data[start_idx:end_idx]
-        
-        # d. 验证数据长度
-        if finger_data_flat.size != finger_size:
-            raise ValueError(
-                f"数据提取失败。期望 {finger_size} 点 ({rows}x{cols})，"
-                f"但仅截取到 {finger_data_flat.size} 点。请检查协议，确认地址 62 是否一次性返回了所有手指数据。"
-            )
-            
-        # e. 重塑为二维矩阵 (12 行 6 列)
-        finger_matrix = finger_data_flat.reshape((rows, cols))
-                
-        return finger_matrix
+        return self._touch.read_finger(finger).copy()
 
     def read_pressure_thumb(self) -> np.ndarray:
         """读取大拇指压力数据"""
@@ -205,21 +216,21 @@ class LinkerHandL6RS485:
         vals = [int(x) for x in vals]
         if not self.is_valid_6xuint8(vals):
             raise ValueError("需要6个0-255的整数")
-        self._write_registers(0, vals)
+        self._write_changed(0, vals)
 
     def write_torques(self, vals: List[int]):
         """设置6个关节转矩 (保持寄存器 6-11)"""
         vals = [int(x) for x in vals]
         if not self.is_valid_6xuint8(vals):
             raise ValueError("需要6个0-255的整数")
-        self._write_registers(6, vals)
+        self._write_changed(6, vals)
 
     def write_speeds(self, vals: List[int]):
         """设置6个关节速度 (保持寄存器 12-17)"""
         vals = [int(x) for x in vals]
         if not self.is_valid_6xuint8(vals):
             raise ValueError("需要6个0-255的整数")
-        self._write_registers(12, vals)
+        self._write_changed(12, vals)
 
     # --------------------------------------------------
     # 上下文管理
@@ -227,9 +238,11 @@ class LinkerHandL6RS485:
     
     def close(self):
         """关闭连接"""
+        self.stop_status_poll()
         if self.connected:
             self.cli.close()
             self.connected = False
+            self._shadow.invalidate()
     
     def __enter__(self):
         return self
@@ -285,7 +298,7 @@ class LinkerHandL6RS485:
 
     def get_state(self) -> list:
         """获取关节状态"""
-        return self.read_angles()
+        return self._status_group("angles")
     
     def get_state_for_pub(self) -> list:
         return self.get_state()
@@ -295,7 +308,7 @@ class LinkerHandL6RS485:
     
     def get_speed(self) -> list:
         """获取当前速度"""
-        return self.read_speeds()
+        return self._status_group("speeds")
     
     def get_joint_speed(self) -> list:
         return self.get_speed()
@@ -334,10 +347,13 @@ class LinkerHandL6RS485:
     def get_little_matrix_touch(self,sleep_time=0):
         return self._pressure(5)
         
-    def get_matrix_touch(self) -> list:
-        """获取压感数据：矩阵式"""
-        return [self._pressure(1), self._pressure(2), self._pressure(3), 
-                self._pressure(4), self._pressure(5)]
+    def read_matrix_touch(self, out: np.ndarray = None) -> np.ndarray:
+        """整手压感 (5, 12, 6) uint8，直接写入 out 或内部预分配缓冲区 (不拷贝，下次读取会覆盖)"""
+        return self._touch.read_all(out)
+
+    def get_matrix_touch(self) -> np.ndarray:
+        """获取压感数据：矩阵式 (5, 12, 6)"""
+        return self.read_matrix_touch().copy()
     
     def get_matrix_touch_v2(self) -> list:
         """获取压感数据：矩阵式"""
@@ -345,15 +361,15 @@ class LinkerHandL6RS485:
     
     def get_torque(self) -> list:
         """获取当前扭矩"""
-        return self.read_torques()
+        return self._status_group("torques")
     
     def get_temperature(self) -> list:
         """获取当前电机温度"""
-        return self.read_temperatures()
+        return self._status_group("temperatures")
     
     def get_fault(self) -> list:
         """获取当前电机故障码"""
-        return self.read_error_codes()
+        return self._status_group("errors")
     
     def get_serial_number(self):
         return [0] * 6
@@ -377,12 +393,13 @@ class LinkerHandL6RS485:
         print("=" * 50)
         
         try:
-            # 关节状态
-            angles = self.read_angles()
-            torques = self.read_torques()
-            speeds = self.read_speeds()
-            temps = self.read_temperatures()
-            errors = self.read_error_codes()
+            # 关节状态 (一次事务读出全部状态)
+            status = self.read_all_status()
+            angles = status["angles"]
+            torques = status["torques"]
+            speeds = status["speeds"]
+            temps = status["temperatures"]
+            errors = status["errors"]
             
             print("关节状态:")
             for i, name in enumerate(self.JOINT_NAMES):
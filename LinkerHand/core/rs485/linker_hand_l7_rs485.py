@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
+import os, sys
 import time
 from typing import List, Dict, Union
 import numpy as np
 from pymodbus.client import ModbusSerialClient
 from pymodbus.exceptions import ModbusException
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from status_snapshot import StatusSnapshot
+from frame_gap import FrameGap, read_frame_bytes, write_frame_bytes, WRITE_SINGLE_FRAME_BYTES
+from matrix_touch import MatrixTouchReader
+from register_shadow import HoldingRegisterShadow
 
 # --- 协议常量和寄存器地址定义 (根据 O7 协议文件) ---
 
@@ -50,17 +56,34 @@ _PRESSURE_HEADER_SKIP = 10 # 假设跳过 10 个头部/校验字节
 # 通信间隔时间 (使用 L10 参考中的 5ms)
 _INTERVAL = 0.005 
 
+# 输入寄存器 0-34 连续排列，read_all_status() 一次读出后按此切分
+_STATUS_LAYOUT = {
+    "angles":       (IR_ADDR["Current_Position_Start"], _JOINT_COUNT),
+    "torques":      (IR_ADDR["Current_Torque_Start"], _JOINT_COUNT),
+    "speeds":       (IR_ADDR["Current_Speed_Start"], _JOINT_COUNT),
+    "temperatures": (IR_ADDR["Current_Temperature_Start"], _JOINT_COUNT),
+    "errors":       (IR_ADDR["Error_Code_Start"], _JOINT_COUNT),
+}
+_STATUS_REG_COUNT = IR_ADDR["Error_Code_Start"] + _JOINT_COUNT
+_STATUS_MAX_AGE = 0.02  # 状态快照有效期
+
 
 class LinkerHandL7RS485:
     """
     O7机械手 Modbus RTU (RS485) 控制类。
     使用 pymodbus 3.5.1 版本和 O7 机械手协议。
     """
+    FRAME_GAP = _INTERVAL  # 固定帧间隔
+    STATUS_LAYOUT = _STATUS_LAYOUT
+    STATUS_REG_COUNT = _STATUS_REG_COUNT
+
     def __init__(self, 
                  hand_id: int = 0x27, 
                  modbus_port: str = "/dev/ttyUSB0", 
                  baudrate: int = DEFAULT_BAUDRATE,
-                 timeout: float = 0.05):
+                 timeout: float = 0.05,
+                 adaptive_gap: bool = False,
+                 client=None):
         """
         初始化 Modbus 客户端。
 
@@ -68,9 +91,21 @@ class LinkerHandL7RS485:
         :param modbus_port: 串口名称
         :param baudrate: 波特率 (默认为 115200)
         :param timeout: 通信超时时间 (秒)
+        :param adaptive_gap: True 时按波特率和实测错误率自适应帧间隔，否则固定 _INTERVAL
+        :param client: 外部 Modbus 客户端 (如 asyncio 后端的同步门面)，由其负责帧间隔；为空时自行打开串口
         """
         self.slave = hand_id
-        self.cli = ModbusSerialClient(
+        self._gap = FrameGap(baudrate=baudrate, fixed_gap=self.FRAME_GAP if client is None else 0.0,
+                             adaptive=adaptive_gap and client is None)
+        self._status = StatusSnapshot(_STATUS_MAX_AGE)
+        self._status_poll = None
+        self._shadow = HoldingRegisterShadow()  # 保持寄存器影子，只写变化的值
+        self._touch = MatrixTouchReader(
+            HR_ADDR["Pressure_Select"], IR_ADDR["Pressure_Data_Start"],
+            lambda address, value: self._write_holding_registers(address, [value]),
+            self._read_input_registers,
+            header_skip=_PRESSURE_HEADER_SKIP, settle=_INTERVAL)
+        self.cli = client or ModbusSerialClient(
             port=modbus_port,
             baudrate=baudrate,
             bytesize=8,
@@ -97,12 +132,10 @@ class LinkerHandL7RS485:
 
     def _read_input_registers(self, address: int, count: int) -> List[int]:
         """封装 Modbus 读取输入寄存器 (FC 04) 操作。"""
-        time.sleep(_INTERVAL)
         try:
-            rsp = self.cli.read_input_registers(
-                address=address, 
-                count=count, 
-                slave=self.slave
+            rsp = self._gap.run(
+                lambda: self.cli.read_input_registers(address=address, count=count, slave=self.slave),
+                *read_frame_bytes(count)
             )
             
             # 使用 L10 参考中验证过的 3.x 兼容错误检查
@@ -119,22 +152,21 @@ class LinkerHandL7RS485:
 
     def _write_holding_registers(self, address: int, values: List[int]):
         """封装 Modbus 写入保持寄存器 (FC 16) 操作。"""
-        time.sleep(_INTERVAL)
-        
         # 批量写入 (FC 16)
         if len(values) > 1:
             write_func = self.cli.write_registers
+            frame_bytes = write_frame_bytes(len(values))
         # 单个写入 (FC 06)
         elif len(values) == 1:
             write_func = lambda address, values, slave: self.cli.write_register(address, values[0], slave)
+            frame_bytes = WRITE_SINGLE_FRAME_BYTES
         else:
              raise ValueError("写入值列表不能为空。")
 
         try:
-            rsp = write_func(
-                address=address, 
-                values=values, 
-                slave=self.slave
+            rsp = self._gap.run(
+                lambda: write_func(address=address, values=values, slave=self.slave),
+                *frame_bytes
             )
             
             if rsp.isError():
@@ -145,39 +177,69 @@ class LinkerHandL7RS485:
         except Exception as e:
             raise RuntimeError(f"未知写入异常。地址: {address}, 错误: {e}")
 
+    def get_bus_stats(self) -> Dict[str, float]:
+        """当前有效帧间隔、设备响应时间、错误率等统计"""
+        if hasattr(self.cli, "get_bus_stats"):
+            return self.cli.get_bus_stats()
+        return self._gap.stats()
+
+    def start_status_poll(self, interval: float = 0.01):
+        """
+        后台周期读取整块状态寄存器刷新快照 (需要 client 支持 start_poll，如 asyncio 后端)
+        返回 Future，cancel() 即停止
+        """
+        self._status.max_age = max(self._status.max_age, interval + 0.05)
+        self.stop_status_poll()
+        self._status_poll = self.cli.start_poll(self.slave, 0, self.STATUS_REG_COUNT,
+                                                lambda regs: self._status.decode(regs, self.STATUS_LAYOUT), interval)
+        return self._status_poll
+
+    def stop_status_poll(self):
+        """停止 start_status_poll 启动的后台轮询 (close() 时自动调用)"""
+        poll, self._status_poll = getattr(self, "_status_poll", None), None
+        if poll is not None:
+            poll.cancel()
+
     # --------------------------------------------------
     # 读操作 (Read API)
     # --------------------------------------------------
     
+    def read_all_status(self) -> Dict[str, List[int]]:
+        """一次功能码 04 事务读取输入寄存器 0-34，解码后写入状态快照"""
+        regs = self._read_input_registers(IR_ADDR["Current_Position_Start"], _STATUS_REG_COUNT)
+        return self._status.decode(regs, self.STATUS_LAYOUT)
+
+    def _read_group(self, key: str) -> List[int]:
+        """单独读取一个分组，并刷新快照中的该分组"""
+        start, count = self.STATUS_LAYOUT[key]
+        values = self._read_input_registers(start, count)
+        self._status.update(**{key: values})
+        return values
+
+    def _status_group(self, key: str) -> List[int]:
+        """快照有效时直接返回，否则只读该分组"""
+        cached = self._status.get(key)
+        return cached if cached is not None else self._read_group(key)
+
     def get_joint_positions(self) -> Dict[str, int]:
-        """读取当前关节位置 (地址 0-6)。"""
-        registers = self._read_input_registers(IR_ADDR["Current_Position_Start"], _JOINT_COUNT)
-        #return dict(zip(O7_JOINT_KEYS, registers))
-        return registers
+        """读取当前关节位置 (地址 0-6)。快照有效时直接返回快照。"""
+        return self._status_group("angles")
 
     def get_current_torques(self) -> Dict[str, int]:
         """读取当前关节转矩 (地址 7-13)。"""
-        registers = self._read_input_registers(IR_ADDR["Current_Torque_Start"], _JOINT_COUNT)
-        #return dict(zip(O7_JOINT_KEYS, registers))
-        return registers
+        return self._status_group("torques")
 
     def get_current_speeds(self) -> Dict[str, int]:
         """读取当前关节速度 (地址 14-20)。"""
-        registers = self._read_input_registers(IR_ADDR["Current_Speed_Start"], _JOINT_COUNT)
-        #return dict(zip(O7_JOINT_KEYS, registers))
-        return registers
+        return self._status_group("speeds")
 
     def get_temperatures(self) -> Dict[str, int]:
         """读取当前关节温度 (地址 21-27)。"""
-        registers = self._read_input_registers(IR_ADDR["Current_Temperature_Start"], _JOINT_COUNT)
-        #return dict(zip(O7_JOINT_KEYS, registers))
-        return registers
+        return self._status_group("temperatures")
 
     def get_error_codes(self) -> Dict[str, int]:
         """读取当前关节错误码 (地址 28-34)。"""
-        registers = self._read_input_registers(IR_ADDR["Error_Code_Start"], _JOINT_COUNT)
-        #return dict(zip(O7_JOINT_KEYS, registers))
-        return registers
+        return self._status_group("errors")
 
     def get_tip_forces(self) -> List[int]:
         """读取指尖法向力、切向力等数据 (地址 35-54)。"""
@@ -194,40 +256,8 @@ class LinkerHandL7RS485:
         :param finger_id: 手指编号 (1: 大拇指, 2: 食指, 3: 中指, 4: 无名指, 5: 小拇指)
         :return: 12x6 的压力数据矩阵 (np.ndarray)
         """
-        if not (1 <= finger_id <= 5):
-            raise ValueError(f"无效的手指编号: {finger_id}。应在 1 到 5 之间。")
-            
-        # 1. 写入手指选择寄存器 (HR 42)
-        # 使用单个写入 (FC 06)
-        self._write_holding_registers(HR_ADDR["Pressure_Select"], [finger_id])
-
-        # 2. 读取压力传感器数据 (IR 57, 96 个寄存器)
-        time.sleep(_INTERVAL) # 等待数据更新
-        registers_16bit: List[int] = self._read_input_registers(
-            IR_ADDR["Pressure_Data_Start"], 
-            _PRESSURE_REG_COUNT
-        )
-        
-        # 3. 数据解析 (假设与 L10 类似的数据格式: 低 8 位有效，有头部数据)
-        
-        # a. 提取低 8 位数据 (得到 96 个 8 位数据点)
-        final_data_96 = [reg_value & 255 for reg_value in registers_16bit]
-        
-        # b. 跳过头部数据点
-        effective_data = np.array(final_data_96[_PRESSURE_HEADER_SKIP:], dtype=np.uint8)
-        
-        # c. 截取当前手指的矩阵数据 (72 个点)
-        finger_data_flat = effective_data[:_PRESSURE_DATA_SIZE]
-        
-        if finger_data_flat.size != _PRESSURE_DATA_SIZE:
-             raise ValueError(
-                f"压力数据提取失败。期望 {_PRESSURE_DATA_SIZE} 点，"
-                f"但仅截取到 {finger_data_flat.size} 点。请检查协议解析逻辑。"
-            )
-            
-        # d. 重塑为二维矩阵 (12 行 6 列)
-        finger_matrix = finger_data_flat.reshape((_PRESSURE_ROWS, _PRESSURE_COLS))
-        return finger_matrix
+        # 选指 (HR 42) → 等待数据更新 → 读取 IR 57 起 头部 + 72 个寄存器
+        return self._touch.read_finger(finger_id).copy()
 
 
     # --------------------------------------------------
@@ -241,7 +271,7 @@ class LinkerHandL7RS485:
         """
         if len(joint_angles) != _JOINT_COUNT:
             raise ValueError(f"需要 {_JOINT_COUNT} 个关节位置值，提供了 {len(joint_angles)} 个。")
-        self._write_holding_registers(HR_ADDR["Position_Start"], joint_angles)
+        self._shadow.write(HR_ADDR["Position_Start"], joint_angles, self._write_holding_registers)
 
     def set_torques(self, torques: List[int]):
         """
@@ -250,7 +280,7 @@ class LinkerHandL7RS485:
         """
         if len(torques) != _JOINT_COUNT:
             raise ValueError(f"需要 {_JOINT_COUNT} 个关节转矩值，提供了 {len(torques)} 个。")
-        self._write_holding_registers(HR_ADDR["Torque_Start"], torques)
+        self._shadow.write(HR_ADDR["Torque_Start"], torques, self._write_holding_registers)
 
 
     def set_speeds(self, speeds: List[int]):
@@ -260,7 +290,7 @@ class LinkerHandL7RS485:
         """
         if len(speeds) != _JOINT_COUNT:
             raise ValueError(f"需要 {_JOINT_COUNT} 个关节速度值，提供了 {len(speeds)} 个。")
-        self._write_holding_registers(HR_ADDR["Speed_Start"], speeds)
+        self._shadow.write(HR_ADDR["Speed_Start"], speeds, self._write_holding_registers)
     
     def set_speed(self, speed:List[int] = [200] * 7):
         self.set_speeds(speed)
@@ -321,8 +351,12 @@ class LinkerHandL7RS485:
     def get_little_matrix_touch(self,sleep_time=0):
         return self.get_pressure_matrix(finger_id=5)
 
-    def get_matrix_touch(self) -> List[List[int]]:
-        return self.get_thumb_matrix_touch(),self.get_index_matrix_touch(), self.get_middle_matrix_touch(), self.get_ring_matrix_touch(), self.get_little_matrix_touch()
+    def read_matrix_touch(self, out: np.ndarray = None) -> np.ndarray:
+        """整手压感 (5, 12, 6) uint8，直接写入 out 或内部预分配缓冲区 (不拷贝，下次读取会覆盖)"""
+        return self._touch.read_all(out)
+
+    def get_matrix_touch(self) -> np.ndarray:
+        return self.read_matrix_touch().copy()
 
     def get_matrix_touch_v2(self) -> List[List[int]]:
         return self.get_matrix_touch()
@@ -350,9 +384,11 @@ class LinkerHandL7RS485:
 
     def close(self):
         """断开 Modbus 连接。"""
+        self.stop_status_poll()
         if self.connected:
             self.cli.close()
             self.connected = False
+            self._shadow.invalidate()
             print("Modbus 连接已断开。")
 
     def __enter__(self):
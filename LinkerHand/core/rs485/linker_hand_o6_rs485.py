@@ -3,7 +3,7 @@
 O6 机械手 Modbus-RTU 控制类 (基于 pymodbus 3.5.1)
 """
 
-import os
+import os, sys
 import time
 from typing import List, Dict, Any # 引入 Any 来表示灵活的输入类型
 import numpy as np
@@ -13,6 +13,10 @@ from threading import Lock # 用于线程安全和总线仲裁
 # 导入 pymodbus 客户端
 from pymodbus.client import ModbusSerialClient
 from struct import error as StructError 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from status_snapshot import StatusSnapshot
+from frame_gap import FrameGap, read_frame_bytes, write_frame_bytes
+from register_shadow import HoldingRegisterShadow
 
 logging.basicConfig(
     level=logging.INFO,
@@ -89,18 +93,38 @@ class LinkerHandO6RS485:
 
     TTL_TIMEOUT = 0.15     # 串口超时
     FRAME_GAP = 0.030      # 30 ms
+    STATUS_MAX_AGE = 0.02  # 状态快照有效期
+
+    # 输入寄存器 0-35 连续排列，read_all_status() 一次读出后按此切分
+    STATUS_LAYOUT = {
+        "angles":       (REG_RD_CURRENT_THUMB_PITCH, 6),
+        "torques":      (REG_RD_CURRENT_THUMB_TORQUE, 6),
+        "speeds":       (REG_RD_CURRENT_THUMB_SPEED, 6),
+        "temperatures": (REG_RD_THUMB_TEMP, 6),
+        "errors":       (REG_RD_THUMB_ERROR, 6),
+        "versions":     (REG_RD_HAND_FREEDOM, 6),
+    }
+    STATUS_REG_COUNT = REG_RD_HARDWARE_VERSION + 1
     
     # KEYS for easy indexing
     JOINT_KEYS = ["thumb_pitch", "thumb_yaw", "index_pitch", 
                   "middle_pitch", "ring_pitch", "little_pitch"]
 
-    def __init__(self, hand_id=0x27, modbus_port="/dev/ttyUSB0", baudrate=115200):
+    def __init__(self, hand_id=0x27, modbus_port="/dev/ttyUSB0", baudrate=115200, adaptive_gap=False, client=None):
+        """
+        adaptive_gap: True 时按波特率和实测错误率自适应帧间隔，否则固定 FRAME_GAP
+        client: 外部 Modbus 客户端 (如 asyncio 后端的同步门面)，由其负责帧间隔；为空时自行打开串口
+        """
         self._id = hand_id
-        self._last_ts = 0.0  # 上一次帧结束时间
+        self._gap = FrameGap(baudrate=baudrate, fixed_gap=self.FRAME_GAP if client is None else 0.0,
+                             adaptive=adaptive_gap and client is None)
         self._lock = Lock()  # 总线访问锁
+        self._status = StatusSnapshot(self.STATUS_MAX_AGE)
+        self._status_poll = None
+        self._shadow = HoldingRegisterShadow()  # 保持寄存器影子，只写变化的值
 
         # 使用 pymodbus 3.x 客户端
-        self.cli = ModbusSerialClient(
+        self.cli = client or ModbusSerialClient(
             port=modbus_port,
             baudrate=baudrate,
             bytesize=8,
@@ -123,24 +147,36 @@ class LinkerHandO6RS485:
     # ----------------------------------------------------------
     # 辅助方法
     # ----------------------------------------------------------
-    def _bus_free(self):
-        """保证距离上一帧 ≥ 30 ms"""
-        with self._lock:
-            elapse = time.perf_counter() - self._last_ts
-            if elapse < self.FRAME_GAP:
-                time.sleep(self.FRAME_GAP - elapse)
+    def get_bus_stats(self) -> Dict[str, float]:
+        """当前有效帧间隔、设备响应时间、错误率等统计"""
+        if hasattr(self.cli, "get_bus_stats"):
+            return self.cli.get_bus_stats()
+        return self._gap.stats()
+
+    def start_status_poll(self, interval: float = 0.01):
+        """
+        后台周期读取整块状态寄存器刷新快照 (需要 client 支持 start_poll，如 asyncio 后端)
+        返回 Future，cancel() 即停止
+        """
+        self._status.max_age = max(self._status.max_age, interval + 0.05)
+        self.stop_status_poll()
+        self._status_poll = self.cli.start_poll(self._id, 0, self.STATUS_REG_COUNT,
+                                                lambda regs: self._status.decode(regs, self.STATUS_LAYOUT), interval)
+        return self._status_poll
+
+    def stop_status_poll(self):
+        """停止 start_status_poll 启动的后台轮询 (close() 时自动调用)"""
+        poll, self._status_poll = getattr(self, "_status_poll", None), None
+        if poll is not None:
+            poll.cancel()
 
     def _execute_read(self, address: int, count: int) -> List[int]:
         """执行 Modbus 读取操作 (功能码 04), 带总线仲裁。"""
-        self._bus_free()
-        
-        rsp = self.cli.read_input_registers(
-            address=address, 
-            count=count, 
-            slave=self._id
-        )
-        
-        self._last_ts = time.perf_counter()
+        with self._lock:
+            rsp = self._gap.run(
+                lambda: self.cli.read_input_registers(address=address, count=count, slave=self._id),
+                *read_frame_bytes(count)
+            )
         
         if rsp.isError():
             raise RuntimeError(f"Modbus Read Failed (Addr={address}, Count={count}): {rsp}")
@@ -150,16 +186,12 @@ class LinkerHandO6RS485:
 
     def _execute_write(self, address: int, values: List[int]):
         """执行 Modbus 批量写入操作 (功能码 16), 带总线仲裁。"""
-        self._bus_free()
-        
         # values 必须是 Python 原生整数列表
-        rsp = self.cli.write_registers(
-            address=address, 
-            values=values, 
-            slave=self._id
-        )
-        
-        self._last_ts = time.perf_counter()
+        with self._lock:
+            rsp = self._gap.run(
+                lambda: self.cli.write_registers(address=address, values=values, slave=self._id),
+                *write_frame_bytes(len(values))
+            )
         
         if rsp.isError():
             raise RuntimeError(f"Modbus Write Failed (Addr={address}, Values={values}): {rsp}")
@@ -167,30 +199,53 @@ class LinkerHandO6RS485:
     # ----------------------------------------------------------
     # 批量读取和数据封装（优化通信效率）
     # ----------------------------------------------------------
+    def read_all_status(self) -> Dict[str, List[int]]:
+        """一次功能码 04 事务读取输入寄存器 0-35，解码后写入状态快照"""
+        regs = self._execute_read(REG_RD_CURRENT_THUMB_PITCH, self.STATUS_REG_COUNT)
+        return self._status.decode(regs, self.STATUS_LAYOUT)
+
+    def _read_group(self, key: str) -> List[int]:
+        """单独读取一个分组，并刷新快照中的该分组"""
+        start, count = self.STATUS_LAYOUT[key]
+        values = self._execute_read(start, count)
+        self._status.update(**{key: values})
+        return values
+
+    def _status_group(self, key: str) -> List[int]:
+        """快照有效时直接返回，否则只读该分组"""
+        cached = self._status.get(key)
+        return cached if cached is not None else self._read_group(key)
+
     def read_all_angles(self) -> List[int]:
-        return self._execute_read(REG_RD_CURRENT_THUMB_PITCH, 6)
+        return self._read_group("angles")
     
     def read_all_torques(self) -> List[int]:
-        return self._execute_read(REG_RD_CURRENT_THUMB_TORQUE, 6)
+        return self._read_group("torques")
 
     def read_all_speeds(self) -> List[int]:
-        return self._execute_read(REG_RD_CURRENT_THUMB_SPEED, 6)
+        return self._read_group("speeds")
     
     def read_all_temperatures(self) -> List[int]:
-        return self._execute_read(REG_RD_THUMB_TEMP, 6)
+        return self._read_group("temperatures")
     
     def read_all_errors(self) -> List[int]:
-        return self._execute_read(REG_RD_THUMB_ERROR, 6)
+        return self._read_group("errors")
 
     def read_all_versions(self) -> List[int]:
-        return self._execute_read(REG_RD_HAND_FREEDOM, 6)
+        return self._read_group("versions")
 
 
     # ----------------------------------------------------------
     # 只读属性（单个寄存器读取）
     # ----------------------------------------------------------
     def _read_reg(self, addr: int) -> int:
-        """读单个输入寄存器（功能码 04），带 30 ms 帧间隔"""
+        """读单个输入寄存器（功能码 04），带 30 ms 帧间隔；快照有效时直接取快照"""
+        for key, (start, count) in self.STATUS_LAYOUT.items():
+            if start <= addr < start + count:
+                cached = self._status.get(key)
+                if cached is not None:
+                    return cached[addr - start]
+                break
         return self._execute_read(addr, 1)[0]
     
     def get_thumb_pitch(self) -> int:       return self._read_reg(REG_RD_CURRENT_THUMB_PITCH)
@@ -236,31 +291,31 @@ class LinkerHandO6RS485:
     def get_hardware_version(self) -> int:  return self._read_reg(REG_RD_HARDWARE_VERSION)
     
     # ----------------------------------------------------------
-    # 批量 Getter (使用 read_all_... 方法)
+    # 批量 Getter (优先使用 read_all_status() 的快照)
     # ----------------------------------------------------------
     def get_state(self) -> List[int]:
         """获取手指电机状态 (角度)"""
-        return self.read_all_angles()
+        return self._status_group("angles")
 
     def get_torque(self) -> List[int]:
         """获取当前扭矩"""
-        return self.read_all_torques()
+        return self._status_group("torques")
 
     def get_speed(self) -> List[int]:
         """获取当前速度"""
-        return self.read_all_speeds()
+        return self._status_group("speeds")
 
     def get_temperature(self) -> List[int]:
         """获取当前电机温度"""
-        return self.read_all_temperatures()
+        return self._status_group("temperatures")
     
     def get_fault(self) -> List[int]:
         """获取当前电机故障码"""
-        return self.read_all_errors()
+        return self._status_group("errors")
     
     def get_version(self) -> list:
         """获取当前固件版本号"""
-        return self.read_all_versions()
+        return self._status_group("versions")
 
 
     # ----------------------------------------------------------
@@ -271,8 +326,8 @@ class LinkerHandO6RS485:
         if not 0 <= value <= 255:
             raise ValueError("value must be 0-255")
         
-        # 确保 value 是 Python 原生 int
-        self._execute_write(addr, [int(value)])
+        # 确保 value 是 Python 原生 int；与上次写入相同则跳过
+        self._shadow.write(addr, [int(value)], self._execute_write)
 
     def _write_regs(self, addr: int, values: List[int]):
         """写多个保持寄存器（功能码 16），带 30 ms 帧间隔"""
@@ -280,7 +335,8 @@ class LinkerHandO6RS485:
         if not all(0 <= v <= 255 for v in values):
             # 这行理论上不应触发，因为上层调用已校验
             raise ValueError("All values must be 0-255")
-        self._execute_write(addr, values)
+        # 只写入变化的寄存器段，完全相同则跳过
+        self._shadow.write(addr, values, self._execute_write)
 
 
     def set_thumb_pitch(self, v: int):           self._write_reg(REG_WR_THUMB_PITCH, v)
@@ -419,9 +475,11 @@ class LinkerHandO6RS485:
     # 上下文管理
     # ----------------------------------------------------------
     def close(self):
+        self.stop_status_poll()
         if hasattr(self, 'connected') and self.connected:
             self.cli.close()
             self.connected = False
+            self._shadow.invalidate()
             logging.info("Modbus connection closed.")
 
     def __enter__(self):
@@ -459,6 +517,7 @@ class LinkerHandO6RS485:
         """打印当前所有可读状态 (使用批量读取优化)"""
         print("--------- O6 Hand Status ---------")
         
+        self.read_all_status()
         angles = self.get_state()
         temps = self.get_temperature()
         errors = self.get_fault()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RS485 矩阵式压感整手采集
+
+固件协议: 先向选择寄存器写入手指编号 (1-5)，再从数据寄存器读出该手指的数据，
+每个寄存器只有低 8 位有效，前 header_skip 个为头部/校验，其后 72 个为 12x6 矩阵。
+手指数据共用同一段寄存器，因此每根手指至少需要 选指+读数 两次事务；
+这里只读取实际用到的 header_skip + 72 个寄存器，并用 NumPy 一次性完成
+低字节提取与 reshape，结果直接写入预分配的 (5, 12, 6) 缓冲区。
+"""
+import time
+from typing import Callable, List, Optional
+import numpy as np
+
+FINGER_COUNT = 5
+ROWS = 12
+COLS = 6
+FINGER_SIZE = ROWS * COLS  # 72
+TOUCH_SHAPE = (FINGER_COUNT, ROWS, COLS)
+
+
+def decode_low_bytes(registers: List[int], out: np.ndarray, skip: int = 0) -> np.ndarray:
+    """
+    提取寄存器低 8 位，跳过前 skip 个后按 out 的形状写入 out
+    等价于 [r & 255 for r in registers][skip:skip + out.size]
+    """
+    size = out.size
+    regs = np.asarray(registers, dtype="<u2")
+    if regs.size < skip + size:
+        raise ValueError(f"压力数据长度不足: 需要 {skip + size} 个寄存器，实际 {regs.size} 个")
+    # 小端 uint16 按字节展开后，偶数下标即为低 8 位
+    low = regs[skip:skip + size].view(np.uint8)[::2]
+    np.copyto(out.reshape(-1), low)
+    return out
+
+
+class MatrixTouchReader:
+    def __init__(self, select_address: int, data_address: int,
+                 write_register: Callable[[int, int], None],
+                 read_registers: Callable[[int, int], List[int]],
+                 header_skip: int = 10, settle: float = 0.008):
+        """
+        select_address: 手指选择 (保持寄存器); data_address: 压力数据起始 (输入寄存器)
+        write_register/read_registers: 驱动自身的单寄存器写、输入寄存器读函数
+        settle: 选指后等待传感器数据切换的时间
+        """
+        self.select_address = select_address
+        self.data_address = data_address
+        self.header_skip = header_skip
+        self.read_count = header_skip + FINGER_SIZE
+        self.settle = settle
+        self._write_register = write_register
+        self._read_registers = read_registers
+        self.buffer = np.zeros(TOUCH_SHAPE, dtype=np.uint8)
+        self.listener: Optional[Callable[[int, np.ndarray], None]] = None  # 每读完一根手指回调 listener(手指 0-4, 12x6)
+
+    def read_finger(self, finger: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """读取单根手指 (1-5)，返回 12x6 uint8 矩阵；out 为空时写入内部缓冲区对应行"""
+        if finger < 1 or finger > FINGER_COUNT:
+            raise ValueError(f"无效的手指编号: {finger}。手指编号应在 1 到 5 之间。")
+        if out is None:
+            out = self.buffer[finger - 1]
+        self._write_register(self.select_address, finger)
+        if self.settle:
+            time.sleep(self.settle)
+        registers = self._read_registers(self.data_address, self.read_count)
+        decode_low_bytes(registers, out, self.header_skip)
+        if self.listener is not None:
+            self.listener(finger - 1, out)
+        return out
+
+    def read_all(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """依次读取 5 根手指，返回 (5, 12, 6) uint8；out 为空时返回内部缓冲区 (下次读取会被覆盖)"""
+        if out is None:
+            out = self.buffer
+        for i in range(FINGER_COUNT):
+            self.read_finger(i + 1, out[i])
+        return out
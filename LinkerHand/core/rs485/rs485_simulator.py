@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RS485 (Modbus RTU) 灵巧手模拟器
+
+基于 pymodbus 串口服务器，按 O6/L6/L7/L10 驱动中记录的寄存器表实现:
+  输入寄存器: 当前角度/转矩/速度/温度/错误码、版本号、压力矩阵数据
+  保持寄存器: 目标角度/转矩/速度、压力手指选择
+关节按一阶惯性环节跟随目标角度，时间常数随目标速度变化。
+
+通过两对伪终端 (pty) 桥接: 驱动打开 port (如 /dev/pts/5)，服务器打开另一端，
+桥接线程转发数据，并在应答方向上加入设备响应延时 / 随机丢帧。
+不需要真实硬件，可在任意 Linux 上做 RS485 路径的吞吐/延时基准测试。
+
+    python3 rs485_simulator.py --model L10 --slave 0x27 --slave 0x28 --latency 0.002
+"""
+import argparse
+import asyncio
+import heapq
+import math
+import os
+import random
+import select
+import threading
+import time
+import tty
+from typing import Dict, List, Optional
+
+from pymodbus.datastore import ModbusSequentialDataBlock, ModbusSlaveContext, ModbusServerContext
+from pymodbus.framer import ModbusRtuFramer
+from pymodbus.server import ModbusSerialServer
+
+# 各型号寄存器表 (与 core/rs485/linker_hand_*_rs485.py 一致)
+#   hr_*: 保持寄存器起始地址; ir_*: 输入寄存器起始地址
+#   versions: (起始地址, 默认值); pressure: (选择寄存器, 数据起始) 或 None
+MODEL_PROFILES = {
+    "O6": {
+        "joints": 6, "hr_angles": 0, "hr_torques": 6, "hr_speeds": 12,
+        "ir_angles": 0, "ir_torques": 6, "ir_speeds": 12, "ir_temperatures": 18, "ir_errors": 24,
+        "versions": (30, [6, 1, 1, 0, 0x10, 0x10]), "pressure": None,
+    },
+    "L6": {
+        "joints": 6, "hr_angles": 0, "hr_torques": 6, "hr_speeds": 12,
+        "ir_angles": 0, "ir_torques": 6, "ir_speeds": 12, "ir_temperatures": 18, "ir_errors": 24,
+        "versions": (148, [6, 1, 1, 0, 1, 0, 0, 1]), "pressure": (60, 62),
+    },
+    "L7": {
+        "joints": 7, "hr_angles": 0, "hr_torques": 7, "hr_speeds": 14,
+        "ir_angles": 0, "ir_torques": 7, "ir_speeds": 14, "ir_temperatures": 21, "ir_errors": 28,
+        "versions": (153, [7, 1, 1, 0, 0x10, 0x10]), "pressure": (42, 57),
+    },
+    "L10": {
+        "joints": 10, "hr_angles": 0, "hr_torques": 10, "hr_speeds": 20,
+        "ir_angles": 0, "ir_torques": 10, "ir_speeds": 20, "ir_temperatures": 40, "ir_errors": 50,
+        "versions": (158, [10, 1, 1, 0, 0x10, 0x10]), "pressure": (70, 72),
+    },
+}
+PRESSURE_HEADER = 10   # 压力数据前 10 个寄存器为头部
+PRESSURE_POINTS = 72   # 12x6
+
+
+class SimulatedHand:
+    """单个从站的关节/传感器状态"""
+
+    def __init__(self, model: str = "L10", tau: float = 0.08, ambient: float = 30.0):
+        self.model = model.upper()
+        self.profile = MODEL_PROFILES[self.model]
+        n = self.profile["joints"]
+        self.tau = tau                  # 速度 255 时的时间常数 (秒)
+        self.ambient = ambient
+        self.position = [255.0] * n     # 当前角度 (255 = 张开)
+        self.velocity = [0.0] * n
+        self.target = [255] * n
+        self.torque = [255] * n
+        self.speed = [255] * n
+        self.errors = [0] * n
+        self.finger = 1
+        self._t = time.perf_counter()
+        self.hr = _HoldingBlock(self)
+        self.ir = _InputBlock(self)
+
+    def on_write(self, address: int, values: List[int]):
+        p = self.profile
+        n = p["joints"]
+        self.step()
+        for i, v in enumerate(values):
+            a = address + i
+            if p["hr_angles"] <= a < p["hr_angles"] + n:
+                self.target[a - p["hr_angles"]] = int(v) & 0xFF
+            elif p["hr_torques"] <= a < p["hr_torques"] + n:
+                self.torque[a - p["hr_torques"]] = int(v) & 0xFF
+            elif p["hr_speeds"] <= a < p["hr_speeds"] + n:
+                self.speed[a - p["hr_speeds"]] = int(v) & 0xFF
+            elif p["pressure"] and a == p["pressure"][0]:
+                self.finger = int(v)
+
+    def step(self, now: Optional[float] = None):
+        """推进关节一阶动态到当前时刻"""
+        now = time.perf_counter() if now is None else now
+        dt = now - self._t
+        self._t = now
+        if dt <= 0:
+            return
+        for i, target in enumerate(self.target):
+            tau = self.tau * 255.0 / max(self.speed[i], 1)
+            prev = self.position[i]
+            self.position[i] = target + (prev - target) * math.exp(-dt / tau)
+            self.velocity[i] = (self.position[i] - prev) / dt
+
+    def input_registers(self) -> Dict[int, int]:
+        """当前输入寄存器映像 {地址: 值}"""
+        self.step()
+        p = self.profile
+        regs: Dict[int, int] = {}
+
+        def put(start, values):
+            for i, v in enumerate(values):
+                regs[start + i] = int(max(0, min(255, v)))
+
+        put(p["ir_angles"], [round(x) for x in self.position])
+        # 转矩: 跟踪误差越大输出越大，不超过设定值
+        put(p["ir_torques"], [min(self.torque[i], abs(self.target[i] - self.position[i]) * 4)
+                              for i in range(len(self.target))])
+        put(p["ir_speeds"], [abs(v) / 4 for v in self.velocity])
+        put(p["ir_temperatures"], [self.ambient + t / 64 for t in self.torque])
+        put(p["ir_errors"], self.errors)
+        start, values = p["versions"]
+        put(start, values)
+        if p["pressure"]:
+            data_start = p["pressure"][1]
+            put(data_start, [0] * PRESSURE_HEADER)
+            put(data_start + PRESSURE_HEADER, self.pressure(self.finger))
+        return regs
+
+    def pressure(self, finger: int) -> List[int]:
+        """按手指弯曲程度生成 12x6 压力数据 (越弯越大，中心点最大)"""
+        n = len(self.position)
+        idx = min(max(finger - 1, 0), n - 1)
+        load = 1.0 - self.position[idx] / 255.0
+        out = []
+        for r in range(12):
+            for c in range(6):
+                w = 1.0 - (abs(r - 5.5) / 6 + abs(c - 2.5) / 3) / 2
+                out.append(255 * load * w)
+        return out
+
+
+class _HoldingBlock(ModbusSequentialDataBlock):
+    def __init__(self, hand: SimulatedHand):
+        super().__init__(0, [0] * 256)
+        self.hand = hand
+        p = hand.profile
+        n = p["joints"]
+        super().setValues(p["hr_angles"], [255] * n)
+        super().setValues(p["hr_torques"], [255] * n)
+        super().setValues(p["hr_speeds"], [255] * n)
+
+    def setValues(self, address, values):
+        if not isinstance(values, list):
+            values = [values]
+        super().setValues(address, values)
+        self.hand.on_write(address, values)
+
+
+class _InputBlock(ModbusSequentialDataBlock):
+    def __init__(self, hand: SimulatedHand):
+        super().__init__(0, [0] * 256)
+        self.hand = hand
+
+    def getValues(self, address, count=1):
+        for a, v in self.hand.input_registers().items():
+            self.values[a] = v
+        return super().getValues(address, count)
+
+
+class PtyBridge:
+    """
+    两对 pty 之间的双向转发: client_port 给驱动，server_port 给 pymodbus 服务器
+    应答方向 (服务器 → 驱动) 加入 latency 延时，并以 drop_rate 概率丢弃
+    """
+
+    def __init__(self, latency: float = 0.0, drop_rate: float = 0.0):
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self._client_master, self._client_slave = os.openpty()
+        self._server_master, self._server_slave = os.openpty()
+        for fd in (self._client_slave, self._server_slave):
+            tty.setraw(fd)
+        self.client_port = os.ttyname(self._client_slave)
+        self.server_port = os.ttyname(self._server_slave)
+        self.dropped = 0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="rs485-sim-bridge", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        for fd in (self._client_master, self._client_slave, self._server_master, self._server_slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _run(self):
+        pending = []  # (到期时间, 序号, 数据)
+        seq = 0
+        fds = [self._client_master, self._server_master]
+        while self._running:
+            timeout = 0.05
+            if pending:
+                timeout = max(0.0, min(timeout, pending[0][0] - time.perf_counter()))
+            try:
+                readable, _, _ = select.select(fds, [], [], timeout)
+            except (OSError, ValueError):
+                return
+            for fd in readable:
+                try:
+                    data = os.read(fd, 4096)
+                except OSError:
+                    continue
+                if fd == self._client_master:
+                    os.write(self._server_master, data)
+                elif self.drop_rate and random.random() < self.drop_rate:
+                    self.dropped += 1
+                else:
+                    seq += 1
+                    heapq.heappush(pending, (time.perf_counter() + self.latency, seq, data))
+            now = time.perf_counter()
+            while pending and pending[0][0] <= now:
+                os.write(self._client_master, heapq.heappop(pending)[2])
+
+
+class RS485Simulator:
+    """
+    在后台线程运行模拟器
+        sim = RS485Simulator("L10", slaves=(0x27,), latency=0.002).start()
+        hand = LinkerHandL10RS485(hand_id=0x27, modbus_port=sim.port)
+    """
+
+    def __init__(self, model: str = "L10", slaves=(0x27,), baudrate: int = 115200,
+                 latency: float = 0.0, drop_rate: float = 0.0, tau: float = 0.08):
+        self.hands = {slave: SimulatedHand(model, tau=tau) for slave in slaves}
+        self.baudrate = baudrate
+        self.bridge = PtyBridge(latency=latency, drop_rate=drop_rate)
+        contexts = {slave: ModbusSlaveContext(hr=h.hr, ir=h.ir, zero_mode=True) for slave, h in self.hands.items()}
+        self.context = ModbusServerContext(slaves=contexts, single=False)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[ModbusSerialServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> str:
+        return self.bridge.client_port
+
+    def start(self) -> "RS485Simulator":
+        self.bridge.start()
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(started,), name="rs485-sim", daemon=True)
+        self._thread.start()
+        started.wait(timeout=5.0)
+        return self
+
+    def _run(self, started: threading.Event):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve(started))
+        finally:
+            started.set()
+
+    async def _serve(self, started: threading.Event):
+        # pymodbus 服务器必须在运行中的事件循环内创建
+        self._server = ModbusSerialServer(
+            self.context, framer=ModbusRtuFramer, port=self.bridge.server_port,
+            baudrate=self.baudrate, ignore_missing_slaves=True)
+        asyncio.get_running_loop().call_later(0.2, started.set)
+        await self._server.serve_forever()
+
+    def stop(self):
+        if self._loop is not None and self._server is not None:
+            asyncio.run_coroutine_threadsafe(self._server.shutdown(), self._loop)
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self.bridge.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RS485 (Modbus RTU) hand simulator")
+    parser.add_argument("--model", type=str, default="L10", choices=sorted(MODEL_PROFILES), help="手型号")
+    parser.add_argument("--slave", type=lambda s: int(s, 0), action="append", help="从站地址，可重复 (默认 0x27)")
+    parser.add_argument("--baudrate", type=int, default=115200)
+    parser.add_argument("--latency", type=float, default=0.002, help="设备响应延时 (秒)")
+    parser.add_argument("--drop", type=float, default=0.0, help="应答丢帧概率 0-1")
+    parser.add_argument("--tau", type=float, default=0.08, help="关节时间常数 (秒，速度 255 时)")
+    args = parser.parse_args()
+    sim = RS485Simulator(args.model, slaves=args.slave or [0x27], baudrate=args.baudrate,
+                         latency=args.latency, drop_rate=args.drop, tau=args.tau).start()
+    print(f"{args.model} simulator slaves={[hex(s) for s in sim.hands]} port: {sim.port}", flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RS485 多从站共享总线
+
+Modbus RTU 支持一条总线挂多个从站 (多点)，例如左右手 0x28/0x27 共用一个 USB-RS485 转换器。
+SharedModbusBus 独占串口、帧间隔计时和总线仲裁锁，各手驱动通过 attach(slave) 拿到一个
+与 ModbusSerialClient 接口相同的客户端挂到总线上。
+轮询调度线程按轮转 (round-robin) 方式为各从站的状态轮询任务分配事务，每轮每个到期任务只执行一次，
+多只手共用总线时各自的刷新率可预期。
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from pymodbus.client import ModbusSerialClient
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from frame_gap import FrameGap, read_frame_bytes, write_frame_bytes, WRITE_SINGLE_FRAME_BYTES
+
+
+class PollJob:
+    """轮询任务句柄，cancel() 后调度线程不再执行"""
+
+    def __init__(self, slave: int, address: int, count: int,
+                 on_registers: Callable[[List[int]], None], interval: float):
+        self.slave = slave
+        self.address = address
+        self.count = count
+        self.on_registers = on_registers
+        self.interval = interval
+        self.next_due = 0.0
+        self.polls = 0
+        self.errors = 0
+        self.cancelled = False
+
+    def cancel(self) -> bool:
+        self.cancelled = True
+        return True
+
+
+class SharedModbusBus:
+    def __init__(self, port: str, baudrate: int = 115200, timeout: float = 0.05,
+                 fixed_gap: float = 0.005, adaptive_gap: bool = False):
+        self.port = port
+        self.gap = FrameGap(baudrate=baudrate, fixed_gap=fixed_gap, adaptive=adaptive_gap)
+        self.cli = ModbusSerialClient(
+            port=port,
+            baudrate=baudrate,
+            bytesize=8,
+            parity="N",
+            stopbits=1,
+            timeout=timeout,
+            retries=3,
+            handle_local_echo=False
+        )
+        self.connected = False
+        self._lock = threading.Lock()       # 总线仲裁: 一次只允许一个事务
+        self._state_lock = threading.Lock()  # 保护 slaves / jobs
+        self.slaves: Dict[int, "SlaveClient"] = {}
+        self._jobs: List[PollJob] = []
+        self._rr = 0
+        self._wakeup = threading.Event()
+        self._poll_thread: Optional[threading.Thread] = None
+        self._running = False
+
+    # ----------------------------------------------------------
+    # 从站挂载
+    # ----------------------------------------------------------
+    def attach(self, slave: int) -> "SlaveClient":
+        with self._state_lock:
+            if slave in self.slaves:
+                raise ValueError(f"slave {hex(slave)} 已挂载到 {self.port}")
+            client = SlaveClient(self, slave)
+            self.slaves[slave] = client
+            return client
+
+    def detach(self, slave: int):
+        with self._state_lock:
+            self.slaves.pop(slave, None)
+            for job in self._jobs:
+                if job.slave == slave:
+                    job.cancel()
+            empty = not self.slaves
+        if empty:
+            self.close()
+
+    def connect(self) -> bool:
+        with self._lock:
+            if not self.connected:
+                self.connected = self.cli.connect()
+            return self.connected
+
+    def close(self):
+        self._running = False
+        self._wakeup.set()
+        if self._poll_thread is not None and self._poll_thread is not threading.current_thread():
+            self._poll_thread.join(timeout=1.0)
+        self._poll_thread = None
+        with self._lock:
+            if self.connected:
+                self.cli.close()
+                self.connected = False
+        with _buses_lock:
+            if _buses.get(self.port) is self:
+                del _buses[self.port]
+
+    # ----------------------------------------------------------
+    # 事务
+    # ----------------------------------------------------------
+    def _transact(self, request, tx_bytes: int, rx_bytes: int):
+        with self._lock:
+            return self.gap.run(request, tx_bytes, rx_bytes)
+
+    def read_input_registers(self, address: int, count: int, slave: int):
+        return self._transact(
+            lambda: self.cli.read_input_registers(address=address, count=count, slave=slave),
+            *read_frame_bytes(count))
+
+    def write_registers(self, address: int, values: List[int], slave: int):
+        return self._transact(
+            lambda: self.cli.write_registers(address=address, values=values, slave=slave),
+            *write_frame_bytes(len(values)))
+
+    def write_register(self, address: int, value: int, slave: int):
+        return self._transact(
+            lambda: self.cli.write_register(address=address, value=value, slave=slave),
+            *WRITE_SINGLE_FRAME_BYTES)
+
+    # ----------------------------------------------------------
+    # 轮转轮询
+    # ----------------------------------------------------------
+    def start_poll(self, slave: int, address: int, count: int,
+                   on_registers: Callable[[List[int]], None], interval: float = 0.01) -> PollJob:
+        job = PollJob(slave, address, count, on_registers, interval)
+        with self._state_lock:
+            self._jobs.append(job)
+            if self._poll_thread is None:
+                self._running = True
+                self._poll_thread = threading.Thread(target=self._poll_loop, name=f"rs485-poll-{self.port}", daemon=True)
+                self._poll_thread.start()
+        self._wakeup.set()
+        return job
+
+    def _next_job(self):
+        """从上次位置之后开始找第一个到期任务；都未到期时返回 (None, 最近到期时间)"""
+        with self._state_lock:
+            self._jobs = [j for j in self._jobs if not j.cancelled]
+            n = len(self._jobs)
+            if n == 0:
+                return None, None
+            now = time.perf_counter()
+            for k in range(n):
+                i = (self._rr + k) % n
+                job = self._jobs[i]
+                if job.next_due <= now:
+                    self._rr = i + 1
+                    return job, None
+            return None, min(j.next_due for j in self._jobs)
+
+    def _poll_loop(self):
+        while self._running:
+            job, due = self._next_job()
+            if job is None:
+                timeout = None if due is None else max(0.0, due - time.perf_counter())
+                self._wakeup.wait(timeout)
+                self._wakeup.clear()
+                continue
+            job.next_due = time.perf_counter() + job.interval
+            try:
+                rsp = self.read_input_registers(job.address, job.count, job.slave)
+                if rsp.isError():
+                    job.errors += 1
+                else:
+                    job.polls += 1
+                    job.on_registers(rsp.registers)
+            except Exception as e:
+                job.errors += 1
+                logging.debug(f"poll {self.port} slave={job.slave} failed: {e}")
+
+    def stats(self) -> Dict[str, object]:
+        s = self.gap.stats()
+        with self._state_lock:
+            s["slaves"] = sorted(self.slaves)
+            s["polls"] = {j.slave: j.polls for j in self._jobs}
+        return s
+
+
+class SlaveClient:
+    """挂在 SharedModbusBus 上的单个从站，接口与 ModbusSerialClient 一致 (slave 参数被忽略，固定为本从站)"""
+
+    def __init__(self, bus: SharedModbusBus, slave: int):
+        self.bus = bus
+        self.slave = slave
+
+    def connect(self) -> bool:
+        return self.bus.connect()
+
+    def close(self):
+        self.bus.detach(self.slave)
+
+    def read_input_registers(self, address: int, count: int = 1, slave: int = None):
+        return self.bus.read_input_registers(address, count, self.slave)
+
+    def write_registers(self, address: int, values: List[int], slave: int = None):
+        return self.bus.write_registers(address, values, self.slave)
+
+    def write_register(self, address: int, value: int, slave: int = None):
+        return self.bus.write_register(address, value, self.slave)
+
+    def start_poll(self, slave: int, address: int, count: int,
+                   on_registers: Callable[[List[int]], None], interval: float = 0.01) -> PollJob:
+        return self.bus.start_poll(self.slave, address, count, on_registers, interval)
+
+    def get_bus_stats(self) -> Dict[str, object]:
+        return self.bus.stats()
+
+
+_buses: Dict[str, SharedModbusBus] = {}
+_buses_lock = threading.Lock()
+
+
+def get_shared_bus(port: str, **kwargs) -> SharedModbusBus:
+    """每个串口一个共享总线对象；kwargs 仅在首次创建时生效"""
+    with _buses_lock:
+        bus = _buses.get(port)
+        if bus is None:
+            bus = SharedModbusBus(port, **kwargs)
+            _buses[port] = bus
+        return bus
+
+
+def attach_slave(port: str, slave: int, **kwargs) -> SlaveClient:
+    return get_shared_bus(port, **kwargs).attach(slave)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RS485 状态块/压感解码后的数据事件
+
+状态寄存器块每次解码 (read_all_status 或后台轮询) 后发出 state / temperature / fault / speed / torque 事件，
+矩阵压感每读完一根手指发出 tactile_frame 事件。事件接口与 CAN 的 CanFrameObserver 一致。
+asyncio 后端的后台轮询在事件循环线程上解码，这些事件转交给专用的派发线程按顺序发出，
+回调中可以直接下发命令 (在循环线程上同步等待同一个循环会死锁)。
+"""
+import asyncio
+import queue
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class StatusEventObserver:
+    def __init__(self, hand, hub):
+        self.hand = hand
+        self.hub = hub
+        self._last_fault: Optional[List[int]] = None
+        self._queue: Optional["queue.Queue"] = None
+        self._lock = threading.Lock()
+
+    def attach(self) -> "StatusEventObserver":
+        self.hand._status.listener = self._on_status
+        touch = getattr(self.hand, "_touch", None)
+        if touch is not None:
+            touch.listener = self._on_touch
+        return self
+
+    def detach(self):
+        self.hand._status.listener = None
+        touch = getattr(self.hand, "_touch", None)
+        if touch is not None:
+            touch.listener = None
+        with self._lock:
+            if self._queue is not None:
+                self._queue.put(None)
+                self._queue = None
+
+    def _emit(self, event: str, *args):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.hub.emit(event, *args)
+            return
+        with self._lock:
+            if self._queue is None:
+                self._queue = queue.Queue()
+                threading.Thread(target=self._dispatch_loop, args=(self._queue,),
+                                 name="rs485-events", daemon=True).start()
+            self._queue.put((event, args))
+
+    def _dispatch_loop(self, events: "queue.Queue"):
+        while True:
+            item = events.get()
+            if item is None:
+                return
+            self.hub.emit(item[0], *item[1])
+
+    def _on_status(self, groups: Dict[str, List[int]]):
+        if "angles" in groups:
+            self._emit("state", list(groups["angles"]))
+        if "temperatures" in groups:
+            self._emit("temperature", list(groups["temperatures"]))
+        if "speeds" in groups:
+            self._emit("speed", list(groups["speeds"]))
+        if "torques" in groups:
+            self._emit("torque", list(groups["torques"]))
+        if "errors" in groups:
+            errors = list(groups["errors"])
+            # 故障码只在变化时通知
+            if errors != self._last_fault:
+                self._last_fault = errors
+                self._emit("fault", errors)
+
+    def _on_touch(self, finger: int, matrix: np.ndarray):
+        self._emit("tactile_frame", finger, matrix.copy())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RS485 状态快照
+
+read_all_status() 用一次功能码 04 事务读出整块状态寄存器，
+解码后按分组(角度/转矩/速度/温度/错误码...)写入快照，单项 getter 在有效期内直接返回快照数据。
+"""
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class StatusSnapshot:
+    """按分组保存最近一次读到的寄存器值及其时间戳"""
+
+    def __init__(self, max_age: float = 0.02):
+        self.max_age = max_age  # 快照有效期(秒)，<= 0 表示不使用快照
+        self._groups: Dict[str, Tuple[float, List[int]]] = {}
+        self.listener: Optional[Callable[[Dict[str, List[int]]], None]] = None  # 每次更新后回调 listener(groups)
+
+    def update(self, ts: Optional[float] = None, **groups: List[int]):
+        ts = time.perf_counter() if ts is None else ts
+        for key, values in groups.items():
+            self._groups[key] = (ts, list(values))
+        if self.listener is not None:
+            self.listener(groups)
+
+    def decode(self, registers: List[int], layout: Dict[str, Tuple[int, int]], ts: Optional[float] = None) -> Dict[str, List[int]]:
+        """
+        按 layout {分组: (起始偏移, 数量)} 切分一整块寄存器并写入快照
+        """
+        groups = {key: [int(v) for v in registers[start:start + count]] for key, (start, count) in layout.items()}
+        self.update(ts=ts, **groups)
+        return groups
+
+    def get(self, key: str) -> Optional[List[int]]:
+        """快照在有效期内返回拷贝，否则返回 None"""
+        if self.max_age <= 0:
+            return None
+        item = self._groups.get(key)
+        if item is None or time.perf_counter() - item[0] > self.max_age:
+            return None
+        return list(item[1])
+
+    def age(self, key: str) -> float:
+        item = self._groups.get(key)
+        return float("inf") if item is None else time.perf_counter() - item[0]
+
+    def clear(self):
+        self._groups.clear()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UDP 遥操作姿态入口
+
+数据手套等外部进程以 100~500 Hz 发送二进制姿态消息 (utils/hand_wire.py 的 KIND_POSE，30 字节/L10)，
+UdpTeleop 收包后:
+  - 按序号丢弃过期/乱序包 (序号不大于已接收的最大序号)，序号跳变计为丢包，跳过的序号随后迟到时从丢包中扣除、
+    只计为乱序；
+    序号回退但发送时间更新、序号大幅回退或空闲超过 _IDLE_RESET 秒后，视为发送端重启，重新开始计序号
+  - jitter > 0 时按 发送时间 + 时钟偏移 + jitter 的时刻放出，平滑网络抖动；偏移取最近一段时间 (到达 - 发送) 的最小值
+  - 放出的姿态写入最新值优先的命令槽 (LatestPoseSlot)，可与 HandServer 共用同一个槽
+stats() 给出接收/丢包/乱序/格式错误计数与单程延迟 (发送端 stamp 到放出，要求两端时钟一致，本机回环即满足)。
+
+命令行:
+    python udp_teleop.py --hand_joint L10 --hand_type left --can can0 --port 9870 --jitter 0.005
+"""
+import argparse
+import heapq
+import os
+import socket
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+from utils.command_slot import LatestPoseSlot
+from utils.hand_wire import decode_pose, encode_pose
+
+_RESTART_GAP = 1000      # 序号回退超过该值视为发送端重启
+_IDLE_RESET = 1.0        # 超过该时间 (秒) 未接收新包后，序号回退视为发送端重启
+_OFFSET_WINDOW = 2.0     # 时钟偏移估计窗口 (秒)
+
+
+class UdpPoseSender:
+    '''发送端辅助: 自动递增序号'''
+    def __init__(self, host: str = "127.0.0.1", port: int = 9870):
+        self.address = (host, port)
+        self.seq = 0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(self, pose: List[int]):
+        self.seq += 1
+        self._sock.sendto(encode_pose(pose, self.seq), self.address)
+
+    def close(self):
+        self._sock.close()
+
+
+class UdpTeleop:
+    def __init__(self, api=None, slot: Optional[LatestPoseSlot] = None, host: str = "127.0.0.1", port: int = 9870,
+                 jitter: float = 0.0, history: int = 2000):
+        '''
+        api 与 slot 二选一: 给出 api 时新建以 api.finger_move 下发的命令槽
+        jitter: 抖动缓冲时长 (秒)，0 表示收到即下发
+        '''
+        if slot is None:
+            if api is None:
+                raise ValueError("需要 api 或 slot")
+            slot = LatestPoseSlot(api.finger_move)
+            self._own_slot = True
+        else:
+            self._own_slot = False
+        self.slot = slot
+        self.jitter = jitter
+        self.received = 0
+        self.forwarded = 0
+        self.stale = 0
+        self.lost = 0
+        self.malformed = 0
+        self.late = 0
+        self._last_seq: Optional[int] = None
+        self._missing: Set[int] = set()       # 已计为丢包、仍可能迟到的序号 (最近 _RESTART_GAP 个以内)
+        self._last_stamp = 0.0
+        self._last_arrival = 0.0
+        self._latency = np.zeros(history)
+        self._latency_count = 0
+        self._offsets: List[tuple] = []       # (到达时间, 到达 - 发送)
+        self._heap: List[tuple] = []          # (放出时间, 序号, 姿态, 发送时间)
+        self._cond = threading.Condition()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((host, port))
+        self._sock.settimeout(0.5)
+        self.address = self._sock.getsockname()
+        self._running = True
+        self._threads = [threading.Thread(target=self._recv_loop, name="linker-hand-udp-recv", daemon=True)]
+        if jitter > 0:
+            self._threads.append(threading.Thread(target=self._playout_loop, name="linker-hand-udp-playout", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def _recv_loop(self):
+        while self._running:
+            try:
+                data, _ = self._sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            now = time.time()
+            try:
+                message = decode_pose(data)
+            except ValueError:
+                self.malformed += 1
+                continue
+            self.received += 1
+            seq = message.seq
+            if self._last_seq is not None:
+                if seq > self._last_seq:
+                    self._mark_missing(self._last_seq + 1, seq)
+                elif self._restarted(seq, message.stamp, now):
+                    # 新会话的时钟偏移可能不同，重新估计
+                    self._offsets = []
+                    self._missing.clear()
+                else:
+                    if seq in self._missing:
+                        # 迟到而非丢失
+                        self._missing.discard(seq)
+                        self.lost -= 1
+                    self.stale += 1
+                    continue
+            self._last_seq = seq
+            self._last_stamp = message.stamp
+            self._last_arrival = now
+            if self.jitter > 0:
+                self._schedule(message, now)
+            else:
+                self._forward(message.values, message.stamp)
+
+    def _mark_missing(self, first: int, end: int):
+        '''序号 [first, end) 未收到，先计为丢包；只记住窗口内的序号，更早的包迟到时按发送端重启处理'''
+        self.lost += end - first
+        floor = end - _RESTART_GAP
+        self._missing.update(range(max(first, floor), end))
+        if len(self._missing) > _RESTART_GAP:
+            self._missing = {s for s in self._missing if s > floor}
+
+    def _restarted(self, seq: int, stamp: float, now: float) -> bool:
+        '''序号不大于已接收的最大序号时，区分发送端重启与过期/乱序包 (后者的发送时间不会更新)'''
+        return (self._last_seq - seq >= _RESTART_GAP or stamp > self._last_stamp
+                or now - self._last_arrival > _IDLE_RESET)
+
+    def _schedule(self, message, now: float):
+        offsets = [o for o in self._offsets if now - o[0] < _OFFSET_WINDOW]
+        offsets.append((now, now - message.stamp))
+        self._offsets = offsets
+        offset = min(o[1] for o in offsets)
+        due = message.stamp + offset + self.jitter
+        with self._cond:
+            heapq.heappush(self._heap, (due, message.seq, message.values, message.stamp))
+            self._cond.notify()
+
+    def _playout_loop(self):
+        last_seq, last_stamp = None, 0.0
+        while True:
+            with self._cond:
+                while self._running and not self._heap:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                due = self._heap[0][0]
+                delay = due - time.time()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                _, seq, pose, stamp = heapq.heappop(self._heap)
+            if last_seq is not None and seq < last_seq and stamp <= last_stamp:
+                # 放出时刻晚于后发的包，已被取代
+                self.late += 1
+                continue
+            last_seq, last_stamp = seq, stamp
+            self._forward(pose, stamp)
+
+    def _forward(self, pose: List[int], stamp: float):
+        self.slot.put(pose)
+        self.forwarded += 1
+        self._latency[self._latency_count % len(self._latency)] = time.time() - stamp
+        self._latency_count += 1
+
+    def stats(self) -> Dict[str, object]:
+        out: Dict[str, object] = {
+            "received": self.received, "forwarded": self.forwarded, "stale": self.stale,
+            "lost": self.lost, "late": self.late, "malformed": self.malformed,
+        }
+        n = min(self._latency_count, len(self._latency))
+        if n:
+            latency = self._latency[:n] * 1000
+            out.update(latency_mean_ms=float(latency.mean()), latency_p99_ms=float(np.percentile(latency, 99)),
+                       latency_max_ms=float(latency.max()))
+        out["slot"] = self.slot.stats()
+        return out
+
+    def close(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify()
+        self._sock.close()
+        for thread in self._threads:
+            thread.join()
+        if self._own_slot:
+            self.slot.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LinkerHand UDP 遥操作入口")
+    parser.add_argument("--hand_joint", default="L10")
+    parser.add_argument("--hand_type", default="left")
+    parser.add_argument("--can", default="can0")
+    parser.add_argument("--modbus", default="None")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9870)
+    parser.add_argument("--jitter", type=float, default=0.0, help="抖动缓冲 (秒)")
+    parser.add_argument("--interval", type=float, default=2.0, help="打印统计的间隔 (秒)")
+    args = parser.parse_args()
+    from linker_hand_api import LinkerHandApi
+    api = LinkerHandApi(hand_type=args.hand_type, hand_joint=args.hand_joint, can=args.can, modbus=args.modbus)
+    teleop = UdpTeleop(api, host=args.host, port=args.port, jitter=args.jitter)
+    print(f"Listening for poses on udp://{teleop.address[0]}:{teleop.address[1]}", flush=True)
+    try:
+        while True:
+            time.sleep(args.interval)
+            print(teleop.stats(), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        teleop.close()
+        api.close_can()
+
+
+if __name__ == "__main__":
+    main()
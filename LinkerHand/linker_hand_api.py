@@ -2,17 +2,24 @@
 # -*- coding: utf-8 -*-
 import sys, os, time,threading
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils"))
 from utils.mapping import *
 from utils.color_msg import ColorMsg
 from utils.load_write_yaml import LoadWriteYaml
+from config_service import get_config_service
 from utils.open_can import OpenCan
 
+# 各型号 finger_move 的姿态长度
+POSE_LENGTH = {"L6": 6, "O6": 6, "L7": 7, "L10": 10, "L20": 20, "G20": 20, "L21": 25, "L25": 25}
+
+
 class LinkerHandApi:
-    def __init__(self, hand_type="left", hand_joint="L10", modbus = "None",can="can0"):  # Ubuntu:can0   win:PCAN_USBBUS1
+    def __init__(self, hand_type="left", hand_joint="L10", modbus = "None",can="can0", adaptive_gap=False, modbus_backend="sync"):  # Ubuntu:can0   win:PCAN_USBBUS1
         self.last_position = []
         self.yaml = LoadWriteYaml()
-        self.config = self.yaml.load_setting_yaml()
-        self.version = self.config["VERSION"]
+        self.setting = get_config_service().get()
+        self.config = self.setting.to_dict()
+        self.version = self.setting.version
         self.can = can
         self.modbus = modbus
         ColorMsg(msg=f"Current SDK version: {self.version}", color="green")
@@ -25,28 +32,32 @@ class LinkerHandApi:
         if self.hand_joint.upper() == "O6":
             if modbus != "None":
                 from core.rs485.linker_hand_o6_rs485 import LinkerHandO6RS485
-                self.hand = LinkerHandO6RS485(hand_id=self.hand_id,modbus_port=modbus,baudrate=115200)
+                client = self._open_rs485_client(modbus, modbus_backend, adaptive_gap, LinkerHandO6RS485.FRAME_GAP)
+                self.hand = LinkerHandO6RS485(hand_id=self.hand_id,modbus_port=modbus,baudrate=115200,adaptive_gap=adaptive_gap,client=client)
             else:
                 from core.can.linker_hand_o6_can import LinkerHandO6Can
                 self.hand = LinkerHandO6Can(can_id=self.hand_id,can_channel=self.can, yaml=self.yaml)
         if self.hand_joint == "L6":
             if modbus != "None":
                 from core.rs485.linker_hand_l6_rs485 import LinkerHandL6RS485
-                self.hand = LinkerHandL6RS485(hand_id=self.hand_id,modbus_port=modbus,baudrate=115200)
+                client = self._open_rs485_client(modbus, modbus_backend, adaptive_gap, LinkerHandL6RS485.FRAME_GAP)
+                self.hand = LinkerHandL6RS485(hand_id=self.hand_id,modbus_port=modbus,baudrate=115200,adaptive_gap=adaptive_gap,client=client)
             else:
                 from core.can.linker_hand_l6_can import LinkerHandL6Can
                 self.hand = LinkerHandL6Can(can_id=self.hand_id,can_channel=self.can, yaml=self.yaml)
         if self.hand_joint == "L7":
             if modbus != "None":
                 from core.rs485.linker_hand_l7_rs485 import LinkerHandL7RS485
-                self.hand = LinkerHandL7RS485(hand_id=self.hand_id,modbus_port=modbus,baudrate=115200)
+                client = self._open_rs485_client(modbus, modbus_backend, adaptive_gap, LinkerHandL7RS485.FRAME_GAP)
+                self.hand = LinkerHandL7RS485(hand_id=self.hand_id,modbus_port=modbus,baudrate=115200,adaptive_gap=adaptive_gap,client=client)
             else:
                 from core.can.linker_hand_l7_can import LinkerHandL7Can
                 self.hand = LinkerHandL7Can(can_id=self.hand_id,can_channel=self.can, yaml=self.yaml)
         if self.hand_joint == "L10":
             if modbus != "None":
                 from core.rs485.linker_hand_l10_rs485 import LinkerHandL10RS485
-                self.hand = LinkerHandL10RS485(hand_id=self.hand_id,modbus_port=modbus,baudrate=115200)
+                client = self._open_rs485_client(modbus, modbus_backend, adaptive_gap, LinkerHandL10RS485.FRAME_GAP)
+                self.hand = LinkerHandL10RS485(hand_id=self.hand_id,modbus_port=modbus,baudrate=115200,adaptive_gap=adaptive_gap,client=client)
             else:
                 from core.can.linker_hand_l10_can import LinkerHandL10Can
                 self.hand = LinkerHandL10Can(can_id=self.hand_id,can_channel=self.can, yaml=self.yaml)
@@ -62,6 +73,9 @@ class LinkerHandApi:
         if self.hand_joint == "L25":
             from core.can.linker_hand_l25_can import LinkerHandL25Can
             self.hand = LinkerHandL25Can(can_id=self.hand_id,can_channel=self.can, yaml=self.yaml)
+        self._status_poll = None
+        if modbus != "None" and modbus_backend in ("asyncio", "shared"):
+            self._status_poll = self.hand.start_status_poll()
         # Open can0
         if sys.platform == "linux" and modbus=="None":
             self.open_can = OpenCan(load_yaml=self.yaml)
@@ -78,6 +92,20 @@ class LinkerHandApi:
             ColorMsg(msg=f"Embedded:{version}", color="green")
         ColorMsg(msg=f"Linker Hand Serial Number: {self.serial_number}", color="green")
     
+    def _open_rs485_client(self, modbus, modbus_backend, adaptive_gap, frame_gap):
+        '''
+        modbus_backend="asyncio": RS485 I/O runs on a shared asyncio loop thread behind a blocking facade
+        modbus_backend="shared": multi-drop, hands with different IDs on the same port share one serial bus and a round-robin poller
+        None keeps the default blocking client
+        '''
+        if modbus_backend == "asyncio":
+            from core.rs485.async_backend import open_sync_client
+            return open_sync_client(modbus, baudrate=115200, fixed_gap=frame_gap, adaptive_gap=adaptive_gap)
+        if modbus_backend == "shared":
+            from core.rs485.shared_bus import attach_slave
+            return attach_slave(modbus, self.hand_id, baudrate=115200, fixed_gap=frame_gap, adaptive_gap=adaptive_gap)
+        return None
+
     # Five-finger movement
     def finger_move(self, pose=[]):
         '''
@@ -91,6 +119,10 @@ class LinkerHandApi:
         if any(not isinstance(x, (int, float)) or x < 0 or x > 255 for x in pose):
             ColorMsg(msg=f"The numerical range cannot be less than 0 or greater than 255",color="red")
             return
+        reflex = getattr(self, "_reflex", None)
+        if reflex is not None:
+            # 已触发的反射优先于用户目标，直到压力回落
+            pose = reflex.filter_pose(pose)
         if (self.hand_joint.upper() == "O6" or self.hand_joint.upper() == "L6") and len(pose) == 6:
             self.hand.set_joint_positions(pose)
         elif self.hand_joint == "L7" and len(pose) == 7:
@@ -165,6 +197,10 @@ class LinkerHandApi:
             print("L6 or O6数据长度错误,至少6个元素", flush=True)
             return
         ColorMsg(msg=f"{self.hand_type} {self.hand_joint} set maximum torque to {torque}", color="green")
+        reflex = getattr(self, "_reflex", None)
+        if reflex is not None:
+            reflex.note_torque(torque)
+            torque = reflex.filter_torque(reflex.torque)
         return self.hand.set_torque(torque=torque)
     
     
@@ -198,6 +234,232 @@ class LinkerHandApi:
         return self.hand.get_current_status()
 
     
+    def read_all_status(self):
+        '''RS485 only: read the whole status register block in one transaction; get_state/get_speed/get_torque/get_temperature/get_fault then serve the snapshot'''
+        if self.modbus != "None":
+            return self.hand.read_all_status()
+        return None
+
+    def get_bus_stats(self):
+        '''RS485 only: current inter-frame gap, device turnaround time and bus error rate'''
+        if self.modbus != "None":
+            return self.hand.get_bus_stats()
+        return None
+
+    def start_can_recording(self, path):
+        '''CAN only: record every TX/RX frame with timestamps; .blf is compressed binary, .asc/.log/.csv are text (python-can formats)'''
+        if self.modbus != "None":
+            return None
+        from core.can.can_recorder import record_hand
+        self.stop_can_recording()
+        self._can_recording = record_hand(self.hand, path)
+        return path
+
+    def stop_can_recording(self):
+        '''Stop recording and close the log, returns {"tx": frames, "rx": frames}'''
+        recording = getattr(self, "_can_recording", None)
+        if recording is None:
+            return None
+        self._can_recording = None
+        return recording.stop()
+
+    def _event_hub(self):
+        '''Created on first subscription; hooks the decode path of the current driver'''
+        hub = getattr(self, "_events", None)
+        if hub is None:
+            from utils.event_hub import EventHub
+            hub = EventHub()
+            if self.modbus != "None":
+                from core.rs485.status_events import StatusEventObserver
+                self._event_observer = StatusEventObserver(self.hand, hub).attach()
+            else:
+                from core.can.can_events import CanFrameObserver
+                self._event_observer = CanFrameObserver(self.hand, self.hand_joint, hub).attach()
+            self._events = hub
+        return hub
+
+    def on_state(self, callback, use_pool=False):
+        '''
+        callback(state) once a complete joint state has been decoded (e.g. L10: both 0x01 and 0x04 frames)
+        Runs in the receive thread unless use_pool=True; RS485 fires whenever the status block is read or polled
+        '''
+        return self._event_hub().subscribe("state", callback, use_pool)
+
+    def on_tactile_frame(self, callback, use_pool=False):
+        '''callback(finger, matrix) once all rows of one finger's matrix have arrived, finger 0-4 = thumb..little'''
+        return self._event_hub().subscribe("tactile_frame", callback, use_pool)
+
+    def on_fault(self, callback, use_pool=False):
+        '''callback(fault_codes) when the decoded fault codes change'''
+        return self._event_hub().subscribe("fault", callback, use_pool)
+
+    def on_temperature(self, callback, use_pool=False):
+        '''callback(temperatures) once a complete temperature set has been decoded'''
+        return self._event_hub().subscribe("temperature", callback, use_pool)
+
+    def on_speed(self, callback, use_pool=False):
+        '''callback(speeds) once a complete speed reply has been decoded (after get_speed or a status read)'''
+        return self._event_hub().subscribe("speed", callback, use_pool)
+
+    def on_torque(self, callback, use_pool=False):
+        '''callback(torques) once a complete torque reply has been decoded'''
+        return self._event_hub().subscribe("torque", callback, use_pool)
+
+    def on_force(self, callback, use_pool=False):
+        '''CAN only: callback(values) once all four force frames arrived, normal + tangential + direction + approach (5 each)'''
+        return self._event_hub().subscribe("force", callback, use_pool)
+
+    def remove_callback(self, event, callback):
+        '''event: "state" / "tactile_frame" / "fault" / "temperature" / "speed" / "torque" / "force"'''
+        hub = getattr(self, "_events", None)
+        if hub is not None:
+            hub.unsubscribe(event, callback)
+
+    def publish_state(self, name=None):
+        '''
+        Publish decoded state/speed/torque/temperature/fault/tactile into a named shared-memory segment
+        (default "linker_hand_<hand_type>"); other processes read it with utils.state_publisher.StateReader
+        Only frames that arrive anyway are published: something still has to poll get_state / get_matrix_touch
+        '''
+        from utils.state_publisher import StatePublisher
+        self.stop_state_publish()
+        self._state_publisher = StatePublisher(self._event_hub(), self.hand_joint, name or f"linker_hand_{self.hand_type}", self.hand_id)
+        faults = getattr(self._event_observer, "_last_fault", None)
+        if faults is not None:
+            self._state_publisher.update("fault", faults)
+        return self._state_publisher.name
+
+    def stop_state_publish(self):
+        publisher = getattr(self, "_state_publisher", None)
+        if publisher is not None:
+            self._state_publisher = None
+            publisher.close()
+
+    def add_reflex(self, finger=None, pressure=None, force=None, action="freeze", release=0.5, backoff=20, torque=50, poll_hz=50):
+        '''
+        CAN L6/O6/L7/L10 only: contact reflex evaluated in the receive thread, no user-thread round trip
+        finger 0-4 = thumb..little (None = all); pressure: matrix cell threshold 0-255; force: normal force threshold
+        action: "freeze" (hold measured position) / "backoff" (open by backoff) / "cap_torque" (limit torque to torque)
+        Released when the value falls below release * threshold
+        poll_hz: the hand only reports sensors on request, so a background thread requests the matrix / normal force
+        of the fingers with rules at this rate (0 = rely on get_matrix_touch / grasp() polling elsewhere)
+        '''
+        if self.modbus != "None":
+            ColorMsg(msg="Reflex rules are only supported on CAN", color="red")
+            return None
+        reflex = getattr(self, "_reflex", None)
+        if reflex is None:
+            from core.can.can_reflex import ReflexEngine
+            reflex = ReflexEngine(self.hand, self.hand_joint).attach()
+            self._reflex = reflex
+        reflex.add_rule(finger=finger, pressure=pressure, force=force, action=action,
+                        release=release, backoff=backoff, torque=torque)
+        if poll_hz > 0:
+            reflex.start_poll(poll_hz)
+        return reflex
+
+    def clear_reflexes(self):
+        '''Remove all reflex rules and release active overrides'''
+        reflex = getattr(self, "_reflex", None)
+        if reflex is not None:
+            reflex.clear()
+
+    def get_reflex_status(self):
+        '''{"active": per finger, "override", "torque_override", "triggers", "last_latency": seconds from frame receipt to command}'''
+        reflex = getattr(self, "_reflex", None)
+        return None if reflex is None else reflex.status()
+
+    def grasp(self, sensor="matrix", contact=30, target=80, close_speed=0.5, gain=0.005, rate=100, synergy=None, fingers=None, wait=None):
+        '''
+        L6/O6/L7/L10: closed-loop grasp, each finger closes along the synergy (open pose -> close pose),
+        stops on contact (pressure >= contact) and then regulates its pressure to target in a fixed-rate loop
+        sensor: "matrix" (max matrix cell) or "force" (normal force, CAN only); wait: seconds to block for contact
+        Returns the GraspController; get_grasp_status() reports per-finger state
+        '''
+        from utils.grasp_controller import GraspController
+        self.release_grasp(open_hand=False)
+        self._grasp = GraspController(self, synergy=synergy, sensor=sensor, rate=rate, contact=contact,
+                                      target=target, close_speed=close_speed, gain=gain, fingers=fingers).grasp()
+        if wait is not None:
+            self._grasp.wait(wait)
+        return self._grasp
+
+    def release_grasp(self, open_hand=True):
+        '''Stop the grasp loop; open_hand returns the fingers to the synergy open pose'''
+        grasp = getattr(self, "_grasp", None)
+        if grasp is None:
+            return
+        self._grasp = None
+        if open_hand:
+            grasp.release()
+        else:
+            grasp.stop()
+
+    def get_grasp_status(self):
+        grasp = getattr(self, "_grasp", None)
+        return None if grasp is None else grasp.status()
+
+    def play_trajectory(self, waypoints, durations, profile="minjerk", rate=200, blend=0.0, start=None, wait=False):
+        '''
+        Precompute the whole trajectory through waypoints (durations[i] seconds to reach waypoints[i]) and stream it
+        at a fixed rate; profile "minjerk" or "cubic". Starts from the last streamed/commanded pose unless start is given.
+        A new call preempts the running trajectory; blend > 0 cross-fades into the new one over blend seconds
+        '''
+        from utils.trajectory import TrajectoryStreamer, plan
+        dof = POSE_LENGTH.get(self.hand_joint.upper())
+        if dof is None or any(len(p) != dof for p in waypoints):
+            ColorMsg(msg=f"Current LinkerHand is {self.hand_type}{self.hand_joint}, waypoints must have {dof} joints", color="red")
+            return None
+        streamer = getattr(self, "_streamer", None)
+        if streamer is not None and streamer.rate != rate:
+            streamer.close()
+            streamer = None
+        if streamer is None:
+            streamer = self._streamer = TrajectoryStreamer(self._stream_pose, rate=rate)
+        if start is None:
+            if streamer.last_sent is not None:
+                start = streamer.last_sent
+            elif len(self.last_position) == dof:
+                start = self.last_position
+        trajectory = plan(waypoints, durations, rate=rate, profile=profile, start=start)
+        streamer.play(trajectory, blend=blend)
+        if wait:
+            streamer.wait()
+        return trajectory
+
+    def stop_trajectory(self):
+        '''Stop streaming; the hand holds the last streamed pose'''
+        streamer = getattr(self, "_streamer", None)
+        if streamer is not None:
+            streamer.stop()
+
+    def wait_trajectory(self, timeout=None):
+        streamer = getattr(self, "_streamer", None)
+        return True if streamer is None else streamer.wait(timeout)
+
+    def create_gesture_sequencer(self, names=None, steps=None, duration=1.0, blend=0.3, loop=True, rate=100, on_step=None):
+        '''
+        Compile actions from the action library (names, default all for this model/side) or explicit GestureStep
+        list into a timed schedule played on its own timing thread. Returns the GestureSequencer:
+        play() / pause() / seek(step) / set_loop() / stop(); on_step(index, name) runs in the timing thread
+        '''
+        from utils.gesture_sequencer import GestureSequencer, steps_from_library
+        if steps is None:
+            steps = steps_from_library(self.hand_joint, self.hand_type, names, duration=duration, blend=blend)
+        dof = POSE_LENGTH.get(self.hand_joint.upper())
+        bad = [s.name for s in steps if len(s.pose) != dof]
+        if bad:
+            raise ValueError(f"{self.hand_joint} 需要 {dof} 个关节，动作长度不符: {bad}")
+        return GestureSequencer(self._stream_pose, steps, rate=rate, loop=loop, on_step=on_step)
+
+    def _stream_pose(self, pose):
+        # 轨迹在规划时已校验长度与范围，这里只做反射覆盖后直接下发
+        reflex = getattr(self, "_reflex", None)
+        if reflex is not None:
+            pose = reflex.filter_pose(pose)
+        self.hand.set_joint_positions(pose)
+        self.last_position = pose
+
     def get_state_for_pub(self):
         return self.hand.get_current_pub_status()
     
@@ -337,7 +599,21 @@ class LinkerHandApi:
     def show_fun_table(self):
         self.hand.show_fun_table()
         
+    @staticmethod
+    def spawn(**kwargs):
+        '''
+        在独立子进程中打开手 (参数同构造函数，另有 telemetry_hz / tactile_hz)，返回父进程中的代理 LinkerHandProcess
+        finger_move / set_speed / set_torque 与 get_state / get_matrix_touch 走共享内存，其余接口转发给子进程
+        '''
+        from core.io_process import LinkerHandProcess
+        return LinkerHandProcess(**kwargs)
+
     def close_can(self):
+        self.stop_state_publish()
+        if self._status_poll is not None:
+            # 后台状态轮询在共享事件循环上运行，不停止会在手关闭后继续访问串口
+            self.hand.stop_status_poll()
+            self._status_poll = None
         if sys.platform == "linux" and self.modbus=="None":
             self.open_can.close_can(can=self.can)                         
 
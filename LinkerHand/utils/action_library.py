@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+动作库
+
+启动时把 config 目录下所有 *_positions.yaml 一次性加载为 NumPy 数组，按 型号/左右手/动作名 建立索引。
+- 解析结果缓存在 config/.cache/*.npz 中，yaml 的 mtime 改变后缓存自动失效
+- 新增动作只追加写入 *_positions.journal (每行一条 JSON)，不再整文件重写 yaml
+- journal 条目累积到阈值后，由后台线程合并回 yaml 并清空 journal
+- 多个进程可共用一个配置目录: 追加/合并持有 fcntl 文件锁，合并读取磁盘上的 yaml + journal；
+  查询时比较 yaml/journal 的 mtime 与大小，发现其他进程写入后重新加载
+'''
+import os, sys, glob, json, threading, contextlib
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import yaml
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from config_service import load_yaml_file
+
+DEFAULT_CONFIG_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config"))
+HAND_KEYS = {"left": "LEFT_HAND", "right": "RIGHT_HAND"}
+CACHE_FORMAT = 1
+
+
+class ActionTable:
+    '''单个 型号+左右手 的动作表: names[i] 对应 positions[i]'''
+    def __init__(self, names: List[str], positions: np.ndarray):
+        self.names = list(names)
+        self.positions = positions
+        self.positions.flags.writeable = False
+        self.index = {name: i for i, name in enumerate(self.names)}  # 同名动作以最后一条为准
+
+    @classmethod
+    def from_actions(cls, actions: Optional[List[dict]]) -> "ActionTable":
+        actions = actions or []
+        names = [str(a["ACTION_NAME"]) for a in actions]
+        rows = [list(a["POSITION"]) for a in actions]
+        return cls(names, _stack(rows))
+
+    def append(self, name: str, position) -> "ActionTable":
+        '''返回追加一条动作后的新表 (旧表保持不变，读线程无需加锁)'''
+        return ActionTable(self.names + [name], _stack(_rows(self.positions) + [list(position)]))
+
+    def get(self, name: str) -> Optional[np.ndarray]:
+        i = self.index.get(name)
+        return None if i is None else self.positions[i]
+
+    def to_actions(self) -> List[dict]:
+        return [{"ACTION_NAME": n, "POSITION": p} for n, p in zip(self.names, _rows(self.positions))]
+
+
+def _stack(rows: List[list]) -> np.ndarray:
+    '''动作长度不一致时右侧补 -1，保证是规则的二维数组；yaml 中的小数四舍五入'''
+    if not rows:
+        return np.zeros((0, 0), dtype=np.int16)
+    width = max(len(r) for r in rows)
+    arr = np.full((len(rows), width), -1, dtype=np.int16)
+    for i, r in enumerate(rows):
+        arr[i, :len(r)] = np.rint(np.asarray(r, dtype=float))
+    return arr
+
+
+def _pose(position) -> List[int]:
+    '''四舍五入为 0~255 的整数；NaN 或越界 (-1 是补位标记) 时抛 ValueError'''
+    pose = [int(round(float(v))) for v in position]
+    if any(v < 0 or v > 255 for v in pose):
+        raise ValueError(f"动作取值超出 0~255: {list(position)}")
+    return pose
+
+
+def _rows(arr: np.ndarray) -> List[list]:
+    return [[int(v) for v in row if v >= 0] for row in arr]
+
+
+class ActionLibrary:
+    def __init__(self, config_dir: str = DEFAULT_CONFIG_DIR, compact_threshold: int = 32):
+        self.config_dir = config_dir
+        self.cache_dir = os.path.join(config_dir, ".cache")
+        self.compact_threshold = compact_threshold
+        self._tables: Dict[Tuple[str, str], ActionTable] = {}
+        self._journal_count: Dict[str, int] = {}
+        self._signature: Dict[str, tuple] = {}
+        self._lock = threading.RLock()
+        self._compact_thread = None
+        self.reload()
+
+    # ----------------------------------------------------------
+    # 路径
+    # ----------------------------------------------------------
+    def yaml_path(self, hand_joint: str) -> str:
+        return os.path.join(self.config_dir, f"{hand_joint}_positions.yaml")
+
+    def journal_path(self, hand_joint: str) -> str:
+        return os.path.join(self.config_dir, f"{hand_joint}_positions.journal")
+
+    def cache_path(self, hand_joint: str) -> str:
+        return os.path.join(self.cache_dir, f"{hand_joint}_positions.npz")
+
+    def lock_path(self, hand_joint: str) -> str:
+        return os.path.join(self.cache_dir, f"{hand_joint}_positions.lock")
+
+    @contextlib.contextmanager
+    def _file_lock(self, hand_joint: str, exclusive: bool):
+        '''
+        跨进程文件锁 (GUI、手势服务等多个进程共用一个配置目录): 读 yaml+journal 用共享锁，追加与合并用独占锁
+        fcntl 不可用 (Windows) 或配置目录只读时不加锁
+        '''
+        file = None
+        if fcntl is not None:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                file = open(self.lock_path(hand_joint), 'a')
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            except OSError:
+                if file is not None:
+                    file.close()
+                file = None
+        try:
+            yield
+        finally:
+            if file is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+                file.close()
+
+    def _disk_signature(self, hand_joint: str) -> tuple:
+        '''yaml 与 journal 的 (mtime, 大小)，任一变化说明有其他进程写入'''
+        out = []
+        for path in (self.yaml_path(hand_joint), self.journal_path(hand_joint)):
+            try:
+                st = os.stat(path)
+                out.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                out.append(None)
+        return tuple(out)
+
+    # ----------------------------------------------------------
+    # 加载
+    # ----------------------------------------------------------
+    def reload(self):
+        '''重新扫描 config 目录下所有 *_positions.yaml'''
+        with self._lock:
+            self._tables.clear()
+            self._signature.clear()
+            for path in sorted(glob.glob(os.path.join(self.config_dir, "*_positions.yaml"))):
+                hand_joint = os.path.basename(path)[:-len("_positions.yaml")]
+                with self._file_lock(hand_joint, exclusive=False):
+                    self._load_joint(hand_joint)
+
+    def _refresh(self, hand_joint: str):
+        '''其他进程追加或合并过动作时重新读取该型号'''
+        if hand_joint not in self._signature or self._disk_signature(hand_joint) == self._signature[hand_joint]:
+            return
+        with self._lock:
+            with self._file_lock(hand_joint, exclusive=False):
+                self._load_joint(hand_joint)
+
+    def _load_joint(self, hand_joint: str):
+        '''调用方需持有该型号的文件锁'''
+        # 先记录签名再读取，读取期间的写入会在下一次查询时被发现
+        self._signature[hand_joint] = self._disk_signature(hand_joint)
+        yaml_path = self.yaml_path(hand_joint)
+        mtime = os.stat(yaml_path).st_mtime
+        tables = self._read_cache(hand_joint, mtime)
+        if tables is None:
+            tables = self._read_yaml(hand_joint)
+            self._write_cache(hand_joint, mtime, tables)
+        # 叠加 journal 中尚未合并的动作
+        count = 0
+        for side, name, position in self._read_journal(hand_joint):
+            tables[side] = tables[side].append(name, position)
+            count += 1
+        self._journal_count[hand_joint] = count
+        for side, table in tables.items():
+            self._tables[(hand_joint, side)] = table
+
+    def _read_yaml(self, hand_joint: str) -> Dict[str, ActionTable]:
+        try:
+            data = load_yaml_file(self.yaml_path(hand_joint)) or {}
+        except Exception as e:
+            print(f"yaml配置文件读取失败: {e}")
+            data = {}
+        return {side: ActionTable.from_actions(data.get(key)) for side, key in HAND_KEYS.items()}
+
+    def _read_cache(self, hand_joint: str, mtime: float) -> Optional[Dict[str, ActionTable]]:
+        path = self.cache_path(hand_joint)
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                if int(npz["format"]) != CACHE_FORMAT or float(npz["mtime"]) != mtime:
+                    return None
+                return {side: ActionTable(npz[f"{side}_names"].tolist(), npz[f"{side}_positions"].copy())
+                        for side in HAND_KEYS}
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _write_cache(self, hand_joint: str, mtime: float, tables: Dict[str, ActionTable]):
+        arrays = {"format": np.array(CACHE_FORMAT), "mtime": np.array(mtime)}
+        for side, table in tables.items():
+            arrays[f"{side}_names"] = np.array(table.names, dtype=str)
+            arrays[f"{side}_positions"] = table.positions
+        path = self.cache_path(hand_joint)
+        # 共享锁下多个进程可能同时写缓存，临时文件按进程区分
+        tmp = path + f".{os.getpid()}.tmp.npz"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            np.savez(tmp, **arrays)
+            os.replace(tmp, path)
+        except OSError as e:
+            # 配置目录只读时仅跳过缓存，不影响使用
+            print(f"Error writing action cache: {e}")
+
+    def _read_journal(self, hand_joint: str):
+        path = self.journal_path(hand_joint)
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    yield entry["hand_type"], entry["name"], entry["position"]
+                except (ValueError, KeyError):
+                    # 写入中途断电等导致的残缺行直接跳过
+                    continue
+
+    # ----------------------------------------------------------
+    # 查询
+    # ----------------------------------------------------------
+    def table(self, hand_joint: str, hand_type: str) -> Optional[ActionTable]:
+        self._refresh(hand_joint)
+        return self._tables.get((hand_joint, hand_type))
+
+    def names(self, hand_joint: str, hand_type: str) -> List[str]:
+        t = self.table(hand_joint, hand_type)
+        return list(t.names) if t else []
+
+    def positions(self, hand_joint: str, hand_type: str) -> Optional[np.ndarray]:
+        '''返回 (动作数, 关节数) 的只读数组'''
+        t = self.table(hand_joint, hand_type)
+        return t.positions if t else None
+
+    def get(self, hand_joint: str, hand_type: str, name: str) -> Optional[np.ndarray]:
+        t = self.table(hand_joint, hand_type)
+        return t.get(name) if t else None
+
+    def actions(self, hand_joint: str, hand_type: str) -> Optional[List[dict]]:
+        '''与 LoadWriteYaml.load_action_yaml 相同的 [{"ACTION_NAME", "POSITION"}] 格式'''
+        t = self.table(hand_joint, hand_type)
+        if t is None or len(t.names) == 0:
+            return None
+        return t.to_actions()
+
+    # ----------------------------------------------------------
+    # 追加与合并
+    # ----------------------------------------------------------
+    def add(self, hand_joint: str, hand_type: str, name: str, position) -> bool:
+        '''记录一条新动作：追加写 journal，并重新读取磁盘内容 (包含其他进程追加的动作)'''
+        if hand_type not in HAND_KEYS:
+            return False
+        position = _pose(position)
+        line = json.dumps({"hand_type": hand_type, "name": name, "position": position}, ensure_ascii=False)
+        with self._lock:
+            if not os.path.exists(self.yaml_path(hand_joint)):
+                return False
+            with self._file_lock(hand_joint, exclusive=True):
+                with open(self.journal_path(hand_joint), 'a', encoding='utf-8') as file:
+                    file.write(line + "\n")
+                    file.flush()
+                    os.fsync(file.fileno())
+                self._load_joint(hand_joint)
+            if self._journal_count[hand_joint] >= self.compact_threshold:
+                self.compact(wait=False)
+        return True
+
+    def compact(self, hand_joint: Optional[str] = None, wait: bool = True):
+        '''把 journal 合并回 yaml；wait=False 时在后台线程执行'''
+        if not wait:
+            with self._lock:
+                if self._compact_thread is not None and self._compact_thread.is_alive():
+                    return
+                self._compact_thread = threading.Thread(target=self.compact, args=(hand_joint, True), daemon=True)
+                self._compact_thread.start()
+            return
+        joints = [hand_joint] if hand_joint else list(self._journal_count.keys())
+        for j in joints:
+            with self._lock:
+                try:
+                    with self._file_lock(j, exclusive=True):
+                        self._compact_joint(j)
+                except Exception as e:
+                    print(f"Error writing to yaml file: {e}")
+
+    def _compact_joint(self, hand_joint: str):
+        '''调用方需持有独占文件锁；合并的是磁盘上的 yaml + journal，而不是本进程内存中的表'''
+        journal = list(self._read_journal(hand_joint))
+        if not journal:
+            self._load_joint(hand_joint)
+            return
+        tables = self._read_yaml(hand_joint)
+        for side, name, position in journal:
+            tables[side] = tables[side].append(name, position)
+        data = {key: tables[side].to_actions() or None for side, key in HAND_KEYS.items()}
+        path = self.yaml_path(hand_joint)
+        tmp = path + f".{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as file:
+            yaml.safe_dump(data, file, allow_unicode=True)
+        os.replace(tmp, path)
+        os.remove(self.journal_path(hand_joint))
+        self._write_cache(hand_joint, os.stat(path).st_mtime, tables)
+        self._load_joint(hand_joint)
+
+
+_library: Optional[ActionLibrary] = None
+_library_lock = threading.Lock()
+
+
+def get_action_library() -> ActionLibrary:
+    '''进程内共享的动作库'''
+    global _library
+    if _library is None:
+        with _library_lock:
+            if _library is None:
+                _library = ActionLibrary()
+    return _library
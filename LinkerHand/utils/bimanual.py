@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+双手同步下发
+
+两个 LinkerHandApi 依次调用 finger_move 时，右手要等左手的全部帧 (以及驱动里的 sleep) 发完才开始。
+BimanualController 先让两只手的驱动各自编码出本次姿态的 CAN 帧 (只收集调用线程的帧，不发送)，再统一发出:
+  interleave: 两只手在同一 CAN 通道，按 左0 右0 左1 右1 ... 交错在一个发送批次内
+  parallel:   两只手在不同通道，两个发送线程在同一屏障处同时开始
+每次 move() 记录双手对应帧之间的发送时间差 (skew)，skew_stats() 给出均值/p99/最大值。
+编码阶段仍会执行驱动自身的 sleep (例如 L6 的 3ms)，它只增加 move() 的耗时，不影响双手之间的 skew。
+仅支持 CAN；RS485 每只手独占串口事务，不在此列。
+'''
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class _CaptureBus:
+    '''
+    构造时替换驱动的 bus (close() 时还原)。只有正在 capture() 的线程调用 send 时收集帧，
+    其他线程 (手势、远程命令等) 的 send 以及 recv 等照常转发给原 bus，编码期间不会吞掉别人的帧
+    '''
+    def __init__(self, bus):
+        self._bus = bus
+        self._local = threading.local()
+
+    def capture(self, encode) -> List:
+        frames = self._local.frames = []
+        try:
+            encode()
+        finally:
+            self._local.frames = None
+        return frames
+
+    def send(self, msg, timeout=None):
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            return self._bus.send(msg, timeout)
+        frames.append(msg)
+
+    def __getattr__(self, name):
+        return getattr(self._bus, name)
+
+
+class _ParallelSender(threading.Thread):
+    def __init__(self, barrier: threading.Barrier, timeout: float):
+        super().__init__(name="linker-hand-bimanual", daemon=True)
+        self.barrier = barrier
+        self.timeout = timeout
+        self.ready = threading.Event()
+        self.bus = None
+        self.frames: List = []
+        self.times: List[float] = []
+        self.error: Optional[Exception] = None
+        self.running = True
+
+    def run(self):
+        while True:
+            self.ready.wait()
+            self.ready.clear()
+            if not self.running:
+                return
+            times, self.error = [], None
+            try:
+                self.barrier.wait(self.timeout)
+                for msg in self.frames:
+                    self.bus.send(msg, self.timeout)
+                    times.append(time.perf_counter())
+            except threading.BrokenBarrierError:
+                continue
+            except Exception as e:
+                # 发送失败 (can.CanError 等) 也要到达结束屏障，由调用线程报告
+                self.error = e
+            self.times = times
+            try:
+                self.barrier.wait(self.timeout)
+            except threading.BrokenBarrierError:
+                pass
+
+
+class BimanualController:
+    def __init__(self, left, right, mode: str = "auto", history: int = 1000, timeout: float = 1.0):
+        '''
+        left / right: LinkerHandApi (CAN)；mode: "auto" / "interleave" / "parallel"
+        timeout: parallel 模式下单帧发送及等待另一发送线程的超时 (秒)
+        '''
+        for api in (left, right):
+            if api.modbus != "None":
+                raise ValueError("双手同步下发仅支持 CAN")
+        if mode == "auto":
+            mode = "interleave" if left.can == right.can else "parallel"
+        if mode not in ("interleave", "parallel"):
+            raise ValueError(f"未知模式: {mode}，可选 auto / interleave / parallel")
+        self.left = left
+        self.right = right
+        self.mode = mode
+        self.timeout = timeout
+        self._skew = np.zeros(history)
+        self._count = 0
+        self._lock = threading.Lock()
+        self._captures = []
+        for api in (left, right):
+            capture = _CaptureBus(api.hand.bus)
+            api.hand.bus = capture
+            self._captures.append(capture)
+        self._senders: Optional[List[_ParallelSender]] = None
+        if mode == "parallel":
+            self._start_senders()
+
+    def _start_senders(self):
+        # 两个发送线程 + 调用线程共用一个屏障
+        self._barrier = threading.Barrier(3)
+        self._senders = [_ParallelSender(self._barrier, self.timeout), _ParallelSender(self._barrier, self.timeout)]
+        for sender in self._senders:
+            sender.start()
+
+    def _stop_senders(self):
+        if self._senders is not None:
+            for sender in self._senders:
+                sender.running = False
+                sender.ready.set()
+            self._barrier.abort()
+            self._senders = None
+
+    def _encode(self, api, capture: _CaptureBus, pose) -> List:
+        '''调用驱动的 set_joint_positions，只收集本线程要发出的帧'''
+        reflex = getattr(api, "_reflex", None)
+        if reflex is not None:
+            pose = reflex.filter_pose(pose)
+        frames = capture.capture(lambda: api.hand.set_joint_positions(pose))
+        api.last_position = pose
+        return frames
+
+    def move(self, left_pose, right_pose) -> float:
+        '''
+        双手同时下发一个姿态，返回本次双手对应帧之间的最大发送时间差 (秒)
+        发送失败时抛出总线异常 (如 can.CanError)，另一只手的帧可能已经发出
+        '''
+        left_pose = [int(v) for v in left_pose]
+        right_pose = [int(v) for v in right_pose]
+        with self._lock:
+            frames = tuple(self._encode(api, capture, pose) for api, capture, pose
+                           in zip((self.left, self.right), self._captures, (left_pose, right_pose)))
+            buses = tuple(capture._bus for capture in self._captures)
+            if self.mode == "interleave":
+                times = self._send_interleaved(buses, frames)
+            else:
+                times = self._send_parallel(buses, frames)
+            n = min(len(times[0]), len(times[1]))
+            skew = float(np.max(np.abs(np.subtract(times[0][:n], times[1][:n])))) if n else 0.0
+            self._skew[self._count % len(self._skew)] = skew
+            self._count += 1
+        return skew
+
+    @staticmethod
+    def _send_interleaved(buses, frames):
+        times = ([], [])
+        for i in range(max(len(frames[0]), len(frames[1]))):
+            for side in (0, 1):
+                if i < len(frames[side]):
+                    buses[side].send(frames[side][i])
+                    times[side].append(time.perf_counter())
+        return times
+
+    def _send_parallel(self, buses, frames):
+        if self._senders is None:
+            raise RuntimeError("BimanualController 已关闭")
+        for sender, bus, side_frames in zip(self._senders, buses, frames):
+            sender.bus = bus
+            sender.frames = side_frames
+            sender.ready.set()
+        try:
+            self._barrier.wait(self.timeout)   # 同时开始
+            self._barrier.wait(self.timeout)   # 双方发送完毕
+        except threading.BrokenBarrierError:
+            # 某个发送线程卡在总线上: 换一组线程和屏障，卡住的线程醒来后自行退出
+            self._stop_senders()
+            self._start_senders()
+            raise TimeoutError(f"双手并行发送超过 {self.timeout}s 未完成")
+        for sender in self._senders:
+            if sender.error is not None:
+                raise sender.error
+        return self._senders[0].times, self._senders[1].times
+
+    def skew_stats(self) -> Dict[str, float]:
+        '''最近 history 次 move() 的 skew 统计 (毫秒)'''
+        n = min(self._count, len(self._skew))
+        if n == 0:
+            return {"count": 0}
+        skew = self._skew[:n] * 1000
+        return {
+            "count": self._count,
+            "mean_ms": float(skew.mean()),
+            "p99_ms": float(np.percentile(skew, 99)),
+            "max_ms": float(skew.max()),
+        }
+
+    def close(self):
+        self._stop_senders()
+        for api, capture in zip((self.left, self.right), self._captures):
+            if api.hand.bus is capture:
+                api.hand.bus = capture._bus
+        self._captures = []
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+最新值优先的姿态命令槽
+
+远程/遥操作的姿态到达速度可能高于总线能下发的速度。LatestPoseSlot 只保留最新一条:
+put() 覆盖尚未下发的旧姿态 (计入 overwritten) 并立即返回，下发线程每次取出当时最新的姿态调用 apply。
+网络服务、UDP 遥操作等多个来源可以共用同一个槽。
+'''
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class LatestPoseSlot:
+    def __init__(self, apply: Callable[[List[int]], None], min_interval: float = 0.0):
+        '''apply: 下发函数 (例如 api.finger_move)；min_interval: 两次下发之间的最小间隔 (秒)'''
+        self.apply = apply
+        self.min_interval = min_interval
+        self.received = 0
+        self.applied = 0
+        self.overwritten = 0
+        self.errors = 0
+        self.last_latency: Optional[float] = None    # 最近一次 put -> apply 完成的时间 (秒)
+        self._pending: Optional[List[int]] = None
+        self._pending_time = 0.0
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="linker-hand-pose-slot", daemon=True)
+        self._thread.start()
+
+    def put(self, pose: List[int]):
+        with self._cond:
+            self.received += 1
+            if self._pending is not None:
+                self.overwritten += 1
+            self._pending = list(pose)
+            self._pending_time = time.perf_counter()
+            self._cond.notify()
+
+    def _run(self):
+        last = 0.0
+        while True:
+            with self._cond:
+                while self._pending is None and self._running:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                pose, queued, self._pending = self._pending, self._pending_time, None
+            try:
+                self.apply(pose)
+                self.applied += 1
+                self.last_latency = time.perf_counter() - queued
+            except Exception as e:
+                self.errors += 1
+                print(f"Pose command failed: {e}", flush=True)
+            if self.min_interval > 0:
+                delay = last + self.min_interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                last = time.perf_counter()
+
+    def stats(self) -> Dict[str, object]:
+        return {"received": self.received, "applied": self.applied, "overwritten": self.overwritten,
+                "errors": self.errors, "last_latency": self.last_latency}
+
+    def close(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+进程级配置服务
+
+setting.yaml 在整个进程中只解析一次(优先使用 libyaml 的 C 解析器)，
+解析结果以只读的 Setting 对象提供给 LinkerHandApi / OpenCan / InitLinkerHand 等。
+文件 mtime 变化时自动重新加载，并通知订阅者；新文件解析失败时保留上一份有效配置。
+进程内只应有一个配置服务实例: 统一把 utils 目录加入 sys.path 后以 "from config_service import ..." 导入。
+'''
+import os, copy, threading
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import yaml
+
+# 优先使用 C 版本解析器，未编译 libyaml 时回退到纯 Python 版本
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+DEFAULT_SETTING_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config", "setting.yaml")
+
+
+def load_yaml_file(path: str) -> Any:
+    '''使用最快可用的解析器读取 yaml 文件'''
+    with open(path, 'r', encoding='utf-8') as file:
+        return yaml.load(file, Loader=YamlLoader)
+
+
+@dataclass(frozen=True)
+class HandSetting:
+    '''单只手的配置 (LINKER_HAND.LEFT_HAND / RIGHT_HAND)'''
+    exists: bool = False
+    touch: bool = False
+    can: str = "can0"
+    modbus: str = "None"
+    joint: str = ""
+    names: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, d: Optional[Dict[str, Any]]) -> "HandSetting":
+        d = d or {}
+        return cls(
+            exists=bool(d.get("EXISTS", False)),
+            touch=bool(d.get("TOUCH", False)),
+            can=str(d.get("CAN", "can0")),
+            modbus=str(d.get("MODBUS", "None")),
+            joint=str(d.get("JOINT", "")),
+            names=tuple(d.get("NAME") or ()),
+        )
+
+
+@dataclass(frozen=True)
+class Setting:
+    '''setting.yaml 的只读视图'''
+    version: str
+    left_hand: HandSetting
+    right_hand: HandSetting
+    password: str
+    mtime: float = 0.0
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any], mtime: float = 0.0) -> "Setting":
+        hands = d.get("LINKER_HAND") or {}
+        return cls(
+            version=str(d.get("VERSION", "")),
+            left_hand=HandSetting.from_dict(hands.get("LEFT_HAND")),
+            right_hand=HandSetting.from_dict(hands.get("RIGHT_HAND")),
+            password=str(d.get("PASSWORD", "")),
+            mtime=mtime,
+            raw=d,
+        )
+
+    def hand(self, hand_type: str) -> HandSetting:
+        '''按 "left" / "right" 取单手配置'''
+        return self.left_hand if hand_type == "left" else self.right_hand
+
+    def to_dict(self) -> Dict[str, Any]:
+        '''返回原始字典的拷贝，兼容旧的 load_setting_yaml() 调用方'''
+        return copy.deepcopy(self.raw)
+
+
+class ConfigService:
+    '''
+    setting.yaml 缓存服务
+    - get(): 返回缓存的 Setting，只在文件 mtime 改变时重新解析
+    - subscribe(callback): 重新加载后回调 callback(setting)
+    - start_watch(interval): 后台线程轮询 mtime，实现热加载
+    '''
+    def __init__(self, path: str = DEFAULT_SETTING_PATH):
+        self.path = os.path.abspath(path)
+        self._lock = threading.RLock()
+        self._setting: Optional[Setting] = None
+        self._subscribers: List[Callable[[Setting], None]] = []
+        self._watch_thread = None
+        self._watch_event = threading.Event()
+
+    def _mtime(self) -> float:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return 0.0
+
+    def _load(self, mtime: float) -> Setting:
+        data = load_yaml_file(self.path) or {}
+        return Setting.from_dict(data, mtime=mtime)
+
+    def get(self) -> Setting:
+        '''获取当前配置，文件有修改时自动重新加载'''
+        self.reload_if_changed()
+        return self._setting
+
+    def reload_if_changed(self) -> bool:
+        '''
+        mtime 变化则重新加载并通知订阅者，返回是否发生了重新加载
+        文件正在被编辑器写入或内容有误时保留上一份有效配置并打印错误，等下一次 mtime 变化再试；
+        首次加载失败时没有可用的配置，异常照常抛出
+        '''
+        mtime = self._mtime()
+        with self._lock:
+            if self._setting is not None and self._setting.mtime == mtime:
+                return False
+            first = self._setting is None
+            try:
+                setting = self._load(mtime)
+            except Exception as e:
+                if first:
+                    raise
+                print(f"Error reloading {self.path}, keeping the previous setting: {e}", flush=True)
+                # 记下失败的 mtime，避免每次 get() 都重新解析同一个坏文件
+                self._setting = dataclasses.replace(self._setting, mtime=mtime)
+                return False
+            self._setting = setting
+            subscribers = list(self._subscribers)
+        if not first:
+            for callback in subscribers:
+                try:
+                    callback(setting)
+                except Exception as e:
+                    print(f"Config subscriber error: {e}", flush=True)
+        return True
+
+    def subscribe(self, callback: Callable[[Setting], None]):
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Setting], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def start_watch(self, interval: float = 1.0):
+        '''启动后台 mtime 轮询线程(守护线程)'''
+        with self._lock:
+            if self._watch_thread is not None and self._watch_thread.is_alive():
+                return
+            self._watch_event.clear()
+            self._watch_thread = threading.Thread(target=self._watch, args=(interval,), daemon=True)
+            self._watch_thread.start()
+
+    def stop_watch(self):
+        self._watch_event.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+            self._watch_thread = None
+
+    def _watch(self, interval: float):
+        while not self._watch_event.wait(interval):
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                print(f"Error reloading setting.yaml: {e}", flush=True)
+
+
+_service: Optional[ConfigService] = None
+_service_lock = threading.Lock()
+
+
+def get_config_service() -> ConfigService:
+    '''进程内唯一的 setting.yaml 配置服务'''
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ConfigService()
+    return _service
+
+
+def get_setting() -> Setting:
+    return get_config_service().get()
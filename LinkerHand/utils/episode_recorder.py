@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+HDF5 示教数据记录
+
+EpisodeRecorder 挂到一只或多只手上，记录每只手的:
+  command  下发的关节目标 (包装驱动的 set_joint_positions，finger_move / 轨迹 / 手势 / 远程命令都会经过)
+  state    解码出的关节状态 (state 事件)
+  force    法向力/切向力/方向/接近感应 (force 事件，仅 CAN)
+  tactile  单指矩阵压感 (tactile_frame 事件，另记手指序号)
+回调只把样本拷进预分配的块 (chunk 行)，块写满后交给后台线程写入 HDF5，回调本身不做任何 I/O。
+文件结构: /episode_000/<手名>/<流>/{data, time[, finger]}，time 为 time.time()，数据集按块分块并压缩。
+回调不发送任何帧；poll_hz / force_hz / tactile_hz 可让记录器自己按频率调用 get_state / get_force / get_matrix_touch_v2。
+三种查询各用一个线程: get_force (4 种力帧，驱动帧间 sleep 约 16~40 ms) 与矩阵压感较慢，不能拖慢状态查询。
+force_hz 默认 FORCE_HZ (仅 CAN，且需 poll_hz > 0)。
+
+    rec = EpisodeRecorder("demo.h5")
+    rec.add_hand(left, "left", poll_hz=100, tactile_hz=20)
+    rec.start(task="pick")
+    ...
+    rec.stop()
+    rec.close()
+'''
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+import h5py
+import numpy as np
+
+FORCE_HZ = 10.0
+_DTYPES = {"command": np.uint8, "state": np.float32, "force": np.float32, "tactile": np.uint8}
+
+
+class _Stream:
+    def __init__(self, recorder: "EpisodeRecorder", hand: str, name: str):
+        self.recorder = recorder
+        self.path = f"{hand}/{name}"
+        self.dtype = _DTYPES[name]
+        self.shape = None
+        self.with_finger = name == "tactile"
+        self.count = 0
+        self._lock = threading.Lock()
+        self._chunk = None
+
+    def _new_chunk(self):
+        size = self.recorder.chunk
+        with self.recorder._free_lock:
+            free = self.recorder._free.get(self.path)
+            if free:
+                return free.pop()
+        return (np.zeros((size,) + self.shape, dtype=self.dtype), np.zeros(size), np.zeros(size, dtype=np.uint8), [0])
+
+    def append(self, values, finger: int = 0):
+        if not self.recorder.recording:
+            return
+        now = time.time()
+        values = np.asarray(values)
+        with self._lock:
+            if self.shape is None:
+                self.shape = values.shape
+            elif values.shape != self.shape:
+                self.recorder.dropped += 1
+                return
+            if self._chunk is None:
+                self._chunk = self._new_chunk()
+            data, times, fingers, fill = self._chunk
+            i = fill[0]
+            data[i] = values
+            times[i] = now
+            fingers[i] = finger
+            fill[0] = i + 1
+            self.count += 1
+            if fill[0] == len(times):
+                self.recorder._submit(self, self._chunk)
+                self._chunk = None
+
+    def flush(self):
+        with self._lock:
+            if self._chunk is not None and self._chunk[3][0]:
+                self.recorder._submit(self, self._chunk)
+            self._chunk = None
+
+
+class _Hand:
+    def __init__(self, recorder: "EpisodeRecorder", api, name: str, poll_hz: float, force_hz: float, tactile_hz: float):
+        self.api = api
+        self.name = name
+        self.streams = {s: _Stream(recorder, name, s) for s in _DTYPES}
+        self._callbacks = {
+            "state": lambda state: self.streams["state"].append(state),
+            "force": lambda values: self.streams["force"].append(values),
+            "tactile_frame": lambda finger, matrix: self.streams["tactile"].append(matrix, finger),
+        }
+        hub = api._event_hub()
+        for event, callback in self._callbacks.items():
+            hub.subscribe(event, callback)
+        # 命令: 实例属性覆盖驱动的 set_joint_positions
+        driver = api.hand
+        self._set_joint_positions = driver.set_joint_positions
+        command = self.streams["command"]
+
+        def set_joint_positions(pose, *args, **kwargs):
+            command.append(np.clip(pose, 0, 255))
+            return self._set_joint_positions(pose, *args, **kwargs)
+        driver.set_joint_positions = set_joint_positions
+        self._running = True
+        self._threads = []
+        for stream, query, hz in (("state", api.get_state, poll_hz), ("force", api.get_force, force_hz),
+                                  ("tactile", api.get_matrix_touch_v2, tactile_hz)):
+            if hz > 0:
+                thread = threading.Thread(target=self._poll, args=(recorder, query, hz),
+                                          name=f"linker-hand-recorder-{name}-{stream}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _poll(self, recorder, query, hz: float):
+        next_tick = time.perf_counter()
+        while self._running:
+            if recorder.recording:
+                try:
+                    query()
+                except Exception as e:
+                    print(f"Recorder poll error: {e}", flush=True)
+            next_tick += 1.0 / hz
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+    def detach(self):
+        self._running = False
+        for thread in self._threads:
+            thread.join()
+        hub = self.api._event_hub()
+        for event, callback in self._callbacks.items():
+            hub.unsubscribe(event, callback)
+        self.api.hand.set_joint_positions = self._set_joint_positions
+
+
+class EpisodeRecorder:
+    def __init__(self, path: str, chunk: int = 256, compression: Optional[str] = "lzf", max_pending: int = 256):
+        '''
+        chunk: 每块样本数 (也是 HDF5 分块大小)；compression: "lzf" (快) / "gzip" / None
+        max_pending: 等待写入的块数上限，超过时丢弃新块并计入 dropped (磁盘跟不上时保护内存)
+        '''
+        self.path = path
+        self.chunk = chunk
+        self.compression = compression
+        self.max_pending = max_pending
+        self.recording = False
+        self.episode: Optional[str] = None
+        self.dropped = 0
+        self.hands: Dict[str, _Hand] = {}
+        self._file = h5py.File(path, "a")
+        self._episodes = sum(1 for k in self._file if k.startswith("episode_"))
+        self._queue: "queue.Queue" = queue.Queue()
+        self._free: Dict[str, List] = {}
+        self._free_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="linker-hand-recorder-writer", daemon=True)
+        self._writer.start()
+
+    def add_hand(self, api, name: str, poll_hz: float = 0.0, tactile_hz: float = 0.0, force_hz: Optional[float] = None):
+        '''
+        poll_hz / force_hz / tactile_hz: 记录期间由记录器按该频率查询状态/力/矩阵压感 (0 表示只记录别处触发的数据)
+        force_hz 为 None 时 CAN 手在 poll_hz > 0 时取 FORCE_HZ，RS485 手没有力数据，固定为 0
+        '''
+        if name in self.hands:
+            raise ValueError(f"重复的手: {name}")
+        if getattr(api, "modbus", "None") != "None":
+            force_hz = 0.0
+        elif force_hz is None:
+            force_hz = FORCE_HZ if poll_hz > 0 else 0.0
+        self.hands[name] = _Hand(self, api, name, poll_hz, force_hz, tactile_hz)
+
+    def start(self, name: Optional[str] = None, **attrs) -> str:
+        '''开始一个 episode，attrs 写入该组的属性 (任务名、操作者等)'''
+        if self.recording:
+            self.stop()
+        if name is None:
+            name = f"episode_{self._episodes:03d}"
+            self._episodes += 1
+        self._queue.put(("start", name, dict(attrs, start_time=time.time())))
+        self.episode = name
+        self.recording = True
+        return name
+
+    def stop(self):
+        '''结束当前 episode: 写入未满的块并等待写完'''
+        if not self.recording:
+            return
+        self.recording = False
+        for hand in self.hands.values():
+            for stream in hand.streams.values():
+                stream.flush()
+        self._queue.put(("stop", self.episode, {"stop_time": time.time()}))
+        self._queue.join()
+
+    def _submit(self, stream: _Stream, chunk):
+        if self._queue.qsize() >= self.max_pending:
+            self.dropped += chunk[3][0]
+            self._release(stream, chunk)
+            return
+        self._queue.put(("chunk", stream, chunk))
+
+    def _release(self, stream: _Stream, chunk):
+        chunk[3][0] = 0
+        with self._free_lock:
+            self._free.setdefault(stream.path, []).append(chunk)
+
+    def _write_loop(self):
+        group = None
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                kind, target, payload = item
+                if kind == "start":
+                    group = self._file.require_group(target)
+                    group.attrs.update(payload)
+                elif kind == "stop":
+                    if group is not None:
+                        group.attrs.update(payload)
+                    self._file.flush()
+                    group = None
+                else:
+                    if group is not None:
+                        self._write_chunk(group, target, payload)
+                    self._release(target, payload)
+            except Exception as e:
+                print(f"Recorder write error: {e}", flush=True)
+            finally:
+                self._queue.task_done()
+
+    def _write_chunk(self, group, stream: _Stream, chunk):
+        data, times, fingers, fill = chunk
+        n = fill[0]
+        node = group.require_group(stream.path)
+        columns = [("data", data), ("time", times)] + ([("finger", fingers)] if stream.with_finger else [])
+        for key, array in columns:
+            if key not in node:
+                node.create_dataset(key, shape=(0,) + array.shape[1:], maxshape=(None,) + array.shape[1:],
+                                    dtype=array.dtype, chunks=(self.chunk,) + array.shape[1:],
+                                    compression=self.compression)
+            dataset = node[key]
+            start = dataset.shape[0]
+            dataset.resize(start + n, axis=0)
+            dataset[start:] = array[:n]
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "episode": self.episode,
+            "pending": self._queue.qsize(),
+            "dropped": self.dropped,
+            "samples": {f"{h}/{s}": stream.count for h, hand in self.hands.items() for s, stream in hand.streams.items()},
+        }
+
+    def close(self):
+        self.stop()
+        for hand in self.hands.values():
+            hand.detach()
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
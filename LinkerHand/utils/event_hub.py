@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+数据事件订阅
+
+驱动在接收/解码路径上 emit(事件, 数据...)，订阅者的回调随即被调用，无需轮询 getter。
+事件: state (关节状态) / tactile_frame (单指矩阵压感) / fault (故障码变化) / temperature (温度) /
+      speed (速度) / torque (扭矩) / force (法向力、切向力、方向、接近感应拼接)
+回调默认在接收线程中同步执行，必须足够快；use_pool=True 的回调投递到线程池执行，
+慢回调不会阻塞解码 (同一回调的多次调用之间不保证顺序)。
+'''
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+EVENTS = ("state", "tactile_frame", "fault", "temperature", "speed", "torque", "force")
+
+
+class EventHub:
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._subscribers: Dict[str, List[Tuple[Callable, bool]]] = {e: [] for e in EVENTS}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def subscribe(self, event: str, callback: Callable, use_pool: bool = False) -> Callable:
+        if event not in self._subscribers:
+            raise ValueError(f"未知事件: {event}，可选 {EVENTS}")
+        with self._lock:
+            if use_pool and self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="linker-hand-cb")
+            # 订阅列表整体替换，emit 无需加锁即可遍历
+            self._subscribers[event] = self._subscribers[event] + [(callback, use_pool)]
+        return callback
+
+    def unsubscribe(self, event: str, callback: Callable):
+        with self._lock:
+            self._subscribers[event] = [s for s in self._subscribers[event] if s[0] is not callback]
+
+    def has_subscribers(self, event: str) -> bool:
+        return bool(self._subscribers.get(event))
+
+    def emit(self, event: str, *args):
+        for callback, use_pool in self._subscribers[event]:
+            if use_pool:
+                pool = self._pool
+                if pool is None:
+                    # 已 close()，丢弃线程池回调
+                    continue
+                try:
+                    pool.submit(self._call, event, callback, args)
+                except RuntimeError:
+                    continue
+            else:
+                self._call(event, callback, args)
+
+    @staticmethod
+    def _call(event: str, callback: Callable, args):
+        try:
+            callback(*args)
+        except Exception as e:
+            # 回调异常不能影响接收线程
+            print(f"{event} callback error: {e}", flush=True)
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+            for event in self._subscribers:
+                self._subscribers[event] = []
+        if pool is not None:
+            pool.shutdown(wait=False)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+手势序列
+
+把动作库中的动作列表编译成定时调度表: 每一步先用 blend 秒 (min-jerk) 过渡到该动作，再保持到 duration 结束。
+整个周期预先生成为一个数组 (行间隔 1/rate 秒)，专用的定时线程按绝对时钟取行:
+行号 = (当前时刻 - 起点) * rate，而不是累加 sleep，因此循环运行数小时也不会漂移。
+play / pause / seek / loop 控制由 GUI 和脚本共用；on_step(index, name) 在进入新的一步时于定时线程中回调。
+'''
+import os, sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from trajectory import plan
+
+
+@dataclass(frozen=True)
+class GestureStep:
+    name: str
+    pose: tuple
+    duration: float = 1.0   # 本步总时长 (秒)，含过渡
+    blend: float = 0.3      # 从上一步过渡到本步的时间 (秒)
+
+
+def steps_from_library(hand_joint: str, hand_type: str, names: Optional[Sequence[str]] = None,
+                       duration: float = 1.0, blend: float = 0.3) -> List[GestureStep]:
+    '''names 为空时取该型号/左右手的全部动作，按动作库顺序'''
+    from action_library import get_action_library
+    library = get_action_library()
+    names = list(names) if names else library.names(hand_joint, hand_type)
+    steps = []
+    for name in names:
+        pose = library.get(hand_joint, hand_type, name)
+        if pose is None:
+            raise ValueError(f"动作库中没有 {hand_type} {hand_joint} 的动作: {name}")
+        steps.append(GestureStep(name, tuple(int(v) for v in pose if v >= 0), duration, blend))
+    return steps
+
+
+class GestureSequencer:
+    def __init__(self, send: Callable[[List[int]], None], steps: Sequence[GestureStep], rate: float = 100.0,
+                 loop: bool = True, on_step: Optional[Callable[[int, str], None]] = None):
+        if not steps:
+            raise ValueError("手势序列为空")
+        self.send = send
+        self.steps = list(steps)
+        self.rate = rate
+        self.loop = loop
+        self.on_step = on_step
+        self.schedule, self.step_rows = self._compile(self.steps)
+        self.cycles = 0
+        self.overruns = 0
+        self._origin = 0.0          # 第 0 行对应的 perf_counter 时刻
+        self._paused_row = 0
+        self._step = -1
+        self._last: Optional[np.ndarray] = None
+        self._state_lock = threading.Lock()
+        self._playing = threading.Event()
+        self._finished = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="linker-hand-sequencer", daemon=True)
+        self._thread.start()
+
+    def _compile(self, steps: List[GestureStep]):
+        '''周期从最后一步的姿态开始，首尾衔接'''
+        waypoints, durations = [], []
+        for step in steps:
+            if step.duration <= 0 or not 0 < step.blend <= step.duration:
+                raise ValueError(f"{step.name}: 需要 0 < blend <= duration")
+            waypoints.append(step.pose)
+            durations.append(step.blend)
+            if step.duration > step.blend:
+                waypoints.append(step.pose)
+                durations.append(step.duration - step.blend)
+        schedule = np.rint(plan(waypoints, durations, rate=self.rate, start=steps[-1].pose)).astype(np.int16)
+        step_rows = np.rint(np.cumsum([0.0] + [s.duration for s in steps[:-1]]) * self.rate).astype(int)
+        return schedule, step_rows
+
+    # ----------------------------------------------------------
+    # 控制
+    # ----------------------------------------------------------
+    def play(self):
+        with self._state_lock:
+            if self._playing.is_set():
+                return
+            self._origin = time.perf_counter() - self._paused_row / self.rate
+            self._finished.clear()
+            self._playing.set()
+
+    def pause(self):
+        with self._state_lock:
+            if self._playing.is_set():
+                self._paused_row = self._row(time.perf_counter())
+                self._playing.clear()
+
+    def stop(self):
+        '''停止并回到第一步'''
+        self.pause()
+        self.seek(0)
+        self._finished.set()
+
+    def seek(self, step: int = 0, offset: float = 0.0):
+        '''跳到第 step 步 (offset 秒后)；播放中立即生效'''
+        row = int(self.step_rows[step % len(self.steps)] + offset * self.rate)
+        with self._state_lock:
+            self._paused_row = row
+            self._origin = time.perf_counter() - row / self.rate
+            self._step = -1
+
+    def set_loop(self, loop: bool):
+        self.loop = loop
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        '''非循环模式下等待播放结束'''
+        return self._finished.wait(timeout)
+
+    @property
+    def playing(self) -> bool:
+        return self._playing.is_set()
+
+    @property
+    def current_step(self) -> int:
+        return self._step
+
+    @property
+    def period(self) -> float:
+        return len(self.schedule) / self.rate
+
+    def close(self):
+        self._running = False
+        self._playing.set()
+        self._thread.join()
+
+    # ----------------------------------------------------------
+    # 定时线程
+    # ----------------------------------------------------------
+    def _row(self, now: float) -> int:
+        return int((now - self._origin) * self.rate)
+
+    def _loop(self):
+        tick = 1.0 / self.rate
+        while self._running:
+            if not self._playing.wait(0.1):
+                continue
+            now = time.perf_counter()
+            with self._state_lock:
+                if not self._playing.is_set():
+                    continue
+                row = self._row(now)
+                n = len(self.schedule)
+                if row >= n:
+                    if not self.loop:
+                        self._paused_row = 0
+                        self._playing.clear()
+                        self._step = -1
+                        self._finished.set()
+                        continue
+                    # 起点整周期前移，行号始终由绝对时钟计算
+                    cycles = row // n
+                    self._origin += cycles * n / self.rate
+                    self.cycles += cycles
+                    row -= cycles * n
+                step = int(np.searchsorted(self.step_rows, row, side="right")) - 1
+                changed = step != self._step
+                self._step = step
+                origin = self._origin
+            pose = self.schedule[row]
+            if self._last is None or not np.array_equal(pose, self._last):
+                # 保持阶段姿态不变，不重复下发
+                self.send(pose.tolist())
+                self._last = pose
+            if changed and self.on_step is not None:
+                self.on_step(step, self.steps[step].name)
+            delay = origin + (row + 1) / self.rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -tick:
+                self.overruns += 1
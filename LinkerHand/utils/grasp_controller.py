@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+闭环触觉抓取
+
+每根手指沿协同曲线 (张开姿态 -> 握紧姿态，进度 0~1) 闭合，固定频率的控制线程按压感/法向力推进各指状态机:
+  approach: 以 close_speed (进度/秒) 闭合
+  regulate: 压力超过 contact 后停止闭合，按 gain 把压力调节到 target
+  missed:   闭合到底仍未接触
+  released: release() 之后回到张开姿态
+传感数据不在控制循环里阻塞等待: CAN 每个周期只发出查询帧 (sleep=0)，应答由接收线程解码，
+矩阵压感通过 tactile_frame 事件到达；RS485 每个周期只读一根手指的矩阵 (RS485 型号无法向力)。
+支持 L6/O6/L7/L10 (CAN/RS485)。
+'''
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+from core.can.can_reflex import FINGER_JOINTS
+
+FINGER_NAMES = ("thumb", "index", "middle", "ring", "little")
+# 默认协同: 张开 -> 握紧 (L10 取自 example/L10/grab/dynamic_grasping.py 的抓握姿态)
+DEFAULT_SYNERGY = {
+    "L6": ([255, 70, 255, 255, 255, 255], [60, 70, 25, 25, 25, 25]),
+    "O6": ([255, 70, 255, 255, 255, 255], [60, 70, 25, 25, 25, 25]),
+    "L7": ([255, 70, 255, 255, 255, 255, 120], [60, 70, 25, 25, 25, 25, 58]),
+    "L10": ([255, 70, 255, 255, 255, 255, 255, 255, 255, 120], [60, 60, 25, 25, 25, 25, 255, 255, 255, 58]),
+}
+
+
+class GraspController:
+    def __init__(self, api, synergy=None, sensor: str = "matrix", rate: float = 100.0,
+                 contact: float = 30.0, target: float = 80.0, close_speed: float = 0.5,
+                 gain: float = 0.005, fingers: Optional[List[int]] = None):
+        '''
+        api: LinkerHandApi；synergy: (张开姿态, 握紧姿态)，默认按型号取 DEFAULT_SYNERGY
+        sensor: "matrix" 矩阵压感单点最大值 / "force" 法向力
+        contact / target: 接触阈值与目标压力；gain: 每单位压力误差每秒的进度修正量
+        '''
+        self.api = api
+        self.model = api.hand_joint.upper()
+        if self.model not in FINGER_JOINTS:
+            raise ValueError(f"{api.hand_joint} 暂不支持闭环抓取")
+        if sensor not in ("matrix", "force"):
+            raise ValueError(f"未知传感器: {sensor}，可选 matrix / force")
+        if sensor == "force" and api.modbus != "None":
+            raise ValueError("RS485 型号没有法向力数据，请使用 sensor=\"matrix\"")
+        self.sensor = sensor
+        self.fingers = FINGER_JOINTS[self.model]
+        open_pose, close_pose = synergy or DEFAULT_SYNERGY[self.model]
+        self.open_pose = np.asarray(open_pose, dtype=float)
+        self.close_pose = np.asarray(close_pose, dtype=float)
+        if self.open_pose.shape != self.close_pose.shape or len(self.open_pose) != sum(len(j) for j in self.fingers):
+            raise ValueError("协同姿态长度与关节数不一致")
+        self.period = 1.0 / rate
+        self.contact = contact
+        self.target = target
+        self.close_speed = close_speed
+        self.gain = gain
+        self.enabled = np.zeros(5, dtype=bool)
+        self.enabled[list(range(5)) if fingers is None else fingers] = True
+        self.progress = np.zeros(5)
+        self.pressure = np.zeros(5)
+        self.state = ["idle"] * 5
+        self.can = api.modbus == "None"
+        self._next_finger = 0
+        self._tactile_cb = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.overruns = 0
+
+    # ----------------------------------------------------------
+    # 控制
+    # ----------------------------------------------------------
+    def grasp(self) -> "GraspController":
+        self.stop()
+        self.progress[:] = 0.0
+        self.pressure[:] = 0.0
+        self.state = ["approach" if self.enabled[f] else "idle" for f in range(5)]
+        if self.sensor == "matrix" and self._tactile_cb is None:
+            self._tactile_cb = self.api.on_tactile_frame(self._on_tactile)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="linker-hand-grasp", daemon=True)
+        self._thread.start()
+        return self
+
+    def release(self):
+        self.stop()
+        self.progress[:] = 0.0
+        self.state = ["released"] * 5
+        self.api.finger_move(pose=self._pose())
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        if self._tactile_cb is not None:
+            self.api.remove_callback("tactile_frame", self._tactile_cb)
+            self._tactile_cb = None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        '''等待所有手指接触或闭合到底，返回是否全部接触'''
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while any(s == "approach" for s in self.state):
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            time.sleep(self.period)
+        return all(self.state[f] == "regulate" for f in range(5) if self.enabled[f])
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "state": dict(zip(FINGER_NAMES, self.state)),
+            "progress": [round(float(p), 3) for p in self.progress],
+            "pressure": [float(p) for p in self.pressure],
+            "overruns": self.overruns,
+        }
+
+    # ----------------------------------------------------------
+    # 控制循环
+    # ----------------------------------------------------------
+    def _loop(self):
+        next_tick = time.perf_counter()
+        last = next_tick
+        while not self._stop.is_set():
+            now = time.perf_counter()
+            self._request()
+            self._step(now - last)
+            last = now
+            self.api.finger_move(pose=self._pose())
+            next_tick += self.period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                # 超时不补跑，从当前时刻重新对齐
+                self.overruns += 1
+                next_tick = time.perf_counter()
+
+    def _step(self, dt: float):
+        if self.sensor == "force":
+            self._read_force()
+        for f in range(5):
+            state = self.state[f]
+            if state == "approach":
+                if self.pressure[f] >= self.contact:
+                    self.state[f] = "regulate"
+                elif self.progress[f] >= 1.0:
+                    self.state[f] = "missed"
+                else:
+                    self.progress[f] = min(1.0, self.progress[f] + self.close_speed * dt)
+            elif state == "regulate":
+                error = self.target - self.pressure[f]
+                self.progress[f] = float(np.clip(self.progress[f] + self.gain * error * dt, 0.0, 1.0))
+
+    def _pose(self) -> List[int]:
+        weight = np.empty(len(self.open_pose))
+        for f, joints in enumerate(self.fingers):
+            weight[joints] = self.progress[f]
+        pose = self.open_pose + weight * (self.close_pose - self.open_pose)
+        return [int(v) for v in np.clip(np.rint(pose), 0, 255)]
+
+    # ----------------------------------------------------------
+    # 传感
+    # ----------------------------------------------------------
+    def _active_fingers(self) -> List[int]:
+        return [f for f in range(5) if self.state[f] in ("approach", "regulate")]
+
+    def _request(self):
+        '''发出本周期的传感查询，不等待应答'''
+        fingers = self._active_fingers()
+        if not fingers:
+            return
+        hand = self.api.hand
+        if self.sensor == "force":
+            if self.can:
+                hand.send_frame(0x20, [], sleep=0)
+            return
+        if self.can:
+            # O6 的矩阵尺寸不同，查询码 0xA4，见驱动的 touch_code
+            touch_code = getattr(hand, "touch_code", 0xC6)
+            for f in fingers:
+                hand.send_frame(0xB1 + f, [touch_code], sleep=0)
+        else:
+            # RS485 一次事务读一根手指，轮流读取
+            f = fingers[self._next_finger % len(fingers)]
+            self._next_finger += 1
+            getattr(hand, f"get_{FINGER_NAMES[f]}_matrix_touch")()
+
+    def _read_force(self):
+        force = self.api.hand.get_force()[0]
+        if force and len(force) >= 5 and force[0] != -1:
+            self.pressure[:] = np.asarray(force[:5], dtype=float)
+
+    def _on_tactile(self, finger: int, matrix):
+        self.pressure[finger] = float(np.max(matrix))
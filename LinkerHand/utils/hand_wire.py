@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+状态/姿态的紧凑二进制消息 (网络服务与 UDP 遥操作共用)
+
+每条消息 20 字节头 + 负载，小端:
+    uint8   kind      1 状态 / 2 矩阵压感 / 3 姿态命令
+    uint8   version   1
+    uint16  count     状态/姿态: 关节数；压感: 手指数 (5)
+    uint64  seq       发送方递增序号
+    float64 stamp     发送方 time.time()
+负载:
+    状态  float32[count]
+    压感  uint8 rows, uint8 cols, uint8[count, rows, cols] (超过 255 截断)
+    姿态  uint8[count]，0~255
+L10 的状态消息 60 字节、姿态消息 30 字节，同样内容的 JSON 约为其 5~10 倍。
+'''
+import struct
+import time
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+KIND_STATE, KIND_TACTILE, KIND_POSE = 1, 2, 3
+VERSION = 1
+HEADER = struct.Struct("<BBHQd")
+_MAX_COUNT = 64
+
+
+class Message(NamedTuple):
+    kind: int
+    seq: int
+    stamp: float
+    values: object     # 状态/姿态: List；压感: ndarray (count, rows, cols)
+
+
+def _header(kind: int, count: int, seq: int, stamp: Optional[float]) -> bytes:
+    return HEADER.pack(kind, VERSION, count, seq, time.time() if stamp is None else stamp)
+
+
+def encode_state(state: Sequence[float], seq: int, stamp: Optional[float] = None) -> bytes:
+    return _header(KIND_STATE, len(state), seq, stamp) + np.asarray(state, dtype="<f4").tobytes()
+
+
+def encode_tactile(matrices: Sequence[np.ndarray], seq: int, stamp: Optional[float] = None) -> bytes:
+    data = np.clip(np.stack([np.asarray(m) for m in matrices]), 0, 255).astype(np.uint8)
+    _, rows, cols = data.shape
+    return _header(KIND_TACTILE, len(data), seq, stamp) + bytes((rows, cols)) + data.tobytes()
+
+
+def encode_pose(pose: Sequence[int], seq: int, stamp: Optional[float] = None) -> bytes:
+    return _header(KIND_POSE, len(pose), seq, stamp) + np.clip(np.asarray(pose), 0, 255).astype(np.uint8).tobytes()
+
+
+def decode(data: bytes) -> Message:
+    '''格式不符时抛 ValueError'''
+    if len(data) < HEADER.size:
+        raise ValueError("消息长度不足")
+    kind, version, count, seq, stamp = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"不支持的消息版本 {version}")
+    if count > _MAX_COUNT:
+        raise ValueError(f"数据个数过多: {count}")
+    payload = memoryview(data)[HEADER.size:]
+    if kind == KIND_POSE:
+        if len(payload) != count:
+            raise ValueError("姿态长度与头部不符")
+        values: object = list(payload)
+    elif kind == KIND_STATE:
+        if len(payload) != 4 * count:
+            raise ValueError("状态长度与头部不符")
+        values = np.frombuffer(payload, dtype="<f4").tolist()
+    elif kind == KIND_TACTILE:
+        if len(payload) < 2 or len(payload) != 2 + count * payload[0] * payload[1]:
+            raise ValueError("压感长度与头部不符")
+        values = np.frombuffer(payload[2:], dtype=np.uint8).reshape(count, payload[0], payload[1])
+    else:
+        raise ValueError(f"未知消息类型 {kind}")
+    return Message(kind, seq, stamp, values)
+
+
+def decode_pose(data: bytes) -> Message:
+    message = decode(data)
+    if message.kind != KIND_POSE:
+        raise ValueError("不是姿态消息")
+    return message
@@ -9,12 +9,11 @@ symbol_custom_string_obkorol_copyright:
 '''
 import yaml, os, sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from load_write_yaml import LoadWriteYaml
+from config_service import get_config_service
 
 class InitLinkerHand():
     def __init__(self):
-        self.yaml = LoadWriteYaml()
-        self.setting = self.yaml.load_setting_yaml()
+        self.setting = get_config_service().get().to_dict()
 
     def current_hand(self):
         '''
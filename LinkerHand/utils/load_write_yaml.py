@@ -10,6 +10,10 @@ Description:
 symbol_custom_string_obkorol_copyright: 
 '''
 import yaml, os, sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from config_service import get_config_service
+from action_library import get_action_library
+
 class LoadWriteYaml():
     def __init__(self):
         # 由于是API形式，这里要给配置文件目录绝对路径
@@ -25,18 +29,19 @@ class LoadWriteYaml():
 
     def load_setting_yaml(self):
         try:
-            with open(self.setting_path, 'r', encoding='utf-8') as file:
-                setting = yaml.safe_load(file)
-                self.sdk_version = setting["VERSION"]
-                self.left_hand_exists = setting['LINKER_HAND']['LEFT_HAND']['EXISTS']
-                self.left_hand_names = setting['LINKER_HAND']['LEFT_HAND']['NAME']
-                self.left_hand_joint = setting['LINKER_HAND']['LEFT_HAND']['JOINT']
-                self.left_hand_force = setting['LINKER_HAND']['LEFT_HAND']['TOUCH']
-                self.right_hand_exists = setting['LINKER_HAND']['RIGHT_HAND']['EXISTS']
-                self.right_hand_names = setting['LINKER_HAND']['RIGHT_HAND']['NAME']
-                self.right_hand_joint = setting['LINKER_HAND']['RIGHT_HAND']['JOINT']
-                self.right_hand_force = setting['LINKER_HAND']['RIGHT_HAND']['TOUCH']
-                self.password = setting['PASSWORD']
+            # 由进程级配置服务统一解析并缓存，这里只取只读视图
+            cfg = get_config_service().get()
+            setting = cfg.to_dict()
+            self.sdk_version = cfg.version
+            self.left_hand_exists = cfg.left_hand.exists
+            self.left_hand_names = list(cfg.left_hand.names)
+            self.left_hand_joint = cfg.left_hand.joint
+            self.left_hand_force = cfg.left_hand.touch
+            self.right_hand_exists = cfg.right_hand.exists
+            self.right_hand_names = list(cfg.right_hand.names)
+            self.right_hand_joint = cfg.right_hand.joint
+            self.right_hand_force = cfg.right_hand.touch
+            self.password = cfg.password
         except Exception as e:
             setting = None
             print(f"Error reading setting.yaml: {e}")
@@ -44,58 +49,20 @@ class LoadWriteYaml():
         return self.setting
     
     def load_action_yaml(self,hand_joint="",hand_type=""):
-        if hand_joint == "L20":
-            action_path = self.l20_positions
-        elif hand_joint == "L10":
-            action_path = self.l10_positions
-        elif hand_joint == "L25":
-            action_path = self.l25_positions
-        elif hand_joint == "L21":
-            action_path = self.l21_positions
-        elif hand_joint == "L7":
-            action_path = self.l7_positions
-            print(action_path)
+        # 动作库在进程内只加载一次，之后的查询直接走内存索引；与旧实现一致，非 "left" 一律取右手动作
         try:
-            with open(action_path, 'r', encoding='utf-8') as file:
-                yaml_data = yaml.safe_load(file)
-                if hand_type == "left":
-                    self.action_yaml = yaml_data["LEFT_HAND"]
-                else:
-                    self.action_yaml = yaml_data["RIGHT_HAND"]
+            side = "left" if hand_type == "left" else "right"
+            self.action_yaml = get_action_library().actions(hand_joint=hand_joint, hand_type=side)
         except Exception as e:
             self.action_yaml = None
             print(f"yaml配置文件不存在: {e}")
         return self.action_yaml 
 
     def write_to_yaml(self, action_name, action_pos,hand_joint="",hand_type=""):
-        a = False
-        if hand_joint == "L20":
-            action_path = self.l20_positions
-        elif hand_joint == "L10":
-            action_path = self.l10_positions
-        elif hand_joint == "L7":
-            action_path = self.l7_positions
-        elif hand_joint == "L21":
-            action_path = self.l21_positions
-        elif hand_joint == "L25":
-            action_path = self.l25_positions
+        # 追加写入 journal，由动作库在后台合并回 yaml
         try:
-            with open(action_path, 'r', encoding='utf-8') as file:
-                yaml_data = yaml.safe_load(file)
-                print(yaml_data)
-            if hand_type == "left":
-                if yaml_data["LEFT_HAND"] == None:
-                    yaml_data["LEFT_HAND"] = []
-                yaml_data["LEFT_HAND"].append({"ACTION_NAME": action_name, "POSITION": action_pos})
-            elif hand_type == "right":
-                if yaml_data["RIGHT_HAND"] == None:
-                    yaml_data["RIGHT_HAND"] = []
-                yaml_data["RIGHT_HAND"].append({"ACTION_NAME": action_name, "POSITION": action_pos})
-            with open(action_path, 'w', encoding='utf-8') as file:
-                yaml.safe_dump(yaml_data, file, allow_unicode=True)
-            a = True
+            a = get_action_library().add(hand_joint=hand_joint, hand_type=hand_type, name=action_name, position=action_pos)
         except Exception as e:
             a = False
             print(f"Error writing to yaml file: {e}")
         return a
-        
\ No newline at end of file
@@ -12,15 +12,15 @@ symbol_custom_string_obkorol_copyright:
 import sys,os,time,subprocess
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from color_msg import ColorMsg
-from load_write_yaml import LoadWriteYaml
+from config_service import get_config_service
 # from ament_index_python.packages import get_package_share_directory
 import os
 
 
 class OpenCan:
     def __init__(self,load_yaml=None):
-        self.yaml = LoadWriteYaml()
-        self.password = self.yaml.load_setting_yaml()["PASSWORD"]
+        # 共享进程级配置，避免每个 CAN 驱动重复解析 setting.yaml
+        self.password = get_config_service().get().password
 
     def open_can0(self):
         try:
@@ -50,16 +50,20 @@ class OpenCan:
         try:
             # 检查 can0 接口是否已存在并处于 up 状态
             result = subprocess.run(
-                ["ip", "link", "show", can],
+                ["ip", "-details", "link", "show", can],
                 check=True,
                 text=True,
                 capture_output=True
             )
-            if "state UP" in result.stdout:
+            if "state UP" in result.stdout or self._flags_up(result.stdout):
                 return 
-            # 如果没有处于 UP 状态，则配置接口
+            # 如果没有处于 UP 状态，则配置接口；vcan 没有波特率，只需 up
+            if self._is_vcan(can, result.stdout):
+                cmd = ["sudo", "-S", "ip", "link", "set", can, "up"]
+            else:
+                cmd = ["sudo", "-S", "ip", "link", "set", can, "up", "type", "can", "bitrate", "1000000"]
             subprocess.run(
-                ["sudo", "-S", "ip", "link", "set", can, "up", "type", "can", "bitrate", "1000000"],
+                cmd,
                 input=f"{self.password}\n",
                 check=True,
                 text=True,
@@ -69,7 +73,16 @@ class OpenCan:
             pass
         except Exception as e:
             pass
-            
+
+    @staticmethod
+    def _is_vcan(interface, details=""):
+        return interface.startswith("vcan") or "\n    vcan " in details
+
+    @staticmethod
+    def _flags_up(link_show):
+        # "<NOARP,UP,LOWER_UP>": vcan 的 operstate 为 UNKNOWN，以 IFF_UP 为准
+        flags = link_show.split("<", 1)[1].split(">", 1)[0].split(",") if "<" in link_show else []
+        return "UP" in flags
 
     def is_can_up_sysfs(self, interface="can0"):
     # 检查接口目录是否存在
@@ -81,6 +94,11 @@ class OpenCan:
                 state = f.read().strip()
             if state == "up":
                 return True
+            # vcan 等虚拟接口不上报载波，operstate 为 unknown，此时看 IFF_UP 标志
+            if state == "unknown":
+                with open(f"/sys/class/net/{interface}/flags", "r") as f:
+                    return bool(int(f.read().strip(), 16) & 0x1)
+            return False
         except Exception as e:
             print(f"Error reading CAN interface state: {e}")
             return False
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+共享内存数据块
+
+SeqlockBlock: 单写多读的定长数据块。布局由 [(字段名, dtype, shape)] 描述，前 8 字节为 uint64 序号:
+  写: 序号 +1 (奇数，表示写入中) -> 写字段 -> 序号 +1 (偶数)
+  读: 读序号 (偶数) -> 拷贝字段 -> 再读序号，两次相同则数据一致，否则让出 CPU 后重试
+ShmRing: 单生产者单消费者的定长槽环形缓冲，槽内容为 int32 [类型, 长度, 数据...]。
+  满时默认丢弃新条目；push(overwrite=True) 时改为覆盖最新一条同类型条目 (最新值优先)，
+  每个槽带 uint64 序号 (同 SeqlockBlock)，覆盖与消费者读取并发时消费者会重读，不会读到半条数据。
+两者都只依赖 multiprocessing.shared_memory + NumPy，读写均不加锁；多个生产者线程需由调用方串行化。
+'''
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import time
+
+import numpy as np
+
+_ALIGN = 8
+
+
+def _open(name: Optional[str], create: bool, size: int, untrack: bool) -> shared_memory.SharedMemory:
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+    if not create and untrack:
+        # 只是挂接的进程退出时不应让 resource_tracker 删除别人创建的段；
+        # 由创建者 spawn 出的子进程与其共用同一个 resource_tracker，应传 untrack=False
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+    return shm
+
+
+def _layout_offsets(layout: Sequence[Tuple[str, str, tuple]], start: int) -> Tuple[List[tuple], int]:
+    fields, offset = [], start
+    for name, dtype, shape in layout:
+        dt = np.dtype(dtype)
+        offset = (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+        fields.append((name, dt, tuple(shape), offset))
+        offset += dt.itemsize * int(np.prod(shape))
+    return fields, offset
+
+
+class SeqlockBlock:
+    def __init__(self, layout: Sequence[Tuple[str, str, tuple]], name: Optional[str] = None, create: bool = True,
+                 untrack: bool = True):
+        self.layout = list(layout)
+        fields, size = _layout_offsets(self.layout, _ALIGN)
+        self.size = size
+        self.shm = _open(name, create, size, untrack)
+        self.name = self.shm.name
+        self.owner = create
+        buf = self.shm.buf
+        self._seq = np.ndarray((1,), dtype=np.uint64, buffer=buf, offset=0)
+        self.fields: Dict[str, np.ndarray] = {
+            n: np.ndarray(shape, dtype=dt, buffer=buf, offset=off) for n, dt, shape, off in fields
+        }
+        if create:
+            self._seq[0] = 0
+            for arr in self.fields.values():
+                arr.fill(0)
+
+    @property
+    def seq(self) -> int:
+        return int(self._seq[0])
+
+    def write(self, **values):
+        '''只允许一个写者；未给出的字段保持不变'''
+        self._seq[0] += 1
+        try:
+            for name, value in values.items():
+                arr = self.fields[name]
+                if arr.ndim == 0 or arr.shape == (1,):
+                    arr[...] = value
+                else:
+                    value = np.asarray(value)
+                    arr[tuple(slice(0, n) for n in value.shape)] = value
+        finally:
+            self._seq[0] += 1
+
+    def read(self, names: Optional[Sequence[str]] = None, timeout: float = 0.1) -> Tuple[int, Dict[str, np.ndarray]]:
+        '''返回 (序号, {字段: 拷贝})；timeout 秒内一直读不到一致的数据 (写者卡在写入中或持续写入) 时抛 TimeoutError'''
+        names = names or list(self.fields)
+        deadline = time.perf_counter() + timeout
+        while True:
+            s1 = int(self._seq[0])
+            if not s1 & 1:
+                out = {n: self.fields[n].copy() for n in names}
+                if int(self._seq[0]) == s1:
+                    return s1, out
+            if time.perf_counter() > deadline:
+                raise TimeoutError("共享内存数据块读取超时")
+            # 写者正在写入: 让出 CPU，单核或写者被抢占时不空转
+            time.sleep(0)
+
+    def close(self):
+        self._seq = None
+        self.fields = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class ShmRing:
+    def __init__(self, slots: int = 64, width: int = 32, name: Optional[str] = None, create: bool = True,
+                 untrack: bool = True):
+        self.slots = slots
+        self.width = width
+        size = 16 + slots * 8 + slots * (width + 2) * 4
+        self.shm = _open(name, create, size, untrack)
+        self.name = self.shm.name
+        self.owner = create
+        self._index = np.ndarray((2,), dtype=np.uint64, buffer=self.shm.buf, offset=0)   # head (写), tail (读)
+        self._seqs = np.ndarray((slots,), dtype=np.uint64, buffer=self.shm.buf, offset=16)  # 每槽序号，奇数表示写入中
+        self._data = np.ndarray((slots, width + 2), dtype=np.int32, buffer=self.shm.buf, offset=16 + slots * 8)
+        if create:
+            self._index[:] = 0
+            self._seqs[:] = 0
+        self.dropped = 0
+        self.overwritten = 0
+
+    def _write_slot(self, index: int, kind: int, values: Sequence[int]):
+        i = index % self.slots
+        n = min(len(values), self.width)
+        self._seqs[i] += 1
+        try:
+            slot = self._data[i]
+            slot[0] = kind
+            slot[1] = n
+            slot[2:2 + n] = values[:n]
+        finally:
+            self._seqs[i] += 1
+
+    def push(self, kind: int, values: Sequence[int], overwrite: bool = False) -> bool:
+        '''
+        生产者调用；满时丢弃本条并返回 False
+        overwrite=True 且最新一条同为 kind 时改为覆盖该条并返回 True (只保留最新值，如目标位置)
+        '''
+        head, tail = int(self._index[0]), int(self._index[1])
+        if head - tail >= self.slots:
+            last = (head - 1) % self.slots
+            if not overwrite or int(self._data[last][0]) != kind:
+                self.dropped += 1
+                return False
+            self._write_slot(head - 1, kind, values)
+            self.overwritten += 1
+            if int(self._index[1]) < head:
+                return True
+            # 覆盖期间消费者已取走该槽，可能取到的是旧值: 此时已有空位，按新条目再写一次
+        self._write_slot(head, kind, values)
+        self._index[0] = head + 1
+        return True
+
+    def pop(self) -> Optional[Tuple[int, List[int]]]:
+        '''消费者调用；空时返回 None'''
+        head, tail = int(self._index[0]), int(self._index[1])
+        if tail == head:
+            return None
+        i = tail % self.slots
+        slot = self._data[i]
+        while True:
+            s1 = int(self._seqs[i])
+            if not s1 & 1:
+                kind, n = int(slot[0]), int(slot[1])
+                values = slot[2:2 + n].tolist()
+                if int(self._seqs[i]) == s1:
+                    break
+            # 生产者正在覆盖该槽
+            time.sleep(0)
+        self._index[1] = tail + 1
+        return kind, values
+
+    def close(self):
+        self._index = self._seqs = self._data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+共享内存状态发布
+
+持有总线的进程用 StatePublisher 订阅解码事件，把最新的关节状态/速度/扭矩/温度/故障/矩阵压感写入一个
+命名共享内存段；GUI、ROS 桥、日志等其他本机进程用 StateReader 按名称挂接，零拷贝读取，读取不产生任何 CAN 流量。
+
+段布局 (版本 1，小端，所有字段 8 字节对齐，偏移固定):
+    偏移  类型            字段
+    0     uint64          seq            序号，奇数表示写入中 (seqlock，见 utils/shm_block.py)
+    8     uint32[4]       header         magic 0x4C485353 ("LHSS"), 版本, 关节数上限 32, CAN/RS485 ID
+    24    uint8[8]        model          型号 ASCII，不足补 0
+    32    int32[6]        length         state/speed/torque/temperature/fault 的有效长度, 保留
+    56    uint64[6]       count          state/speed/torque/temperature/fault/tactile 的累计更新次数
+    104   float64[6]      stamp          同上各流最近一次更新的 time.time()
+    152   float32[32]     state
+    280   float32[32]     speed
+    408   float32[32]     torque
+    536   float32[32]     temperature
+    664   int32[32]       fault
+    792   int16[5,12,6]   tactile        五指矩阵压感 (O6 为 10x4，占左上角)
+    1512  float64[5]      tactile_stamp  每根手指最近一次完整矩阵的时间
+    共 1552 字节
+'''
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from shm_block import SeqlockBlock
+
+MAGIC = 0x4C485353
+VERSION = 1
+MAX_JOINTS = 32
+STREAMS = ("state", "speed", "torque", "temperature", "fault")
+LAYOUT = [
+    ("header", "uint32", (4,)),
+    ("model", "uint8", (8,)),
+    ("length", "int32", (6,)),
+    ("count", "uint64", (6,)),
+    ("stamp", "float64", (6,)),
+    ("state", "float32", (MAX_JOINTS,)),
+    ("speed", "float32", (MAX_JOINTS,)),
+    ("torque", "float32", (MAX_JOINTS,)),
+    ("temperature", "float32", (MAX_JOINTS,)),
+    ("fault", "int32", (MAX_JOINTS,)),
+    ("tactile", "int16", (5, 12, 6)),
+    ("tactile_stamp", "float64", (5,)),
+]
+_TACTILE = len(STREAMS)
+
+
+def segment_name(name: str) -> str:
+    '''共享内存段名只保留字母数字及 . _ -'''
+    return re.sub(r"[^\w.-]", "_", name)
+
+
+class StatePublisher:
+    def __init__(self, hub, model: str, name: str, hand_id: int = 0):
+        '''hub: 驱动解码路径上的 EventHub (LinkerHandApi._event_hub() 或 FleetHand.hub)'''
+        self.hub = hub
+        self.model = model.upper()
+        self.name = segment_name(name)
+        try:
+            self.block = SeqlockBlock(LAYOUT, name=self.name)
+        except FileExistsError:
+            # 上次异常退出遗留的同名段: 删除后重建，仍挂着旧段的读者需要重新挂接
+            stale = SeqlockBlock(LAYOUT, name=self.name, create=False, untrack=False)
+            stale.owner = True
+            stale.close()
+            self.block = SeqlockBlock(LAYOUT, name=self.name)
+        model_bytes = np.zeros(8, dtype=np.uint8)
+        raw = self.model.encode("ascii")[:8]
+        model_bytes[:len(raw)] = list(raw)
+        self.block.write(header=[MAGIC, VERSION, MAX_JOINTS, hand_id], model=model_bytes)
+        # RS485 的状态块可能在轮询线程与调用线程中解码，seqlock 只允许一个写者
+        self._lock = threading.Lock()
+        self._callbacks = {stream: self._stream_writer(i, stream) for i, stream in enumerate(STREAMS)}
+        self._callbacks["tactile_frame"] = self._on_tactile
+        for event, callback in self._callbacks.items():
+            hub.subscribe(event, callback)
+
+    def _stream_writer(self, index: int, stream: str):
+        fields = self.block.fields
+
+        def write(values):
+            n = min(len(values), MAX_JOINTS)
+            with self._lock:
+                length, count, stamp = fields["length"].copy(), fields["count"].copy(), fields["stamp"].copy()
+                length[index] = n
+                count[index] += 1
+                stamp[index] = time.time()
+                self.block.write(**{stream: np.asarray(values[:n]), "length": length, "count": count, "stamp": stamp})
+        return write
+
+    def update(self, stream: str, values):
+        '''直接写入一个流，例如订阅之前已解码的数据 (故障码只在变化时才有事件)'''
+        self._callbacks[stream](values)
+
+    def _on_tactile(self, finger: int, matrix: np.ndarray):
+        fields = self.block.fields
+        rows, cols = matrix.shape
+        with self._lock:
+            tactile = fields["tactile"].copy()
+            tactile[finger, :rows, :cols] = matrix
+            count, stamp, tactile_stamp = fields["count"].copy(), fields["stamp"].copy(), fields["tactile_stamp"].copy()
+            now = time.time()
+            count[_TACTILE] += 1
+            stamp[_TACTILE] = now
+            tactile_stamp[finger] = now
+            self.block.write(tactile=tactile, count=count, stamp=stamp, tactile_stamp=tactile_stamp)
+
+    @property
+    def seq(self) -> int:
+        return self.block.seq
+
+    def close(self):
+        for event, callback in self._callbacks.items():
+            self.hub.unsubscribe(event, callback)
+        self.block.close()
+
+
+class StateReader:
+    def __init__(self, name: str):
+        self.name = segment_name(name)
+        self.block = SeqlockBlock(LAYOUT, name=self.name, create=False)
+        header = self.block.fields["header"]
+        if int(header[0]) != MAGIC or int(header[1]) != VERSION:
+            self.block.close()
+            raise ValueError(f"{self.name} 不是 v{VERSION} 的 LinkerHand 状态段")
+        self.hand_id = int(header[3])
+        self.model = bytes(self.block.fields["model"]).rstrip(b"\0").decode("ascii")
+        # 零拷贝视图；不经 read() 直接访问时不保证各字段来自同一次写入
+        self.views: Dict[str, np.ndarray] = self.block.fields
+
+    @property
+    def seq(self) -> int:
+        return self.block.seq
+
+    def read(self) -> Dict[str, object]:
+        '''一致的快照: 各流为截到有效长度的列表，附 count / stamp 与 seq'''
+        seq, data = self.block.read()
+        out: Dict[str, object] = {"seq": seq, "model": self.model}
+        for i, stream in enumerate(STREAMS):
+            out[stream] = data[stream][:int(data["length"][i])].tolist()
+        rows, cols = (10, 4) if self.model == "O6" else (12, 6)
+        out["tactile"] = data["tactile"][:, :rows, :cols]
+        out["tactile_stamp"] = data["tactile_stamp"]
+        out["count"] = dict(zip(STREAMS + ("tactile",), data["count"].tolist()))
+        out["stamp"] = dict(zip(STREAMS + ("tactile",), data["stamp"].tolist()))
+        return out
+
+    def wait(self, seq: int, timeout: Optional[float] = None, interval: float = 0.0005) -> Optional[int]:
+        '''等待序号越过 seq (有新写入)，返回新序号；超时返回 None'''
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self.block.seq
+            if current != seq and not current & 1:
+                return current
+            if deadline is not None and time.monotonic() > deadline:
+                return None
+            time.sleep(interval)
+
+    def get_state(self) -> List[float]:
+        return self.read()["state"]
+
+    def close(self):
+        self.views = {}
+        self.block.close()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+轨迹规划与定频下发
+
+plan() 按路点和时间一次性生成整条轨迹 (N 行 x 关节数 的 NumPy 数组，行间隔 1/rate 秒):
+  minjerk: 路点之间五次多项式，路点处速度/加速度为 0
+  cubic:   经过全部路点的三次 Hermite 样条，中间路点速度取相邻两段斜率均值 (方向相反或一侧为 0 时取 0，
+           避免越过路点)，两端速度为 0
+TrajectoryStreamer 在独立线程中按固定频率逐行下发，每个周期只做一次行查找；
+play() 可随时抢占正在下发的轨迹，blend > 0 时在 blend 秒内从旧轨迹平滑过渡到新轨迹。
+'''
+import threading
+import time
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+PROFILES = ("minjerk", "cubic")
+
+
+def _minjerk(s: np.ndarray) -> np.ndarray:
+    return s ** 3 * (10 - 15 * s + 6 * s ** 2)
+
+
+def plan(waypoints: Sequence[Sequence[float]], durations: Sequence[float], rate: float = 200.0,
+         profile: str = "minjerk", start: Optional[Sequence[float]] = None) -> np.ndarray:
+    '''
+    waypoints: 依次到达的姿态；durations: 到达每个路点所用的秒数 (与 waypoints 等长)
+    start: 起始姿态，不给时以第一个路点为起点 (此时 durations[0] 为停留时间)
+    返回 float 数组，末行为最后一个路点
+    '''
+    if profile not in PROFILES:
+        raise ValueError(f"未知插值方式: {profile}，可选 {PROFILES}")
+    points = np.asarray(waypoints, dtype=float)
+    if points.ndim != 2 or len(points) == 0:
+        raise ValueError("waypoints 必须是非空的姿态列表")
+    if len(durations) != len(points):
+        raise ValueError("durations 与 waypoints 长度不一致")
+    if any(d <= 0 for d in durations):
+        raise ValueError("durations 必须为正数")
+    points = np.vstack([np.asarray(start, dtype=float)[None, :] if start is not None else points[:1], points])
+    knots = np.concatenate([[0.0], np.cumsum(durations)])
+    t = np.arange(1, int(round(knots[-1] * rate)) + 1) / rate
+    t[-1] = knots[-1]
+    seg = np.clip(np.searchsorted(knots, t, side="left") - 1, 0, len(knots) - 2)
+    h = (knots[seg + 1] - knots[seg])[:, None]
+    s = ((t - knots[seg])[:, None]) / h
+    p0, p1 = points[seg], points[seg + 1]
+    if profile == "minjerk":
+        return p0 + (p1 - p0) * _minjerk(s)
+    slopes = np.diff(points, axis=0) / np.diff(knots)[:, None]
+    velocity = np.zeros_like(points)
+    velocity[1:-1] = np.where(slopes[:-1] * slopes[1:] > 0, (slopes[:-1] + slopes[1:]) / 2, 0.0)
+    v0, v1 = velocity[seg] * h, velocity[seg + 1] * h
+    s2, s3 = s ** 2, s ** 3
+    return ((2 * s3 - 3 * s2 + 1) * p0 + (s3 - 2 * s2 + s) * v0
+            + (-2 * s3 + 3 * s2) * p1 + (s3 - s2) * v1)
+
+
+class TrajectoryStreamer:
+    def __init__(self, send: Callable[[List[int]], None], rate: float = 200.0):
+        '''send(pose): 下发一帧姿态，在下发线程中调用'''
+        self.send = send
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.last_sent: Optional[np.ndarray] = None
+        self.overruns = 0
+        self._traj: Optional[np.ndarray] = None
+        self._row = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._done = threading.Event()
+        self._done.set()
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="linker-hand-trajectory", daemon=True)
+        self._thread.start()
+
+    def play(self, trajectory: np.ndarray, blend: float = 0.0):
+        '''抢占当前轨迹；blend 秒内按 min-jerk 权重从旧轨迹剩余部分过渡到新轨迹'''
+        trajectory = np.clip(np.asarray(trajectory, dtype=float), 0, 255)
+        with self._lock:
+            if blend > 0 and self._traj is not None and self._row < len(self._traj):
+                old = self._traj[self._row:]
+                n = min(len(trajectory), int(round(blend * self.rate)))
+                if n > 0:
+                    idx = np.minimum(np.arange(n), len(old) - 1)
+                    w = _minjerk(np.arange(1, n + 1) / n)[:, None]
+                    trajectory = trajectory.copy()
+                    trajectory[:n] = (1 - w) * old[idx] + w * trajectory[:n]
+            self._traj = trajectory
+            self._row = 0
+            self._done.clear()
+        self._wake.set()
+
+    def stop(self):
+        '''停止下发，手停在最后一次下发的姿态'''
+        with self._lock:
+            self._traj = None
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    @property
+    def playing(self) -> bool:
+        return not self._done.is_set()
+
+    def close(self):
+        self.stop()
+        self._running = False
+        self._wake.set()
+        self._thread.join()
+
+    def _loop(self):
+        next_tick = time.perf_counter()
+        while self._running:
+            if self._traj is None:
+                self._wake.wait()
+                self._wake.clear()
+                next_tick = time.perf_counter()
+                continue
+            with self._lock:
+                traj, row = self._traj, self._row
+                if traj is None:
+                    continue
+                if row >= len(traj):
+                    self._traj = None
+                    self._done.set()
+                    continue
+                self._row = row + 1
+            pose = traj[row]
+            self.send([int(v) for v in np.rint(pose)])
+            self.last_sent = pose
+            next_tick += self.period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # 下发超时不补发，从当前时刻重新对齐
+                self.overruns += 1
+                next_tick = time.perf_counter()
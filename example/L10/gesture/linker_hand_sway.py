@@ -15,6 +15,7 @@ def main():
     parser.add_argument('--hand_type', choices=['left', 'right'], required=True, help='指定左手或右手')
     parser.add_argument('--hand_joint', required=True, help='指定LinkerHand型号')
     parser.add_argument('--can', default="can0", help='指定CAN编号')
+    parser.add_argument('--smooth', action='store_true', help='预计算 min-jerk 轨迹定频下发，代替 finger_move + sleep')
     args = parser.parse_args()
     print(f"手类型: {args.hand_type}, 关节: {args.hand_joint}")
 
@@ -38,6 +39,9 @@ def main():
         [255.0,255.0,255.0,255.0,255.0,255.0,40.0,88.0,255.0,63.0], # 小拇指侧摆
         [255.0,255.0,255.0,255.0,255.0,255.0,40.0,88.0,80.0,63.0], # 手掌张开
     ]
+    if args.smooth:
+        while True:
+            hand.play_trajectory(poses, [1.0] * len(poses), wait=True)
     while True:
         for pose in poses:
             hand.finger_move(pose=pose)
@@ -13,8 +13,10 @@ from LinkerHand.linker_hand_api import LinkerHandApi
 --hand_type: 左手还是右手(left或right)
 --speed: 速度设置(0~255)
 --mm: 抓取物品直径大小(mm)
+--closed_loop: 不按直径计算姿态，改用压感闭环抓取 (接触即停并把压力调节到 --target)，Ctrl+C 松开并退出
 示例：
 python3 dynamic_grasping.py --hand_joint L10 --hand_type left --speed 20 50 50 50 50 --mm 30
+python3 dynamic_grasping.py --hand_joint L10 --hand_type left --closed_loop --target 80
 '''
 
 def main(args):
@@ -26,6 +28,18 @@ def main(args):
     pose = [255, 70, 255, 255, 255, 255, 255, 255, 255, 120]
     hand.finger_move(pose=pose)
     time.sleep(2)
+    if args.closed_loop:
+        hand.grasp(sensor=args.sensor, contact=args.contact, target=args.target, wait=5)
+        # 保持抓取 (闭环在后台运行)，直到 Ctrl+C
+        try:
+            while True:
+                print(hand.get_grasp_status())
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            hand.release_grasp()
+        return
     # 握拳，抓取0mm物品坐标
     # pose = [60, 70, 25, 25, 25, 25, 25, 255, 255, 88]
     # 动态设置坐标
@@ -52,5 +66,9 @@ if __name__ == "__main__":
     parser.add_argument("--hand_type", type=str, default="left", help="Hand type (left or right)")
     parser.add_argument("--speed", type=int, nargs='+', default=[20, 50, 50, 50, 50], help="Speed settings (0~255)")
     parser.add_argument("--mm", type=int, default="30", help="Distance in mm")
+    parser.add_argument("--closed_loop", action="store_true", help="Tactile closed-loop grasp instead of --mm")
+    parser.add_argument("--sensor", type=str, default="matrix", help="matrix or force")
+    parser.add_argument("--contact", type=float, default=30, help="Contact threshold")
+    parser.add_argument("--target", type=float, default=80, help="Target pressure while holding")
     args = parser.parse_args()
     main(args)
\ No newline at end of file
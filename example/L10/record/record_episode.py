@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import sys,os,time
+current_dir = os.path.dirname(os.path.abspath(__file__))
+target_dir = os.path.abspath(os.path.join(current_dir, "../../.."))
+sys.path.append(target_dir)
+import argparse
+from LinkerHand.linker_hand_api import LinkerHandApi
+from LinkerHand.utils.episode_recorder import EpisodeRecorder
+
+'''
+示教数据记录示例，记录期间循环做握拳/张开，关节命令、状态、矩阵压感写入 HDF5
+命令行参数：
+--hand_joint: 手指关节类型
+--hand_type: 左手还是右手(left或right)
+--output: HDF5 文件路径
+--episodes: 记录几个 episode
+--duration: 每个 episode 时长(秒)
+示例：
+python3 record_episode.py --hand_joint L10 --hand_type left --output demo.h5 --episodes 3 --duration 5
+'''
+
+def main(args):
+    hand = LinkerHandApi(hand_joint=args.hand_joint, hand_type=args.hand_type)
+    recorder = EpisodeRecorder(args.output)
+    recorder.add_hand(hand, args.hand_type, poll_hz=args.poll_hz, tactile_hz=args.tactile_hz,
+                       force_hz=args.force_hz)
+    open_pose = [255] * 10
+    fist_pose = [101, 60, 0, 0, 0, 0, 255, 255, 255, 51]
+    try:
+        for i in range(args.episodes):
+            name = recorder.start(task="fist", hand_joint=args.hand_joint)
+            end = time.time() + args.duration
+            while time.time() < end:
+                hand.finger_move(pose=fist_pose)
+                time.sleep(1)
+                hand.finger_move(pose=open_pose)
+                time.sleep(1)
+            recorder.stop()
+            print(f"{name}: {recorder.stats()['samples']}")
+    finally:
+        recorder.close()
+        hand.close_can()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record demonstration episodes to HDF5")
+    parser.add_argument("--hand_joint", type=str, default="L10", help="Hand joint type")
+    parser.add_argument("--hand_type", type=str, default="left", help="Hand type (left or right)")
+    parser.add_argument("--output", type=str, default="episodes.h5", help="HDF5 output path")
+    parser.add_argument("--episodes", type=int, default=1, help="Number of episodes")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per episode")
+    parser.add_argument("--poll_hz", type=float, default=100.0, help="State polling rate while recording")
+    parser.add_argument("--force_hz", type=float, default=20.0, help="Force polling rate while recording, CAN only (0 = off)")
+    parser.add_argument("--tactile_hz", type=float, default=20.0, help="Matrix touch polling rate while recording (0 = off)")
+    args = parser.parse_args()
+    main(args)
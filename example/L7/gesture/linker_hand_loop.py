@@ -7,6 +7,7 @@ from LinkerHand.linker_hand_api import LinkerHandApi
 from LinkerHand.utils.load_write_yaml import LoadWriteYaml
 from LinkerHand.utils.init_linker_hand import InitLinkerHand
 from LinkerHand.utils.color_msg import ColorMsg
+from LinkerHand.utils.gesture_sequencer import GestureStep
 '''
 手掌握拳
 '''
@@ -15,6 +16,7 @@ def main():
     parser.add_argument('--hand_type', choices=['left', 'right'], required=True, help='指定左手或右手')
     parser.add_argument('--hand_joint', required=True, help='指定LinkerHand型号')
     parser.add_argument('--can', default="can0", help='指定CAN编号')
+    parser.add_argument('--sequencer', action='store_true', help='用定时线程的手势序列循环，长时间运行无漂移')
     args = parser.parse_args()
     print(f"手类型: {args.hand_type}, 关节: {args.hand_joint}")
 
@@ -28,6 +30,12 @@ def main():
     hand.set_speed(speed=speed)
     ColorMsg(msg=f"当前设置速度为:{speed}", color="green")
     pose = [[255,255,255,255,255,255,255],[255,255,0,255,255,255,255],[255,255,0,0,255,255,255],[255,255,0,0,0,255,255],[255,255,0,0,0,0,255],[72,90,0,0,0,0,55]]
+    if args.sequencer:
+        steps = [GestureStep(str(i), tuple(p), duration=3.0, blend=0.5) for i, p in enumerate(pose)]
+        sequencer = hand.create_gesture_sequencer(steps=steps, on_step=lambda i, name: print(f"step {i}: {pose[i]}"))
+        sequencer.play()
+        while True:
+            time.sleep(1)
     while True:
         for i in range(6):
             print("_-"*10)
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+LinkerHandApi 热路径性能基准
+
+对每个型号测量:
+  - finger_move / get_state / get_speed / get_torque / get_matrix_touch / get_force 的 p50/p99 延时
+  - 可达指令频率 (连续 finger_move)
+  - 整手矩阵压感刷新率 (连续 get_matrix_touch)
+  - 单手 CPU 占用 (按 --loop_hz 运行 finger_move + get_state 控制循环时本进程的 CPU 时间 / 墙钟时间)
+结果写入 JSON；给出 --baseline 时与基准文件对比，超出容差即以退出码 1 结束，便于升级 SDK 前发现性能回退。
+
+默认在子进程中启动模拟器 (不计入本进程 CPU):
+  CAN:   core/can/can_simulator.py，需要 vcan 接口
+         sudo modprobe vcan && sudo ip link add dev vcan0 type vcan && sudo ip link set up vcan0
+         python3 can_simulator.py --channel vcan0 --check_api 可先确认 LinkerHandApi 能在 vcan0 上打开
+  RS485: core/rs485/rs485_simulator.py，基于 pty，无需额外配置
+--external 表示不启动模拟器，直接连接 --can / --modbus 指定的真机或外部模拟器。
+--replay 给出录制日志 (LinkerHandApi.start_can_recording) 时不连接任何设备，只测量驱动解码吞吐。
+
+    python3 api_benchmark.py --hand_joint L10 --hand_joint L6 --backend can --output can.json
+    python3 api_benchmark.py --hand_joint L10 --backend rs485 --baseline can_v3.json
+    python3 api_benchmark.py --hand_joint L10 --replay field_issue.blf
+'''
+import sys, os, time
+import argparse
+import json
+import platform
+import subprocess
+import numpy as np
+current_dir = os.path.dirname(os.path.abspath(__file__))
+target_dir = os.path.abspath(os.path.join(current_dir, "../.."))
+sys.path.append(target_dir)
+
+from LinkerHand.linker_hand_api import LinkerHandApi
+from LinkerHand.utils.color_msg import ColorMsg
+from config_service import get_config_service
+from LinkerHand.utils.open_can import OpenCan
+
+CAN_SIMULATOR = os.path.join(target_dir, "LinkerHand", "core", "can", "can_simulator.py")
+RS485_SIMULATOR = os.path.join(target_dir, "LinkerHand", "core", "rs485", "rs485_simulator.py")
+JOINT_COUNT = {"O6": 6, "L6": 6, "L7": 7, "L10": 10, "L20": 20, "G20": 20, "L21": 25, "L25": 25}
+RS485_MODELS = ("O6", "L6", "L7", "L10")
+LATENCY_OPS = ("finger_move", "get_state", "get_speed", "get_torque", "get_matrix_touch", "get_force")
+
+
+def percentiles(samples, errors=0):
+    '''samples: 秒 -> 毫秒统计'''
+    if not samples:
+        return {"n": 0, "errors": errors}
+    a = np.asarray(samples) * 1000.0
+    return {
+        "n": int(a.size),
+        "errors": errors,
+        "p50": round(float(np.percentile(a, 50)), 3),
+        "p99": round(float(np.percentile(a, 99)), 3),
+        "mean": round(float(a.mean()), 3),
+        "max": round(float(a.max()), 3),
+    }
+
+
+def measure_latency(fn, rounds, warmup=5):
+    for _ in range(warmup):
+        try:
+            fn()
+        except Exception:
+            pass
+    samples, errors = [], 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception:
+            errors += 1
+            continue
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples, errors)
+
+
+def measure_rate(fn, duration):
+    '''duration 秒内连续调用 fn，返回每秒完成次数'''
+    count = 0
+    start = time.perf_counter()
+    end = start + duration
+    while time.perf_counter() < end:
+        fn()
+        count += 1
+    return round(count / (time.perf_counter() - start), 2)
+
+
+def measure_cpu(tick, duration, loop_hz):
+    '''按 loop_hz 调用 tick，返回 (CPU 占用百分比, 超时周期数)'''
+    period = 1.0 / loop_hz
+    overruns = 0
+    t0 = os.times()
+    start = next_tick = time.perf_counter()
+    while next_tick - start < duration:
+        tick()
+        next_tick += period
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            overruns += 1
+    wall = time.perf_counter() - start
+    t1 = os.times()
+    cpu = (t1.user - t0.user) + (t1.system - t0.system)
+    return round(cpu / wall * 100.0, 2), overruns
+
+
+class Simulator:
+    '''在子进程中运行 CAN / RS485 模拟器；首行输出为 "... channel: vcan0" 或 "... port: /dev/pts/N"'''
+
+    def __init__(self, backend, hand_joint, hand_id, can="vcan0", latency=0.001, drop=0.0):
+        if backend == "can":
+            cmd = [sys.executable, CAN_SIMULATOR, "--model", hand_joint, "--channel", can, "--id", hex(hand_id)]
+        else:
+            cmd = [sys.executable, RS485_SIMULATOR, "--model", hand_joint, "--slave", hex(hand_id)]
+        cmd += ["--latency", str(latency), "--drop", str(drop)]
+        self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+        line = self.proc.stdout.readline()
+        if not line:
+            self.proc.wait(timeout=5)
+            raise RuntimeError(f"模拟器启动失败 (exit {self.proc.returncode}): {' '.join(cmd)}")
+        self.endpoint = line.rsplit(":", 1)[1].strip()
+
+    def stop(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=3)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+def close_hand(api):
+    hand = api.hand
+    hand.running = False
+    if hasattr(hand, "close_can_interface"):
+        hand.close_can_interface()
+    elif hasattr(hand, "close"):
+        hand.close()
+
+
+def bench_model(hand_joint, args):
+    hand_id = 0x28 if args.hand_type == "left" else 0x27
+    sim = None
+    if not args.external:
+        sim = Simulator(args.backend, hand_joint, hand_id, can=args.can, latency=args.latency, drop=args.drop)
+    api = None
+    try:
+        if args.backend == "can":
+            # LinkerHandApi 在通道未打开时直接 sys.exit，这里提前检查，只让本型号失败
+            if sys.platform == "linux" and not OpenCan().is_can_up_sysfs(interface=args.can):
+                raise RuntimeError(f"{args.can} 未打开 (vcan: sudo ip link add dev {args.can} type vcan && sudo ip link set up {args.can})")
+            api = LinkerHandApi(hand_type=args.hand_type, hand_joint=hand_joint, can=args.can)
+        else:
+            modbus = sim.endpoint if sim is not None else args.modbus
+            api = LinkerHandApi(hand_type=args.hand_type, hand_joint=hand_joint, modbus=modbus,
+                                modbus_backend=args.modbus_backend)
+        n = JOINT_COUNT[hand_joint]
+        poses = [[255] * n, [100] * n]
+        counter = [0]
+
+        def finger_move():
+            counter[0] += 1
+            api.finger_move(pose=poses[counter[0] % 2])
+
+        ops = {
+            "finger_move": finger_move,
+            "get_state": api.get_state,
+            "get_speed": api.get_speed,
+            "get_torque": api.get_torque,
+            "get_matrix_touch": api.get_matrix_touch,
+            "get_force": api.get_force,
+        }
+        result = {"latency_ms": {}}
+        # RS485 的 get_state/get_speed/get_torque 在快照有效期内直接返回缓存，延时测量时关闭快照以测到真实总线事务
+        status = getattr(api.hand, "_status", None)
+        max_age = status.max_age if status is not None else None
+        if status is not None:
+            status.max_age = 0
+        try:
+            for name in LATENCY_OPS:
+                result["latency_ms"][name] = measure_latency(ops[name], args.rounds)
+                ColorMsg(msg=f"{hand_joint} {name}: {result['latency_ms'][name]}", color="green")
+        finally:
+            if status is not None:
+                status.max_age = max_age
+        result["command_rate_hz"] = measure_rate(finger_move, args.duration)
+        try:
+            result["tactile_refresh_hz"] = measure_rate(api.get_matrix_touch, args.duration)
+        except Exception as e:
+            result["tactile_refresh_hz"] = None
+            result["tactile_error"] = str(e)
+
+        def tick():
+            finger_move()
+            api.get_state()
+
+        result["cpu_percent"], result["loop_overruns"] = measure_cpu(tick, args.duration, args.loop_hz)
+        return result
+    finally:
+        if api is not None:
+            close_hand(api)
+        if sim is not None:
+            sim.stop()
+
+
+def bench_replay(hand_joint, args):
+    '''把录制日志 (start_can_recording) 的 RX 帧直接送入驱动 process_response，测量解码吞吐'''
+    import importlib
+    import can
+    from core.can.can_fleet import CAN_DRIVERS
+    from core.can.can_recorder import CanReplay
+    hand_id = 0x28 if args.hand_type == "left" else 0x27
+    module, name = CAN_DRIVERS[hand_joint]
+    # 驱动挂在进程内 virtual 总线上，构造时的查询帧无人应答，不影响解码
+    bus = can.Bus(interface="virtual", channel=f"replay-{hand_joint}")
+    hand = getattr(importlib.import_module(module), name)(can_id=hand_id, can_channel="replay", bus=bus)
+    try:
+        replay = CanReplay(args.replay, arbitration_id=hand_id)
+        stats = replay.run(hand.process_response, speed=args.replay_speed)
+    finally:
+        hand.running = False
+        bus.shutdown()
+    ColorMsg(msg=f"{hand_joint} replay: {stats}", color="green")
+    return {"replay": {k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()}}
+
+
+def compare(results, baseline, tolerance):
+    '''返回回退项说明列表: 延时 p99 / CPU 升高或频率下降超过 tolerance 即视为回退'''
+    regressions = []
+    for model, cur in results.items():
+        base = baseline.get("models", {}).get(model)
+        if not base:
+            continue
+        if "error" in cur:
+            regressions.append(f"{model} failed: {cur['error']}")
+            continue
+        for op, stat in cur.get("latency_ms", {}).items():
+            old = base.get("latency_ms", {}).get(op, {}).get("p99")
+            new = stat.get("p99")
+            if old and new and new > old * (1 + tolerance):
+                regressions.append(f"{model} {op} p99 {old} -> {new} ms")
+        for key in ("command_rate_hz", "tactile_refresh_hz"):
+            old, new = base.get(key), cur.get(key)
+            if old and new is not None and new < old * (1 - tolerance):
+                regressions.append(f"{model} {key} {old} -> {new}")
+        old = base.get("replay", {}).get("frames_per_second")
+        new = cur.get("replay", {}).get("frames_per_second")
+        if old and new is not None and new < old * (1 - tolerance):
+            regressions.append(f"{model} replay frames_per_second {old} -> {new}")
+        old, new = base.get("cpu_percent"), cur.get("cpu_percent")
+        if old and new is not None and new > old * (1 + tolerance):
+            regressions.append(f"{model} cpu_percent {old} -> {new}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='LinkerHandApi benchmark')
+    parser.add_argument('--hand_joint', type=str, action='append', help='型号，可重复 (默认 L10)')
+    parser.add_argument('--hand_type', type=str, default='left', help='left / right')
+    parser.add_argument('--backend', type=str, default='can', choices=('can', 'rs485'))
+    parser.add_argument('--can', type=str, default='vcan0', help='CAN 通道')
+    parser.add_argument('--modbus', type=str, default='None', help='--external 时使用的 RS485 串口')
+    parser.add_argument('--modbus_backend', type=str, default='sync', choices=('sync', 'asyncio', 'shared'))
+    parser.add_argument('--external', action='store_true', help='不启动模拟器，连接真机或外部模拟器')
+    parser.add_argument('--latency', type=float, default=0.001, help='模拟器响应延时 (秒)')
+    parser.add_argument('--drop', type=float, default=0.0, help='模拟器丢帧概率 0-1')
+    parser.add_argument('--rounds', type=int, default=200, help='每项延时采样次数')
+    parser.add_argument('--duration', type=float, default=5.0, help='频率/CPU 测量时长 (秒)')
+    parser.add_argument('--loop_hz', type=float, default=100.0, help='CPU 测量的控制循环频率')
+    parser.add_argument('--replay', type=str, default=None, help='录制日志 (.blf/.asc)，只测量 process_response 解码吞吐')
+    parser.add_argument('--replay_speed', type=float, default=None, help='回放倍速，默认不等待 (尽可能快)')
+    parser.add_argument('--output', type=str, default='benchmark_result.json')
+    parser.add_argument('--baseline', type=str, default=None, help='基准 JSON，用于回退检查')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='回退容差 (比例)')
+    args = parser.parse_args()
+
+    models = args.hand_joint or ["L10"]
+    if args.backend == "rs485" and any(m not in RS485_MODELS for m in models):
+        parser.error(f"RS485 仅支持 {RS485_MODELS}")
+    results = {}
+    for m in models:
+        try:
+            results[m] = bench_replay(m, args) if args.replay else bench_model(m, args)
+        except Exception as e:
+            ColorMsg(msg=f"{m} 基准失败: {e}", color="red")
+            results[m] = {"error": str(e)}
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sdk_version": str(get_config_service().get().version),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": "replay" if args.replay else args.backend if args.backend == "can" else f"rs485/{args.modbus_backend}",
+        "params": {"hand_type": args.hand_type, "rounds": args.rounds, "duration": args.duration,
+                   "loop_hz": args.loop_hz, "latency": args.latency, "drop": args.drop, "external": args.external,
+                   "replay": args.replay, "replay_speed": args.replay_speed},
+        "models": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    ColorMsg(msg=f"结果已写入 {args.output}", color="green")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for r in regressions:
+            ColorMsg(msg=f"性能回退: {r}", color="red")
+        if regressions:
+            sys.exit(1)
+        ColorMsg(msg="未发现性能回退", color="green")
@@ -21,9 +21,11 @@ sys.path.append(target_dir)
 from LinkerHand.linker_hand_api import LinkerHandApi
 from LinkerHand.utils.load_write_yaml import LoadWriteYaml
 from LinkerHand.utils.color_msg import ColorMsg
+from LinkerHand.utils.gesture_sequencer import GestureStep
 
 
 LOOP_TIME = 1000 # 循环动作间隔时间 毫秒
+BLEND_TIME = 300 # 循环动作之间的过渡时间 毫秒
 
 class DotMatrixWidget(QWidget):
     """点阵显示部件 - 白色到深红色渐变版"""
@@ -410,12 +412,13 @@ class HandApiManager(QObject):
 class HandControlGUI(QWidget):
     """灵巧手控制界面"""
     status_updated = pyqtSignal(str, str)  # 状态类型, 消息内容
+    sequence_step = pyqtSignal(int)  # 循环序列进入第几个动作 (来自定时线程)
 
     def __init__(self, api_manager: HandApiManager):
         super().__init__()
         
-        # 循环控制变量
-        self.cycle_timer = None  # 循环定时器
+        # 循环控制变量: 动作序列在独立定时线程中下发，不受界面重绘影响
+        self.sequencer = None
         self.current_action_index = -1  # 当前动作索引
         self.preset_buttons = []  # 存储预设动作按钮引用
         
@@ -423,6 +426,7 @@ class HandControlGUI(QWidget):
         self.api_manager = api_manager
         self.api_manager.status_updated.connect(self.update_status)
         self.api_manager.matrix_data_updated.connect(self.update_matrix_display)
+        self.sequence_step.connect(self.run_next_action)
         
         # 获取手部配置
         self.hand_joint = self.api_manager.hand_joint
@@ -874,10 +878,9 @@ class HandControlGUI(QWidget):
 
     def on_stop_clicked(self):
         """停止所有动作按钮点击事件处理"""
-        # 停止循环定时器
-        if self.cycle_timer and self.cycle_timer.isActive():
-            self.cycle_timer.stop()
-            self.cycle_timer = None
+        # 停止循环序列
+        if self.sequencer and self.sequencer.playing:
+            self.sequencer.stop()
             self.cycle_button.setText("循环预设动作")
             self.reset_preset_buttons_color()
             
@@ -889,41 +892,44 @@ class HandControlGUI(QWidget):
             QMessageBox.warning(self, "无预设动作", "当前手部型号没有预设动作可循环运行")
             return
             
-        if self.cycle_timer and self.cycle_timer.isActive():
+        if self.sequencer and self.sequencer.playing:
             # 停止循环
-            self.cycle_timer.stop()
-            self.cycle_timer = None
+            self.sequencer.stop()
             self.cycle_button.setText("循环预设动作")
             self.reset_preset_buttons_color()
             self.status_updated.emit("info", "已停止循环运行预设动作")
         else:
             # 开始循环
-            self.current_action_index = -1
-            self.cycle_timer = QTimer(self)
-            self.cycle_timer.timeout.connect(self.run_next_action)
-            self.cycle_timer.start(LOOP_TIME)
+            if self.sequencer is None:
+                steps = [GestureStep(name, tuple(pos), LOOP_TIME / 1000, BLEND_TIME / 1000)
+                         for name, pos in self.hand_config.preset_actions.items()]
+                try:
+                    self.sequencer = self.api_manager.api.create_gesture_sequencer(
+                        steps=steps, on_step=lambda index, name: self.sequence_step.emit(index))
+                except ValueError as e:
+                    QMessageBox.warning(self, "动作不匹配", str(e))
+                    return
+            self.sequencer.play()
             self.cycle_button.setText("停止循环运行")
             self.status_updated.emit("info", "开始循环运行预设动作")
-            self.run_next_action()
 
-    def run_next_action(self):
-        """运行下一个预设动作"""
+    def run_next_action(self, index: int):
+        """循环序列进入第 index 个预设动作: 同步滑动条并高亮按钮 (指令已由定时线程下发)"""
         if not self.hand_config.preset_actions:
             return
             
         # 重置所有按钮颜色
         self.reset_preset_buttons_color()
         
-        # 计算下一个动作索引
-        self.current_action_index = (self.current_action_index + 1) % len(self.hand_config.preset_actions)
-        
-        # 获取下一个动作
+        self.current_action_index = index
         action_names = list(self.hand_config.preset_actions.keys())
         action_name = action_names[self.current_action_index]
         action_positions = self.hand_config.preset_actions[action_name]
         
-        # 执行动作
-        self.on_preset_action_clicked(action_positions)
+        # 只更新滑动条，不再从界面线程发布
+        for i, (slider, pos) in enumerate(zip(self.sliders, action_positions)):
+            slider.setValue(pos)
+            self.on_slider_value_changed(i, pos)
         
         # 高亮当前动作按钮
         if 0 <= self.current_action_index < len(self.preset_buttons):
@@ -942,6 +948,9 @@ class HandControlGUI(QWidget):
 
     def publish_joint_state(self):
         """发布当前关节状态"""
+        if self.sequencer and self.sequencer.playing:
+            # 循环序列运行中，由序列的定时线程下发
+            return
         positions = [slider.value() for slider in self.sliders]
         self.api_manager.publish_joint_state(positions)
 
@@ -978,8 +987,8 @@ class HandControlGUI(QWidget):
 
     def closeEvent(self, event):
         """窗口关闭事件处理"""
-        if self.cycle_timer and self.cycle_timer.isActive():
-            self.cycle_timer.stop()
+        if self.sequencer:
+            self.sequencer.close()
         if self.publish_timer and self.publish_timer.isActive():
             self.publish_timer.stop()
         self.api_manager.shutdown()